@@ -35,7 +35,7 @@ def allow_rasterization(draw):
     """
     def before(artist, renderer):
         if artist.get_rasterized():
-            renderer.start_rasterizing()
+            renderer.start_rasterizing(artist._get_raster_bbox())
 
         if artist.get_agg_filter() is not None:
             renderer.start_filter()
@@ -540,6 +540,16 @@ class Artist(object):
         'Return artist clipbox'
         return self.clipbox
 
+    def _get_raster_bbox(self):
+        """
+        Return the box the artist draws within, as a hint for
+        :meth:`~matplotlib.backend_bases.RendererBase.start_rasterizing`,
+        or None if it may draw anywhere in the figure.  The clip box is
+        not enough in general, as an artist may draw unclipped
+        children.
+        """
+        return None
+
     def get_clip_path(self):
         'Return artist clip path'
         return self._clippath
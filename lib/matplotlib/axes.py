@@ -1900,9 +1900,16 @@ class Axes(martist.Artist):
         # if the minimum zorder is negative, start rasterization
         rasterization_zorder = self._rasterization_zorder
         if len(dsu) > 0 and dsu[0][0] < rasterization_zorder:
-            renderer.start_rasterizing()
             dsu_rasterized = [l for l in dsu if l[0] < rasterization_zorder]
             dsu = [l for l in dsu if l[0] >= rasterization_zorder]
+            # the patch and the composite image are drawn within the
+            # axes box
+            bboxes = [self.bbox]
+            bboxes.extend([a._get_raster_bbox()
+                           for zorder, a in dsu_rasterized])
+            if [b for b in bboxes if b is None]:
+                bboxes = None
+            renderer.start_rasterizing(bboxes)
         else:
             dsu_rasterized = []
 
@@ -5888,6 +5895,12 @@ class Axes(martist.Artist):
         *x*, *y* and/or *C* may be masked arrays, in which case only
         unmasked points will be plotted.
 
+        *x* may also be a :class:`~matplotlib.mlab.HexBinner` that has
+        already binned the data, possibly in chunks too large to pass
+        in at once; *y* and *C* are then ignored, and *gridsize*,
+        *extent*, *xscale*, *yscale* and *reduce_C_function* are taken
+        from the binner.
+
         Optional keyword arguments:
 
           *gridsize*: [ 100 | integer ]
@@ -5991,158 +6004,64 @@ class Axes(martist.Artist):
 
         if not self._hold: self.cla()
 
-        self._process_unit_info(xdata=x, ydata=y, kwargs=kwargs)
-
-
-        x, y, C = cbook.delete_masked_points(x, y, C)
-
-
-        # Set the size of the hexagon grid
-        if iterable(gridsize):
-            nx, ny = gridsize
+        if isinstance(x, mlab.HexBinner):
+            if marginals:
+                raise ValueError("marginals can not be drawn from a HexBinner")
+            binner = x
+            xscale, yscale = binner.xscale, binner.yscale
+            reduce_C_function = binner.reduce_C_function
         else:
-            nx = gridsize
-            ny = int(nx/math.sqrt(3))
-        # Count the number of data in each hexagon
-        x = np.array(x, float)
-        y = np.array(y, float)
-        if xscale=='log':
-            if np.any(x <= 0.0):
-                raise ValueError("x contains non-positive values, so can not be log-scaled")
-            x = np.log10(x)
-        if yscale=='log':
-            if np.any(y <= 0.0):
-                raise ValueError("y contains non-positive values, so can not be log-scaled")
-            y = np.log10(y)
-        if extent is not None:
-            xmin, xmax, ymin, ymax = extent
-        else:
-            xmin = np.amin(x)
-            xmax = np.amax(x)
-            ymin = np.amin(y)
-            ymax = np.amax(y)
-        # In the x-direction, the hexagons exactly cover the region from
-        # xmin to xmax. Need some padding to avoid roundoff errors.
-        padding = 1.e-9 * (xmax - xmin)
-        xmin -= padding
-        xmax += padding
-        sx = (xmax-xmin) / nx
-        sy = (ymax-ymin) / ny
-
-        if marginals:
-            xorig = x.copy()
-            yorig = y.copy()
-
-        x = (x-xmin)/sx
-        y = (y-ymin)/sy
-        ix1 = np.round(x).astype(int)
-        iy1 = np.round(y).astype(int)
-        ix2 = np.floor(x).astype(int)
-        iy2 = np.floor(y).astype(int)
-
-        nx1 = nx + 1
-        ny1 = ny + 1
-        nx2 = nx
-        ny2 = ny
-        n = nx1*ny1+nx2*ny2
-
-        d1 = (x-ix1)**2 + 3.0 * (y-iy1)**2
-        d2 = (x-ix2-0.5)**2 + 3.0 * (y-iy2-0.5)**2
-        bdist = (d1<d2)
-        if C is None:
-            accum = np.zeros(n)
-            # Create appropriate views into "accum" array.
-            lattice1 = accum[:nx1*ny1]
-            lattice2 = accum[nx1*ny1:]
-            lattice1.shape = (nx1,ny1)
-            lattice2.shape = (nx2,ny2)
-
-            for i in xrange(len(x)):
-                if bdist[i]:
-                    if ((ix1[i] >= 0) and (ix1[i] < nx1) and
-                        (iy1[i] >= 0) and (iy1[i] < ny1)):
-                        lattice1[ix1[i], iy1[i]]+=1
-                else:
-                    if ((ix2[i] >= 0) and (ix2[i] < nx2) and
-                        (iy2[i] >= 0) and (iy2[i] < ny2)):
-                        lattice2[ix2[i], iy2[i]]+=1
-
+            self._process_unit_info(xdata=x, ydata=y, kwargs=kwargs)
+
+            x, y, C = cbook.delete_masked_points(x, y, C)
+
+            x = np.array(x, float)
+            y = np.array(y, float)
+            if marginals:
+                xorig = x.copy()
+                yorig = y.copy()
+                if xscale=='log':
+                    xorig = np.log10(xorig)
+                if yscale=='log':
+                    yorig = np.log10(yorig)
+            if extent is None:
+                extent = [np.amin(x), np.amax(x), np.amin(y), np.amax(y)]
+                if xscale=='log':
+                    extent[:2] = np.log10(extent[:2])
+                if yscale=='log':
+                    extent[2:] = np.log10(extent[2:])
+            if C is None:
+                binner = mlab.HexBinner(extent, gridsize, xscale, yscale)
+            else:
+                binner = mlab.HexBinner(extent, gridsize, xscale, yscale,
+                                        reduce_C_function)
+            binner.add(x, y, C)
+
+        xmin, xmax, ymin, ymax = (binner.xmin, binner.xmax,
+                                  binner.ymin, binner.ymax)
+        sx, sy = binner.sx, binner.sy
+        counts = binner.counts
+        accum = binner.get_values()
+        if binner.reduce_C_function is None:
             # threshold
             if mincnt is not None:
-                for i in xrange(nx1):
-                    for j in xrange(ny1):
-                        if lattice1[i,j]<mincnt:
-                            lattice1[i,j] = np.nan
-                for i in xrange(nx2):
-                    for j in xrange(ny2):
-                        if lattice2[i,j]<mincnt:
-                            lattice2[i,j] = np.nan
-            accum = np.hstack((
-                lattice1.astype(float).ravel(), lattice2.astype(float).ravel()))
-            good_idxs = ~np.isnan(accum)
-
+                accum[counts<mincnt] = np.nan
         else:
             if mincnt is None:
                 mincnt = 0
+            accum[counts<=mincnt] = np.nan
+        good_idxs = ~np.isnan(accum)
 
-            # create accumulation arrays
-            lattice1 = np.empty((nx1,ny1),dtype=object)
-            for i in xrange(nx1):
-                for j in xrange(ny1):
-                    lattice1[i,j] = []
-            lattice2 = np.empty((nx2,ny2),dtype=object)
-            for i in xrange(nx2):
-                for j in xrange(ny2):
-                    lattice2[i,j] = []
-
-            for i in xrange(len(x)):
-                if bdist[i]:
-                    if ((ix1[i] >= 0) and (ix1[i] < nx1) and
-                        (iy1[i] >= 0) and (iy1[i] < ny1)):
-                        lattice1[ix1[i], iy1[i]].append( C[i] )
-                else:
-                    if ((ix2[i] >= 0) and (ix2[i] < nx2) and
-                        (iy2[i] >= 0) and (iy2[i] < ny2)):
-                        lattice2[ix2[i], iy2[i]].append( C[i] )
-
-
-            for i in xrange(nx1):
-                for j in xrange(ny1):
-                    vals = lattice1[i,j]
-                    if len(vals)>mincnt:
-                        lattice1[i,j] = reduce_C_function( vals )
-                    else:
-                        lattice1[i,j] = np.nan
-            for i in xrange(nx2):
-                for j in xrange(ny2):
-                    vals = lattice2[i,j]
-                    if len(vals)>mincnt:
-                        lattice2[i,j] = reduce_C_function( vals )
-                    else:
-                        lattice2[i,j] = np.nan
-
-            accum = np.hstack((
-                lattice1.astype(float).ravel(), lattice2.astype(float).ravel()))
-            good_idxs = ~np.isnan(accum)
-
-        px = xmin + sx * np.array([ 0.5, 0.5, 0.0, -0.5, -0.5,  0.0])
-        py = ymin + sy * np.array([-0.5, 0.5, 1.0,  0.5, -0.5, -1.0]) / 3.0
-
-        polygons = np.zeros((6, n, 2), float)
-        polygons[:,:nx1*ny1,0] = np.repeat(np.arange(nx1), ny1)
-        polygons[:,:nx1*ny1,1] = np.tile(np.arange(ny1), nx1)
-        polygons[:,nx1*ny1:,0] = np.repeat(np.arange(nx2) + 0.5, ny2)
-        polygons[:,nx1*ny1:,1] = np.tile(np.arange(ny2), nx2) + 0.5
+        px = sx * np.array([ 0.5, 0.5, 0.0, -0.5, -0.5,  0.0])
+        py = sy * np.array([-0.5, 0.5, 1.0,  0.5, -0.5, -1.0]) / 3.0
 
         # remove accumulation bins with no data
-        polygons = polygons[:,good_idxs,:]
+        offsets = binner.get_offsets()[good_idxs]
         accum = accum[good_idxs]
 
-        polygons = np.transpose(polygons, axes=[1,0,2])
-        polygons[:,:,0] *= sx
-        polygons[:,:,1] *= sy
-        polygons[:,:,0] += px
-        polygons[:,:,1] += py
+        polygons = np.empty((len(offsets), 6, 2), float)
+        polygons[:,:,0] = offsets[:,0,np.newaxis] + px
+        polygons[:,:,1] = offsets[:,1,np.newaxis] + py
 
         if xscale=='log':
             polygons[:,:,0] = 10**(polygons[:,:,0])
@@ -6213,11 +6132,8 @@ class Axes(martist.Artist):
 
         def coarse_bin(x, y, coarse):
             ind = coarse.searchsorted(x).clip(0, len(coarse)-1)
-            mus = np.zeros(len(coarse))
-            for i in range(len(coarse)):
-                mu = reduce_C_function(y[ind==i])
-                mus[i] = mu
-            return mus
+            return mlab.grouped_reduce(ind, y, len(coarse),
+                                       reduce_C_function)
 
         coarse = np.linspace(xmin, xmax, gridsize)
 
@@ -8041,14 +7957,14 @@ class Axes(martist.Artist):
     def specgram(self, x, NFFT=256, Fs=2, Fc=0, detrend=mlab.detrend_none,
                  window=mlab.window_hanning, noverlap=128,
                  cmap=None, xextent=None, pad_to=None, sides='default',
-                 scale_by_freq=None, **kwargs):
+                 scale_by_freq=None, dtype=None, **kwargs):
         """
         call signature::
 
           specgram(x, NFFT=256, Fs=2, Fc=0, detrend=mlab.detrend_none,
                    window=mlab.window_hanning, noverlap=128,
                    cmap=None, xextent=None, pad_to=None, sides='default',
-                   scale_by_freq=None, **kwargs)
+                   scale_by_freq=None, dtype=None, **kwargs)
 
         Compute a spectrogram of data in *x*.  Data are split into
         *NFFT* length segments and the PSD of each section is
@@ -8057,6 +7973,7 @@ class Axes(martist.Artist):
         specified with *noverlap*.
 
         %(PSD)s
+        %(Precision)s
 
           *Fc*: integer
             The center frequency of *x* (defaults to 0), which offsets
@@ -8097,7 +8014,7 @@ class Axes(martist.Artist):
         if not self._hold: self.cla()
 
         Pxx, freqs, bins = mlab.specgram(x, NFFT, Fs, detrend,
-             window, noverlap, pad_to, sides, scale_by_freq)
+             window, noverlap, pad_to, sides, scale_by_freq, dtype)
 
         Z = 10. * np.log10(Pxx)
         Z = np.flipud(Z)
@@ -8111,6 +8028,55 @@ class Axes(martist.Artist):
 
         return Pxx, freqs, bins, im
 
+    def specgram_stream(self, ncols=100, NFFT=256, Fs=2, Fc=0,
+                        detrend=mlab.detrend_none,
+                        window=mlab.window_hanning, noverlap=128,
+                        cmap=None, pad_to=None, sides='default',
+                        scale_by_freq=None, vmin=None, vmax=None,
+                        **kwargs):
+        """
+        call signature::
+
+          specgram_stream(ncols=100, NFFT=256, Fs=2, Fc=0,
+                          detrend=mlab.detrend_none,
+                          window=mlab.window_hanning, noverlap=128,
+                          cmap=None, pad_to=None, sides='default',
+                          scale_by_freq=None, vmin=None, vmax=None,
+                          **kwargs)
+
+        Add a scrolling spectrogram of a live signal to the axes and
+        return it as a :class:`~matplotlib.image.SpecgramImage`.  Feed
+        it samples with its :meth:`~matplotlib.image.SpecgramImage.add`
+        method and redraw the canvas; only the new segments are
+        transformed, and the same image shows the latest *ncols*
+        segments.
+
+        The spectral arguments are those of :meth:`specgram`.  *vmin*
+        and *vmax* fix the color limits, which otherwise follow the
+        data shown.  Additional *kwargs* are
+        :class:`~matplotlib.image.AxesImage` properties.
+
+        Example::
+
+          im = ax.specgram_stream(ncols=200, NFFT=512, Fs=44100)
+          while True:
+              im.add(read_samples())
+              fig.canvas.draw()
+        """
+        if not self._hold: self.cla()
+
+        im = mimage.SpecgramImage(self, ncols, NFFT, Fs, Fc, detrend,
+                                  window, noverlap, pad_to, sides,
+                                  scale_by_freq, vmin, vmax, cmap=cmap,
+                                  **kwargs)
+        if im.get_clip_path() is None:
+            # image does not already have clipping set, clip to axes patch
+            im.set_clip_path(self.patch)
+        self.images.append(im)
+        im._remove_method = lambda h: self.images.remove(h)
+        self.axis('auto')
+        return im
+
     def spy(self, Z, precision=0, marker=None, markersize=None,
             aspect='equal',  **kwargs):
         """
@@ -59,6 +59,22 @@ _backend_d = {}
 def register_backend(format, backend_class):
     _backend_d[format] = backend_class
 
+_encoder_d = {}
+
+def register_encoder(format, encoder):
+    """
+    Save raster *format* files with *encoder*, a callable invoked as::
+
+        encoder(buffer, width, height, fileobj, dpi=dpi, **kwargs)
+
+    where *buffer* exposes the figure rendered by Agg as *height* rows
+    of *width* rgba pixels, *fileobj* is the writable file object to
+    fill and *kwargs* are the format specific savefig keyword
+    arguments.  A registered encoder takes precedence over the
+    builtin print method for *format*.
+    """
+    _encoder_d[format] = encoder
+
 
 class ShowBase(object):
     """
@@ -564,6 +580,13 @@ class RendererBase:
             self._texmanager = TexManager()
         return self._texmanager
 
+    def prepare_tex(self, items):
+        """
+        Compile the (tex, fontsize) pairs in *items* ahead of drawing
+        them, so that they are compiled together rather than one by
+        one as they are drawn.  Used in usetex mode.
+        """
+        self.get_texmanager().make_dvis(items)
 
     def new_gc(self):
         """
@@ -591,9 +614,14 @@ class RendererBase:
     def strip_math(self, s):
         return cbook.strip_math(s)
 
-    def start_rasterizing(self):
+    def start_rasterizing(self, bbox=None):
         """
         Used in MixedModeRenderer. Switch to the raster renderer.
+
+        *bbox* is a hint of the region the rasterized drawing will
+        cover, in display coordinates: a
+        :class:`~matplotlib.transforms.BboxBase`, a list of them, or
+        None for the whole figure.
         """
         pass
 
@@ -1789,14 +1817,43 @@ class FigureCanvasBase:
             return image.save(filename_or_obj, **options)
         print_jpeg = print_jpg
 
-        filetypes['tif'] = filetypes['tiff'] = 'Tagged Image File Format'
-        def print_tif(self, filename_or_obj, *args, **kwargs):
-            from backends.backend_agg import FigureCanvasAgg # lazy import
-            agg = self.switch_backends(FigureCanvasAgg)
-            buf, size = agg.print_to_buffer()
-            image = Image.frombuffer('RGBA', size, buf, 'raw', 'RGBA', 0, 1)
-            return image.save(filename_or_obj)
-        print_tiff = print_tif
+    filetypes['tif'] = filetypes['tiff'] = 'Tagged Image File Format'
+    def print_tif(self, filename_or_obj, *args, **kwargs):
+        """
+        Supported kwargs:
+
+        *compression*: 'packbits' (the default) for run length encoded
+            strips, or 'none'.
+        """
+        from matplotlib.tiff import write_tiff # lazy import
+        return self._print_encoded(write_tiff, filename_or_obj, **kwargs)
+    print_tiff = print_tif
+
+    def _print_encoded(self, encoder, filename_or_obj, *args, **kwargs):
+        """
+        Render the figure with Agg and pass the pixels straight to
+        *encoder*; see :func:`register_encoder`.
+        """
+        from backends.backend_agg import FigureCanvasAgg # lazy import
+        for key in ('dpi', 'facecolor', 'edgecolor', 'orientation',
+                    'bbox_inches_restore'):
+            kwargs.pop(key, None)
+        agg = self.switch_backends(FigureCanvasAgg)
+        buf, (width, height) = agg.print_to_buffer()
+        if kwargs.pop('dryrun', False):
+            return
+        if cbook.is_string_like(filename_or_obj):
+            fileobj = open(filename_or_obj, 'wb')
+            close = True
+        else:
+            fileobj = filename_or_obj
+            close = False
+        try:
+            return encoder(buf, width, height, fileobj,
+                           dpi=self.figure.dpi, **kwargs)
+        finally:
+            if close:
+                fileobj.close()
 
     def get_supported_filetypes(self):
         return self.filetypes
@@ -1812,7 +1869,15 @@ class FigureCanvasBase:
     def _get_print_method(self, format):
         method_name = 'print_%s' % format
 
-        # check for registered backends
+        # check for registered encoders and backends
+        if format in _encoder_d:
+            encoder = _encoder_d[format]
+
+            def _print_method(*args, **kwargs):
+                return self._print_encoded(encoder, *args, **kwargs)
+
+            return _print_method
+
         if format in _backend_d:
             backend_class = _backend_d[format]
 
@@ -21,6 +21,7 @@ TODO:
   * integrate screen dpi w/ ppi and text
 """
 from __future__ import division
+import struct, threading, zlib
 
 import numpy as np
 
@@ -46,7 +47,19 @@ class RendererAgg(RendererBase):
     context instance that controls the colors/styles
     """
     debug=1
-    def __init__(self, width, height, dpi):
+    def __init__(self, width, height, dpi, buffer=None, origin=(0, 0)):
+        """
+        If *buffer* is not None, it must be a writable object
+        supporting the buffer interface, of at least
+        *width* * *height* * 4 bytes, e.g. a numpy array, an
+        :class:`mmap.mmap` or a :mod:`multiprocessing` shared array.
+        The renderer then draws directly into that memory.
+
+        *origin* is the position, in display coordinates, of the lower
+        left corner of the canvas.  A renderer for a part of a larger
+        figure can thus be drawn with the display coordinates of the
+        whole figure; anything outside the canvas is clipped.
+        """
         if __debug__: verbose.report('RendererAgg.__init__', 'debug-annoying')
         RendererBase.__init__(self)
         self.texd = maxdict(50)  # a cache of tex image rasters
@@ -55,8 +68,15 @@ class RendererAgg(RendererBase):
         self.dpi = dpi
         self.width = width
         self.height = height
+        self.origin = origin = (int(origin[0]), int(origin[1]))
         if __debug__: verbose.report('RendererAgg.__init__ width=%s, height=%s'%(width, height), 'debug-annoying')
-        self._renderer = _RendererAgg(int(width), int(height), dpi, debug=False)
+        if buffer is None:
+            self._renderer = _RendererAgg(int(width), int(height), dpi,
+                                          debug=False, origin=origin)
+        else:
+            self._renderer = _RendererAgg(int(width), int(height), dpi,
+                                          debug=False, buffer=buffer,
+                                          origin=origin)
         self._filter_renderers = []
 
         if __debug__: verbose.report('RendererAgg.__init__ _RendererAgg done',
@@ -65,7 +85,8 @@ class RendererAgg(RendererBase):
         self._update_methods()
         self.mathtext_parser = MathTextParser('Agg')
 
-        self.bbox = Bbox.from_bounds(0, 0, self.width, self.height)
+        self.bbox = Bbox.from_bounds(origin[0], origin[1],
+                                     self.width, self.height)
         if __debug__: verbose.report('RendererAgg.__init__ done',
                                      'debug-annoying')
 
@@ -200,6 +221,10 @@ class RendererAgg(RendererBase):
 
         self._renderer.draw_text_image(Z, x, y, angle, gc)
 
+    def prepare_tex(self, items):
+        # draw_tex uses the png files of the strings
+        self.get_texmanager().make_pngs(items, self.dpi)
+
     def get_canvas_width_height(self):
         'return the canvas width and height in display coords'
         return self.width, self.height
@@ -237,21 +262,44 @@ class RendererAgg(RendererBase):
                                      'debug-annoying')
         return points*self.dpi/72.0
 
-    def tostring_rgb(self):
+    def tostring_rgb(self, out=None):
+        """
+        Return the image as an RGB string.  If *out*, a writable
+        buffer of at least *width* * *height* * 3 bytes, is given, the
+        pixels are written into it instead and None is returned.
+        """
         if __debug__: verbose.report('RendererAgg.tostring_rgb',
                                      'debug-annoying')
-        return self._renderer.tostring_rgb()
+        if out is None:
+            return self._renderer.tostring_rgb()
+        return self._renderer.tostring_rgb(out)
 
-    def tostring_argb(self):
+    def tostring_argb(self, out=None):
+        """
+        Return the image as an ARGB string.  If *out*, a writable
+        buffer of at least *width* * *height* * 4 bytes, is given, the
+        pixels are written into it instead and None is returned.
+        """
         if __debug__: verbose.report('RendererAgg.tostring_argb',
                                      'debug-annoying')
-        return self._renderer.tostring_argb()
+        if out is None:
+            return self._renderer.tostring_argb()
+        return self._renderer.tostring_argb(out)
 
     def buffer_rgba(self,x,y):
         if __debug__: verbose.report('RendererAgg.buffer_rgba',
                                      'debug-annoying')
         return self._renderer.buffer_rgba(x,y)
 
+    def get_rgba_array(self):
+        """
+        Return a (*height*, *width*, 4) uint8 :mod:`numpy` array that
+        shares memory with the image, without copying it.  The array
+        keeps the underlying buffer alive.
+        """
+        return np.frombuffer(self._renderer, np.uint8).reshape(
+            (int(self.height), int(self.width), 4))
+
     def clear(self):
         self._renderer.clear()
 
@@ -305,7 +353,7 @@ class RendererAgg(RendererBase):
         """
         self._filter_renderers.append(self._renderer)
         self._renderer = _RendererAgg(int(self.width), int(self.height),
-                                      self.dpi)
+                                      self.dpi, origin=self.origin)
         self._update_methods()
 
     def stop_filter(self, post_processing):
@@ -346,8 +394,9 @@ class RendererAgg(RendererBase):
             image.flipud_out()
 
             gc = self.new_gc()
+            x0, y0 = self.origin
             self._renderer.draw_image(gc,
-                                      l+ox, height - b - h +oy,
+                                      x0 + l+ox, y0 + height - b - h +oy,
                                       image)
 
 
@@ -366,6 +415,113 @@ def new_figure_manager(num, *args, **kwargs):
     return manager
 
 
+_png_filters = {'auto'  : -1,
+                'none'  : _png.FILTER_NONE,
+                'sub'   : _png.FILTER_SUB,
+                'up'    : _png.FILTER_UP,
+                'avg'   : _png.FILTER_AVG,
+                'paeth' : _png.FILTER_PAETH,
+                }
+
+def _rgba_to_palette(pixbuf, width, height):
+    """
+    Return (*indices*, *palette*) for the *width* x *height* rgba
+    *pixbuf* if it holds at most 256 distinct colors, where *indices*
+    is a uint8 array with one palette entry per pixel and *palette* is
+    an (n, 4) uint8 rgba array.  Return (None, None) otherwise.
+    """
+    pixels = np.frombuffer(pixbuf, np.uint32, width * height)
+    # antialiased images usually have many more colors than a palette
+    # can hold; reject them from a sample before sorting every pixel
+    if len(np.unique(pixels[::97])) > 256:
+        return None, None
+    colors, indices = np.unique(pixels, return_inverse=True)
+    if len(colors) > 256:
+        return None, None
+    return indices.astype(np.uint8), colors.view(np.uint8).reshape((-1, 4))
+
+def _png_chunk(fileobj, tag, data):
+    crc = zlib.crc32(data, zlib.crc32(tag)) & 0xffffffff
+    fileobj.write(struct.pack('>I', len(data)) + tag)
+    fileobj.write(data)
+    fileobj.write(struct.pack('>I', crc))
+
+def _write_png_threaded(pixbuf, width, height, fileobj, dpi=None,
+                        compression=6, filter='up', palette=None,
+                        threads=2):
+    """
+    Write a png like :func:`_png.write_png`, but deflate horizontal
+    bands of the image in *threads* threads.
+
+    Each band gets its own compressor and all but the last are ended
+    with a sync flush, so the pieces join into one valid zlib stream.
+    zlib releases the GIL while it compresses, so the bands are
+    encoded in parallel; the price is a slightly larger file, since
+    no band can refer back to the data of the one above it.  Only the
+    'none', 'sub' and 'up' filters, which can be applied to the whole
+    image with a few array operations, are supported.
+    """
+    if palette is None:
+        bpp, color_type = 4, 6
+    else:
+        bpp, color_type = 1, 3
+    rowlen = width * bpp
+    pixels = np.frombuffer(pixbuf, np.uint8, rowlen * height)
+    pixels = pixels.reshape((height, rowlen))
+
+    # every scanline starts with the byte naming its filter
+    rows = np.empty((height, rowlen + 1), np.uint8)
+    if filter == 'none':
+        rows[:, 0] = 0
+        rows[:, 1:] = pixels
+    elif filter == 'sub':
+        rows[:, 0] = 1
+        rows[:, 1:bpp+1] = pixels[:, :bpp]
+        np.subtract(pixels[:, bpp:], pixels[:, :-bpp], rows[:, bpp+1:])
+    elif filter == 'up':
+        rows[:, 0] = 2
+        rows[:1, 1:] = pixels[:1]
+        np.subtract(pixels[1:], pixels[:-1], rows[1:, 1:])
+    else:
+        raise ValueError("threaded png writing does not support the "
+                         "'%s' filter" % filter)
+
+    bounds = np.linspace(0, height, threads + 1).astype(int)
+    pieces = [None] * threads
+    def compress(i):
+        compressor = zlib.compressobj(compression, zlib.DEFLATED,
+                                      -zlib.MAX_WBITS)
+        data = compressor.compress(buffer(rows[bounds[i]:bounds[i+1]]))
+        if i == threads - 1:
+            flush = zlib.Z_FINISH
+        else:
+            flush = zlib.Z_SYNC_FLUSH
+        pieces[i] = data + compressor.flush(flush)
+    workers = [threading.Thread(target=compress, args=(i,))
+               for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    adler = zlib.adler32(buffer(rows)) & 0xffffffff
+    pieces.insert(0, '\x78\x9c')
+    pieces.append(struct.pack('>I', adler))
+
+    fileobj.write('\x89PNG\r\n\x1a\n')
+    _png_chunk(fileobj, 'IHDR', struct.pack('>IIBBBBB', width, height, 8,
+                                            color_type, 0, 0, 0))
+    if dpi is not None:
+        dots_per_meter = int(dpi / (2.54 / 100.0))
+        _png_chunk(fileobj, 'pHYs', struct.pack('>IIB', dots_per_meter,
+                                                dots_per_meter, 1))
+    if palette is not None:
+        palette = np.asarray(palette, np.uint8).reshape((-1, 4))
+        _png_chunk(fileobj, 'PLTE', palette[:, :3].tostring())
+        _png_chunk(fileobj, 'tRNS', palette[:, 3].tostring())
+    _png_chunk(fileobj, 'IDAT', ''.join(pieces))
+    _png_chunk(fileobj, 'IEND', '')
+
+
 class FigureCanvasAgg(FigureCanvasBase):
     """
     The canvas the figure renders into.  Calls the draw and print fig
@@ -393,33 +549,53 @@ class FigureCanvasAgg(FigureCanvasBase):
         self.renderer = self.get_renderer()
         self.figure.draw(self.renderer)
 
+    _render_buffer = None
+
     def get_renderer(self):
         l, b, w, h = self.figure.bbox.bounds
-        key = w, h, self.figure.dpi
+        key = w, h, self.figure.dpi, id(self._render_buffer)
         try: self._lastKey, self.renderer
         except AttributeError: need_new_renderer = True
         else:  need_new_renderer = (self._lastKey != key)
 
         if need_new_renderer:
-            self.renderer = RendererAgg(w, h, self.figure.dpi)
+            self.renderer = RendererAgg(w, h, self.figure.dpi,
+                                        self._render_buffer)
             self._lastKey = key
         return self.renderer
 
-    def tostring_rgb(self):
+    def set_render_buffer(self, buffer):
+        """
+        Draw subsequent frames directly into *buffer*, a writable
+        object supporting the buffer interface, of at least
+        *width* * *height* * 4 bytes (RGBA).  This allows, e.g.,
+        rendering into a slot of a shared memory ring buffer
+        consumed by another process, with no intermediate copy.
+        Pass None to go back to a privately allocated buffer.
+        """
+        self._render_buffer = buffer
+
+    def tostring_rgb(self, out=None):
         if __debug__: verbose.report('FigureCanvasAgg.tostring_rgb',
                                      'debug-annoying')
-        return self.renderer.tostring_rgb()
+        return self.renderer.tostring_rgb(out)
+    tostring_rgb.__doc__ = RendererAgg.tostring_rgb.__doc__
 
-    def tostring_argb(self):
+    def tostring_argb(self, out=None):
         if __debug__: verbose.report('FigureCanvasAgg.tostring_argb',
                                      'debug-annoying')
-        return self.renderer.tostring_argb()
+        return self.renderer.tostring_argb(out)
+    tostring_argb.__doc__ = RendererAgg.tostring_argb.__doc__
 
     def buffer_rgba(self,x,y):
         if __debug__: verbose.report('FigureCanvasAgg.buffer_rgba',
                                      'debug-annoying')
         return self.renderer.buffer_rgba(x,y)
 
+    def get_rgba_array(self):
+        return self.renderer.get_rgba_array()
+    get_rgba_array.__doc__ = RendererAgg.get_rgba_array.__doc__
+
     def get_default_filetype(self):
         return 'png'
 
@@ -435,15 +611,58 @@ class FigureCanvasAgg(FigureCanvasBase):
     print_rgba = print_raw
 
     def print_png(self, filename_or_obj, *args, **kwargs):
+        """
+        Supported kwargs:
+
+        *compression*: The zlib compression level, from 0 (fastest,
+            no compression) to 9 (smallest file).  Defaults to
+            rcParams['png.compression'].
+
+        *filter*: The scanline filter; one of 'auto', 'none', 'sub',
+            'up', 'avg' or 'paeth'.  'auto' lets libpng try every
+            filter on every row, which gives the smallest files but
+            is the slowest choice.  Defaults to rcParams['png.filter'].
+
+        *palette*: If True, write an indexed color file whenever the
+            figure uses no more than 256 distinct colors.  Defaults
+            to rcParams['png.palette'].
+
+        *threads*: If more than 1, compress bands of the image in that
+            many threads.  Only the 'none', 'sub' and 'up' filters
+            can be used this way; 'auto' becomes 'up'.  Defaults to
+            rcParams['png.threads'].
+        """
+        compression = kwargs.get('compression', rcParams['png.compression'])
+        filter = kwargs.get('filter', rcParams['png.filter']).lower()
+        use_palette = kwargs.get('palette', rcParams['png.palette'])
+        threads = kwargs.get('threads', rcParams['png.threads'])
+        if filter not in _png_filters:
+            raise ValueError("Unknown png filter '%s'" % filter)
+
         FigureCanvasAgg.draw(self)
         renderer = self.get_renderer()
         original_dpi = renderer.dpi
         renderer.dpi = self.figure.dpi
+        width, height = int(renderer.width), int(renderer.height)
+        pixbuf = renderer._renderer.buffer_rgba(0, 0)
+        palette = None
+        if use_palette:
+            indices, palette = _rgba_to_palette(pixbuf, width, height)
+            if palette is not None:
+                pixbuf = indices
         if is_string_like(filename_or_obj):
             filename_or_obj = file(filename_or_obj, 'wb')
-        _png.write_png(renderer._renderer.buffer_rgba(0, 0),
-                       renderer.width, renderer.height,
-                       filename_or_obj, self.figure.dpi)
+        threads = min(threads, height)
+        if threads > 1 and filter in ('auto', 'none', 'sub', 'up'):
+            if filter == 'auto':
+                filter = 'up'
+            _write_png_threaded(pixbuf, width, height, filename_or_obj,
+                                self.figure.dpi, compression, filter,
+                                palette, threads)
+        else:
+            _png.write_png(pixbuf, width, height, filename_or_obj,
+                           self.figure.dpi, compression=compression,
+                           filter=_png_filters[filter], palette=palette)
         renderer.dpi = original_dpi
 
     def print_to_buffer(self):
@@ -1,6 +1,9 @@
+import numpy as np
+
 from matplotlib._image import frombuffer
 from matplotlib.backends.backend_agg import RendererAgg
 from matplotlib.tight_bbox import process_figure_for_rasterizing
+from matplotlib.transforms import BboxBase
 
 class MixedModeRenderer(object):
     """
@@ -9,6 +12,12 @@ class MixedModeRenderer(object):
     most things are drawn with PDF vector commands, but some very
     complex objects, such as quad meshes, are rasterised and then
     output as images.
+
+    Each rasterized part of the figure is drawn in a buffer covering
+    only the region it may draw in, so that rasterizing a small artist
+    does not need a buffer for the whole figure at the raster dpi.
+    Neighbouring rasterized artists, with no vector drawing between
+    them, are merged into a single image.
     """
     def __init__(self, figure, width, height, dpi, vector_renderer,
                  raster_renderer_class=None,
@@ -28,6 +37,9 @@ class MixedModeRenderer(object):
         raster_renderer_class: The renderer class to use for the
         raster drawing.  If not provided, this will use the Agg
         backend (which is currently the only viable option anyway.)
+        It is called as *raster_renderer_class(width, height, dpi,
+        buffer=buffer, origin=(x, y))*, see
+        :class:`~matplotlib.backends.backend_agg.RendererAgg`.
         """
         if raster_renderer_class is None:
             raster_renderer_class = RendererAgg
@@ -41,6 +53,11 @@ class MixedModeRenderer(object):
         self._vector_renderer = vector_renderer
 
         self._raster_renderer = None
+        # the (x, y, width, height) in raster pixels of the figure
+        # covered by the raster renderer, and the array it draws into
+        self._raster_region = None
+        self._raster_buffer = None
+        self._buffers = []
         self._rasterizing = 0
 
         # A renference to the figure is needed as we need to change
@@ -57,7 +74,7 @@ class MixedModeRenderer(object):
         draw_path_collection draw_quad_mesh draw_tex draw_text
         finalize flipy get_canvas_width_height get_image_magnification
         get_texmanager get_text_width_height_descent new_gc open_group
-        option_image_nocomposite points_to_pixels strip_math
+        option_image_nocomposite points_to_pixels prepare_tex strip_math
         start_filter stop_filter draw_gouraud_triangle
         draw_gouraud_triangles option_scale_image
         """.split()
@@ -71,12 +88,142 @@ class MixedModeRenderer(object):
         renderer.stop_rasterizing = self.stop_rasterizing
 
 
-    def start_rasterizing(self):
+    # the drawing methods that must draw any pending raster image
+    # first, to keep the drawing order
+    _flush_methods = """
+        close_group draw_image draw_markers draw_path
+        draw_path_collection draw_quad_mesh draw_tex draw_text
+        finalize open_group start_filter stop_filter draw_gouraud_triangle
+        draw_gouraud_triangles
+        """.split()
+    def _flushing(self, method):
+        def flush_and_call(*args, **kwargs):
+            if not self._rasterizing:
+                self._flush_raster()
+            return getattr(self._renderer, method)(*args, **kwargs)
+        return flush_and_call
+
+    # the number of unused buffers kept for reuse
+    _pool_size = 2
+
+    # regions are merged while the merged image is at most this many
+    # times as large as the two images would be
+    _merge_ratio = 2.0
+
+    def _get_buffer(self, nbytes):
+        """
+        Return a uint8 array of at least *nbytes* bytes, from the
+        buffers of finished raster images if one is large enough.
+        """
+        fits = [i for i, buf in enumerate(self._buffers) if len(buf) >= nbytes]
+        if fits:
+            i = min(fits, key=lambda i: len(self._buffers[i]))
+            return self._buffers.pop(i)
+        return np.empty(nbytes, np.uint8)
+
+    def _release_buffer(self, buf):
+        self._buffers.append(buf)
+        if len(self._buffers) > self._pool_size:
+            sizes = [len(b) for b in self._buffers]
+            self._buffers.pop(sizes.index(min(sizes)))
+
+    def _get_region(self, bbox):
+        """
+        Return the (x, y, width, height) region, in raster pixels, of the
+        figure covered by *bbox*, a hint passed to start_rasterizing.
+        """
+        width = int(self._width * self.dpi)
+        height = int(self._height * self.dpi)
+        if bbox is None:
+            return 0, 0, width, height
+        if isinstance(bbox, BboxBase):
+            bbox = [bbox]
+        extents = np.array([b.extents for b in bbox])
+        if not len(extents) or not np.isfinite(extents).all():
+            return 0, 0, width, height
+        # leave room for antialiasing at the edges
+        x0 = max(int(np.floor(extents[:, 0].min())) - 2, 0)
+        y0 = max(int(np.floor(extents[:, 1].min())) - 2, 0)
+        x1 = min(int(np.ceil(extents[:, 2].max())) + 2, width)
+        y1 = min(int(np.ceil(extents[:, 3].max())) + 2, height)
+        if x1 <= x0 or y1 <= y0:
+            return 0, 0, 1, 1
+        return x0, y0, x1 - x0, y1 - y0
+
+    def _new_raster_renderer(self, region):
+        x, y, w, h = region
+        self._raster_region = region
+        self._raster_buffer = self._get_buffer(w * h * 4)
+        self._raster_renderer = self._raster_renderer_class(
+            w, h, self.dpi, buffer=self._raster_buffer, origin=(x, y))
+
+    def _start_raster(self, region):
+        """
+        Set up the raster renderer for drawing in *region*, adding to
+        the pending raster image when the regions are close enough.
+        """
+        if self._raster_renderer is None:
+            self._new_raster_renderer(region)
+            return
+
+        x0, y0, w0, h0 = old = self._raster_region
+        x1, y1, w1, h1 = region
+        ux, uy = min(x0, x1), min(y0, y1)
+        uw = max(x0 + w0, x1 + w1) - ux
+        uh = max(y0 + h0, y1 + h1) - uy
+        if (ux, uy, uw, uh) == old:
+            return
+        if uw * uh > self._merge_ratio * (w0 * h0 + w1 * h1):
+            self._flush_raster()
+            self._new_raster_renderer(region)
+            return
+
+        # copy the pending image into a buffer covering both regions
+        old_buffer = self._raster_buffer
+        self._new_raster_renderer((ux, uy, uw, uh))
+        pixels = self._raster_buffer[:uw * uh * 4].reshape((uh, uw, 4))
+        top = uy + uh - (y0 + h0)
+        left = x0 - ux
+        pixels[top:top + h0, left:left + w0] = \
+            old_buffer[:w0 * h0 * 4].reshape((h0, w0, 4))
+        self._release_buffer(old_buffer)
+
+    def _flush_raster(self):
+        """
+        Draw the pending raster image, if any, on the vector renderer.
+        """
+        if self._raster_renderer is None:
+            return
+        self._set_current_renderer(self._vector_renderer)
+
+        x, y, width, height = self._raster_region
+        buffer, bounds = self._raster_renderer.tostring_rgba_minimized()
+        l, b, w, h = bounds
+        if w > 0 and h > 0:
+            image = frombuffer(buffer, w, h, True)
+            image.is_grayscale = False
+            image.flipud_out()
+            gc = self._renderer.new_gc()
+            self._renderer.draw_image(
+                gc,
+                float(x + l)/self.dpi*72.,
+                float(y + height - b - h)/self.dpi*72.,
+                image)
+        self._raster_renderer = None
+        self._raster_region = None
+        self._release_buffer(self._raster_buffer)
+        self._raster_buffer = None
+
+    def start_rasterizing(self, bbox=None):
         """
         Enter "raster" mode.  All subsequent drawing commands (until
         stop_rasterizing is called) will be drawn with the raster
         backend.
 
+        *bbox*, a :class:`~matplotlib.transforms.BboxBase` or a list
+        of them, bounds the drawing to come; it is read at the raster
+        dpi.  If None, the drawing may cover the whole figure.
+
         If start_rasterizing is called multiple times before
         stop_rasterizing is called, this method has no effect.
         """
@@ -93,8 +240,7 @@ class MixedModeRenderer(object):
 
 
         if self._rasterizing == 0:
-            self._raster_renderer = self._raster_renderer_class(
-                self._width*self.dpi, self._height*self.dpi, self.dpi)
+            self._start_raster(self._get_region(bbox))
             self._set_current_renderer(self._raster_renderer)
         self._rasterizing += 1
 
@@ -103,7 +249,8 @@ class MixedModeRenderer(object):
         """
         Exit "raster" mode.  All of the drawing that was done since
         the last start_rasterizing command will be copied to the
-        vector backend by calling draw_image.
+        vector backend by calling draw_image, before the next drawing
+        on the vector backend.
 
         If stop_rasterizing is called multiple times before
         start_rasterizing is called, this method has no effect.
@@ -111,22 +258,9 @@ class MixedModeRenderer(object):
         self._rasterizing -= 1
         if self._rasterizing == 0:
             self._set_current_renderer(self._vector_renderer)
-
-            width, height = self._width * self.dpi, self._height * self.dpi
-            buffer, bounds = self._raster_renderer.tostring_rgba_minimized()
-            l, b, w, h = bounds
-            if w > 0 and h > 0:
-                image = frombuffer(buffer, w, h, True)
-                image.is_grayscale = False
-                image.flipud_out()
-                gc = self._renderer.new_gc()
-                self._renderer.draw_image(
-                    gc,
-                    float(l)/self.dpi*72.,
-                    (float(height) - b - h)/self.dpi*72.,
-                    image)
-            self._raster_renderer = None
-            self._rasterizing = False
+            for method in self._flush_methods:
+                if hasattr(self._vector_renderer, method):
+                    setattr(self, method, self._flushing(method))
 
         # restore the figure dpi.
         self.figure.set_dpi(72)
@@ -12,6 +12,10 @@ import sys
 import time
 import warnings
 import zlib
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5 #Deprecated in 2.5
 
 import numpy as np
 
@@ -31,7 +35,6 @@ from matplotlib.backend_bases import RendererBase, GraphicsContextBase,\
 from matplotlib.backends.backend_mixed import MixedModeRenderer
 from matplotlib.cbook import Bunch, is_string_like, reverse_dict, \
     get_realpath_and_stat, is_writable_file_like, maxdict
-from matplotlib.mlab import quad2cubic
 from matplotlib.figure import Figure
 from matplotlib.font_manager import findfont, is_opentype_cff_font
 from matplotlib.afm import AFM
@@ -42,6 +45,7 @@ from matplotlib.ft2font import FT2Font, FIXED_WIDTH, ITALIC, LOAD_NO_SCALE, \
 from matplotlib.mathtext import MathTextParser
 from matplotlib.transforms import Affine2D, Bbox, BboxBase, TransformedPath
 from matplotlib.path import Path
+from matplotlib._path import convert_to_string
 from matplotlib import ttconv
 
 # Overview
@@ -208,6 +212,26 @@ def pdfRepr(obj):
             "Don't know a PDF representation for %s objects." \
             % type(obj)
 
+class Verbatim(object):
+    """Store verbatim PDF command content for later inclusion in the
+    stream."""
+    __slots__ = ('_x',)
+
+    def __init__(self, x):
+        self._x = x
+
+    def __eq__(self, other):
+        return isinstance(other, Verbatim) and self._x == other._x
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._x)
+
+    def pdfRepr(self):
+        return self._x
+
 class Reference(object):
     """PDF reference object.
     Use PdfFile.reserveObject() to create References.
@@ -428,6 +452,13 @@ class PdfFile(object):
         self.markers = {}
         self.multi_byte_charprocs = {}
 
+        # the uncompressed size of the image and marker data that was
+        # not written again, because the same contents were first used
+        # on an earlier page; reuses within a page are not counted
+        self.deduplicatedBytes = 0
+        # maps image and marker names to the page of their first use
+        self.xobjectPages = {}
+
         # The PDF spec recommends to include every procset
         procsets = [ Name(x)
                      for x in "PDF Text ImageB ImageC ImageI".split() ]
@@ -472,7 +503,8 @@ class PdfFile(object):
                                for val in self.alphaStates.values()]))
         self.writeHatches()
         self.writeGouraudTriangles()
-        xobjects = dict(self.images.values())
+        xobjects = dict([(name, ob)
+                         for name, ob, img in self.images.values()])
         for tup in self.markers.values():
             xobjects[tup[0]] = tup[1]
         for name, value in self.multi_byte_charprocs.items():
@@ -480,6 +512,9 @@ class PdfFile(object):
         self.writeObject(self.XObjectObject, xobjects)
         self.writeImages()
         self.writeMarkers()
+        matplotlib.verbose.report(
+            'Images and markers shared with earlier pages saved %d bytes'
+            % self.deduplicatedBytes, 'helpful')
         self.writeObject(self.pagesObject,
                          { 'Type': Name('Pages'),
                            'Kids': self.pageList,
@@ -1119,16 +1154,28 @@ end"""
         self.writeObject(self.gouraudObject, gouraudDict)
 
     def imageObject(self, image):
-        """Return name of an image XObject representing the given image."""
-
-        pair = self.images.get(image, None)
-        if pair is not None:
-            return pair[0]
+        """Return name of an image XObject representing the given image.
+        Images with the same contents share an XObject, on all pages."""
+
+        image.flipud_out()
+        height, width, data = image.as_rgba_str()
+        image.flipud_out()
+        key = (height, width, bool(image.is_grayscale), md5(data).digest())
+        entry = self.images.get(key, None)
+        if entry is not None:
+            name = entry[0]
+            if self.xobjectPages[name] < len(self.pageList):
+                if image.is_grayscale:
+                    self.deduplicatedBytes += height * width
+                else:
+                    self.deduplicatedBytes += height * width * 4
+            return name
 
         name = Name('I%d' % self.nextImage)
         ob = self.reserveObject('image %d' % self.nextImage)
         self.nextImage += 1
-        self.images[image] = (name, ob)
+        self.images[key] = (name, ob, image)
+        self.xobjectPages[name] = len(self.pageList)
         return name
 
     ## These two from backend_ps.py
@@ -1155,12 +1202,12 @@ end"""
         return rgbat[0], rgbat[1], gray.tostring()
 
     def writeImages(self):
-        for img, pair in self.images.items():
+        for name, ob, img in self.images.values():
             img.flipud_out()
             if img.is_grayscale:
                 height, width, data = self._gray(img)
                 self.beginStream(
-                    pair[1].id,
+                    ob.id,
                     self.reserveObject('length of image stream'),
                     {'Type': Name('XObject'), 'Subtype': Name('Image'),
                      'Width': width, 'Height': height,
@@ -1180,7 +1227,7 @@ end"""
                 self.endStream()
 
                 self.beginStream(
-                    pair[1].id,
+                    ob.id,
                     self.reserveObject('length of image stream'),
                     {'Type': Name('XObject'), 'Subtype': Name('Image'),
                      'Width': width, 'Height': height,
@@ -1201,10 +1248,14 @@ end"""
             ob = self.reserveObject('marker %d' % len(self.markers))
             bbox = path.get_extents(trans)
             self.markers[key] = [name, ob, bbox, lw]
+            self.xobjectPages[name] = len(self.pageList)
         else:
             if result[-1] < lw:
                 result[-1] = lw
             name = result[0]
+            if self.xobjectPages[name] < len(self.pageList):
+                self.deduplicatedBytes += sum([len(pdfRepr(op))
+                                               for op in pathops])
         return name
 
     def writeMarkers(self):
@@ -1223,31 +1274,11 @@ end"""
 
     @staticmethod
     def pathOperations(path, transform, clip=None, simplify=None):
-        cmds = []
-        last_points = None
-        for points, code in path.iter_segments(transform, clip=clip,
-                                               simplify=simplify):
-            if code == Path.MOVETO:
-                # This is allowed anywhere in the path
-                cmds.extend(points)
-                cmds.append(Op.moveto)
-            elif last_points is None:
-                # The other operations require a previous point
-                raise ValueError, 'Path lacks initial MOVETO'
-            elif code == Path.LINETO:
-                cmds.extend(points)
-                cmds.append(Op.lineto)
-            elif code == Path.CURVE3:
-                points = quad2cubic(*(list(last_points[-2:]) + list(points)))
-                cmds.extend(points[2:])
-                cmds.append(Op.curveto)
-            elif code == Path.CURVE4:
-                cmds.extend(points)
-                cmds.append(Op.curveto)
-            elif code == Path.CLOSEPOLY:
-                cmds.append(Op.closepath)
-            last_points = points
-        return cmds
+        return [Verbatim(convert_to_string(
+                    path, transform, clip, simplify, rcParams['pdf.precision'],
+                    (Op.moveto.op, Op.lineto.op, '', Op.curveto.op,
+                     Op.closepath.op),
+                    True))]
 
     def writePath(self, path, transform, clip=False):
         if clip:
@@ -1361,8 +1392,7 @@ class RendererPdf(RendererBase):
 
     def tex_font_mapping(self, texfont):
         if self.tex_font_map is None:
-            self.tex_font_map = \
-                dviread.PsfontsMap(dviread.find_tex_file('pdftex.map'))
+            self.tex_font_map = dviread.get_psfonts_map('pdftex.map')
         return self.tex_font_map[texfont]
 
     def track_characters(self, font, s):
@@ -1528,9 +1558,7 @@ class RendererPdf(RendererBase):
         texmanager = self.get_texmanager()
         fontsize = prop.get_size_in_points()
         dvifile = texmanager.make_dvi(s, fontsize)
-        dvi = dviread.Dvi(dvifile, 72)
-        page = iter(dvi).next()
-        dvi.close()
+        page = dviread.first_page(dvifile, 72)
 
         # Gather font information and do some setup for combining
         # characters into strings. The variable seq will contain a
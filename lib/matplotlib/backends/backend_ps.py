@@ -11,8 +11,11 @@ try:
 except ImportError:
     from md5 import md5 #Deprecated in 2.5
 
-from tempfile import mkstemp
-from cStringIO import StringIO
+from tempfile import mkstemp, TemporaryFile
+try:
+    from tempfile import SpooledTemporaryFile
+except ImportError: # python < 2.6
+    SpooledTemporaryFile = None
 from matplotlib import verbose, __version__, rcParams
 from matplotlib._pylab_helpers import Gcf
 from matplotlib.afm import AFM
@@ -21,7 +24,6 @@ from matplotlib.backend_bases import RendererBase, GraphicsContextBase,\
 
 from matplotlib.cbook import is_string_like, get_realpath_and_stat, \
     is_writable_file_like, maxdict
-from matplotlib.mlab import quad2cubic
 from matplotlib.figure import Figure
 
 from matplotlib.font_manager import findfont, is_opentype_cff_font
@@ -31,6 +33,7 @@ from matplotlib.mathtext import MathTextParser
 from matplotlib._mathtext_data import uni2type1
 from matplotlib.text import Text
 from matplotlib.path import Path
+from matplotlib._path import convert_to_string
 from matplotlib.transforms import Affine2D
 
 from matplotlib.backends.backend_mixed import MixedModeRenderer
@@ -464,31 +467,14 @@ grestore
         im.flipud_out()
 
     def _convert_path(self, path, transform, clip=False, simplify=None):
-        ps = []
-        last_points = None
         if clip:
             clip = (0.0, 0.0, self.width * 72.0,
                     self.height * 72.0)
         else:
             clip = None
-        for points, code in path.iter_segments(transform, clip=clip,
-                                               simplify=simplify):
-            if code == Path.MOVETO:
-                ps.append("%g %g m" % tuple(points))
-            elif code == Path.LINETO:
-                ps.append("%g %g l" % tuple(points))
-            elif code == Path.CURVE3:
-                points = quad2cubic(*(list(last_points[-2:]) + list(points)))
-                ps.append("%g %g %g %g %g %g c" %
-                          tuple(points[2:]))
-            elif code == Path.CURVE4:
-                ps.append("%g %g %g %g %g %g c" % tuple(points))
-            elif code == Path.CLOSEPOLY:
-                ps.append("cl")
-            last_points = points
-
-        ps = "\n".join(ps)
-        return ps
+        return convert_to_string(path, transform, clip, simplify,
+                                 rcParams['ps.precision'],
+                                 ('m', 'l', '', 'c', 'cl'), True)
 
     def _get_clip_path(self, clippath, clippath_transform):
         id = self._clip_paths.get((clippath, clippath_transform))
@@ -538,10 +524,16 @@ grestore
 
         ps_cmd.extend(['stroke', 'grestore', '} bind def'])
 
-        for vertices, code in path.iter_segments(trans, simplify=False):
-            if len(vertices):
-                x, y = vertices[-2:]
-                ps_cmd.append("%g %g o" % (x, y))
+        if path.codes is None:
+            # a marker at each vertex, skipping the nans
+            ps_cmd.append(convert_to_string(path, trans, None, False,
+                                            rcParams['ps.precision'],
+                                            ('o', 'o', '', '', ''), True))
+        else:
+            for vertices, code in path.iter_segments(trans, simplify=False):
+                if len(vertices):
+                    x, y = vertices[-2:]
+                    ps_cmd.append("%g %g o" % (x, y))
 
         ps = '\n'.join(ps_cmd)
         self._draw_ps(ps, gc, rgbFace, fill=False, stroke=False)
@@ -998,7 +990,7 @@ class FigureCanvasPS(FigureCanvasBase):
 
             self._pswriter = NullWriter()
         else:
-            self._pswriter = StringIO()
+            self._pswriter = _spooled_file()
 
 
         # mixed mode rendering
@@ -1076,7 +1068,10 @@ class FigureCanvasPS(FigureCanvasBase):
         print >>fh, "%s clipbox"%_nums_to_str(width*72, height*72, 0, 0)
 
         # write the figure
-        print >>fh, self._pswriter.getvalue()
+        self._pswriter.seek(0)
+        shutil.copyfileobj(self._pswriter, fh)
+        self._pswriter.close()
+        print >>fh
 
         # write the trailer
         #print >>fh, "grestore"
@@ -1092,7 +1087,10 @@ class FigureCanvasPS(FigureCanvasBase):
 
         if passed_in_file_object:
             fh = open(tmpfile)
-            print >>outfile, fh.read()
+            shutil.copyfileobj(fh, outfile)
+            print >>outfile
+            fh.close()
+            os.remove(tmpfile)
         else:
             open(outfile, 'w')
             mode = os.stat(outfile).st_mode
@@ -1140,7 +1138,7 @@ class FigureCanvasPS(FigureCanvasBase):
 
             self._pswriter = NullWriter()
         else:
-            self._pswriter = StringIO()
+            self._pswriter = _spooled_file()
 
 
         # mixed mode rendering
@@ -1185,7 +1183,10 @@ class FigureCanvasPS(FigureCanvasBase):
         print >>fh, "%s clipbox"%_nums_to_str(width*72, height*72, 0, 0)
 
         # write the figure
-        print >>fh, self._pswriter.getvalue()
+        self._pswriter.seek(0)
+        shutil.copyfileobj(self._pswriter, fh)
+        self._pswriter.close()
+        print >>fh
 
         # write the trailer
         #print >>fh, "grestore"
@@ -1240,13 +1241,29 @@ class FigureCanvasPS(FigureCanvasBase):
 
         if  isinstance(outfile, file):
             fh = file(tmpfile)
-            print >>outfile, fh.read()
+            shutil.copyfileobj(fh, outfile)
+            print >>outfile
+            fh.close()
+            os.remove(tmpfile)
         else:
             open(outfile, 'w')
             mode = os.stat(outfile).st_mode
             shutil.move(tmpfile, outfile)
             os.chmod(outfile, mode)
 
+# the size up to which the PostScript code of the figure is kept in
+# memory, before it is written to a temporary file
+_spool_size = 1 << 22
+
+def _spooled_file():
+    """
+    Return a temporary file for the PostScript code of a figure, kept
+    in memory until it grows past *_spool_size* bytes.
+    """
+    if SpooledTemporaryFile is None:
+        return TemporaryFile()
+    return SpooledTemporaryFile(_spool_size)
+
 def convert_psfrags(tmpfile, psfrags, font_preamble, custom_preamble,
                     paperWidth, paperHeight, orientation):
     """
@@ -20,6 +20,7 @@ from matplotlib.font_manager import findfont, FontProperties
 from matplotlib.ft2font import FT2Font, KERNING_DEFAULT, LOAD_NO_HINTING
 from matplotlib.mathtext import MathTextParser
 from matplotlib.path import Path
+from matplotlib._path import convert_to_string
 from matplotlib.transforms import Affine2D
 from matplotlib import _png
 
@@ -36,6 +37,19 @@ def new_figure_manager(num, *args, **kwargs):
 
 
 _capstyle_d = {'projecting' : 'square', 'butt' : 'butt', 'round': 'round',}
+
+def short_float_fmt(x, precision=6):
+    """
+    Return *x* with *precision* decimals at most, without the trailing
+    zeros; e.g. 2.5 rather than 2.500000.
+    """
+    s = '%.*f' % (precision, x)
+    if '.' in s:
+        s = s.rstrip('0').rstrip('.')
+    if s == '-0':
+        s = '0'
+    return s
+
 class RendererSVG(RendererBase):
     FONT_SCALE = 100.0
     fontd = maxdict(50)
@@ -54,6 +68,10 @@ class RendererSVG(RendererBase):
         self._char_defs = {}
         self._markers = {}
         self._path_collection_id = 0
+        self._styled = maxdict(1000)
+        self._style_classes = {}
+        self._precision = rcParams['svg.precision']
+        self._compact_paths = rcParams['svg.compact_paths']
         self._imaged = {}
         self._hatchd = {}
         self._n_gradients = 0
@@ -162,6 +180,25 @@ class RendererSVG(RendererBase):
                          gc.get_alpha(),
                 )
 
+    def _get_cached_style(self, gc, rgbFace):
+        """
+        Return the style string of *gc* and *rgbFace*, looked up by the
+        properties making it up, which are quicker to get than the
+        style itself.
+        """
+        offset, seq = gc.get_dashes()
+        if rgbFace is not None:
+            rgbFace = tuple(rgbFace)
+        if seq is not None:
+            seq = tuple(seq)
+        key = (rgbFace, tuple(gc.get_rgb()), gc.get_linewidth(),
+               gc.get_joinstyle(), gc.get_capstyle(), offset, seq,
+               gc.get_alpha(), gc.get_hatch())
+        style = self._styled.get(key)
+        if style is None:
+            style = self._styled[key] = self._get_style(gc, rgbFace)
+        return style
+
     def _get_gc_clip_svg(self, gc):
         cliprect = gc.get_clip_rectangle()
         clippath, clippath_trans = gc.get_clip_path()
@@ -205,11 +242,11 @@ class RendererSVG(RendererBase):
         """
         return rcParams['svg.image_noscale']
 
-    _path_commands = {
-        Path.MOVETO: 'M%f %f',
-        Path.LINETO: 'L%f %f',
-        Path.CURVE3: 'Q%f %f %f %f',
-        Path.CURVE4: 'C%f %f %f %f %f %f'
+    _path_letters = {
+        Path.MOVETO: 'M',
+        Path.LINETO: 'L',
+        Path.CURVE3: 'Q',
+        Path.CURVE4: 'C'
         }
 
     def _make_flip_transform(self, transform):
@@ -219,23 +256,71 @@ class RendererSVG(RendererBase):
                 .translate(0.0, self.height))
 
     def _convert_path(self, path, transform, clip=False, simplify=None):
-        path_data = []
-        appender = path_data.append
-        path_commands = self._path_commands
-        currpos = 0
+        """
+        Return the path data of *path* transformed by *transform*, with
+        the coordinates written with :attr:`_precision` decimals at most.
+        If svg.compact_paths is set, the coordinates are relative to the
+        current point and the redundant commands and separators are
+        left out.
+        """
+        precision = self._precision
         if clip:
             clip = (0.0, 0.0, self.width, self.height)
         else:
             clip = None
+        if not self._compact_paths:
+            return convert_to_string(path, transform, clip, simplify,
+                                     precision, ('M', 'L', 'Q', 'C', 'z'),
+                                     False)
+
+        path_data = []
+        appender = path_data.append
+        path_letters = self._path_letters
+        currpos = 0
+        # the current point, start of the subpath and last command
+        x0 = y0 = xstart = ystart = 0.0
+        last = None
         for points, code in path.iter_segments(transform, clip=clip,
                                                simplify=simplify):
             if code == Path.CLOSEPOLY:
                 segment = 'z'
+                x0, y0 = xstart, ystart
+                last = 'z'
             else:
-                segment = path_commands[code] % tuple(points)
+                letter = path_letters[code].lower()
+                # relative to the rounded current point, so that the
+                # rounding errors do not add up
+                points = [round(val, precision) for val in points]
+                nums = []
+                for i in range(0, len(points), 2):
+                    for val in (points[i] - x0, points[i+1] - y0):
+                        num = short_float_fmt(val, precision)
+                        if num.startswith('0.'):
+                            num = num[1:]
+                        elif num.startswith('-0.'):
+                            num = '-' + num[2:]
+                        nums.append(num)
+                x0, y0 = points[-2:]
+                if code == Path.MOVETO:
+                    xstart, ystart = x0, y0
+                segment = nums[0]
+                for num in nums[1:]:
+                    if num[0] != '-':
+                        segment += ' '
+                    segment += num
+                # a command repeats itself, and a moveto is followed by
+                # linetos
+                if (letter == last and letter != 'm' or
+                    letter == 'l' and last == 'm'):
+                    if segment[0] != '-' and currpos:
+                        segment = ' ' + segment
+                else:
+                    segment = letter + segment
+                    last = letter
 
             if currpos + len(segment) > 75:
                 appender("\n")
+                segment = segment.lstrip()
                 currpos = 0
             appender(segment)
             currpos += len(segment)
@@ -267,14 +352,18 @@ class RendererSVG(RendererBase):
         else:
             clippath = 'clip-path="url(#%s)"' % clipid
 
-        write('<g %s>' % clippath)
+        # all the markers share the style of the group
+        write('<g style="%s" %s>\n' % (self._get_style(gc, rgbFace), clippath))
         trans_and_flip = self._make_flip_transform(trans)
+        precision = self._precision
+        uses = []
         for vertices, code in path.iter_segments(trans_and_flip, simplify=False):
             if len(vertices):
                 x, y = vertices[-2:]
-                details = 'xlink:href="#%s" x="%f" y="%f"' % (name, x, y)
-                style = self._get_style(gc, rgbFace)
-                self._svgwriter.write ('<use style="%s" %s/>\n' % (style, details))
+                uses.append('<use xlink:href="#%s" x="%s" y="%s"/>\n' % (
+                    name, short_float_fmt(x, precision),
+                    short_float_fmt(y, precision)))
+        write(''.join(uses))
         write('</g>')
 
     def draw_path_collection(self, gc, master_transform, paths, all_transforms,
@@ -294,22 +383,59 @@ class RendererSVG(RendererBase):
             path_codes.append(name)
         write('</defs>\n')
 
+        # The styles used by several items are written once, as CSS
+        # classes, and consecutive items with the same clip path share
+        # a group.
+        items = []
+        counts = {}
+        clip = None
         for xo, yo, path_id, gc0, rgbFace in self._iter_collection(
             gc, path_codes, offsets, offsetTrans, facecolors, edgecolors,
             linewidths, linestyles, antialiaseds, urls):
-            clipid = self._get_gc_clip_svg(gc0)
-            url = gc0.get_url()
+            # the items usually share their clip rectangle or path
+            cliprect = gc0.get_clip_rectangle()
+            clippath, clippath_trans = gc0.get_clip_path()
+            if (clip is None or cliprect is not clip[0] or
+                clippath is not clip[1] or clippath_trans is not clip[2]):
+                clip = cliprect, clippath, clippath_trans
+                clipid = self._get_gc_clip_svg(gc0)
+            style = self._get_cached_style(gc0, rgbFace)
+            counts[style] = counts.get(style, 0) + 1
+            items.append((clipid, style, gc0.get_url(), path_id, xo, yo))
+
+        classes = []
+        for style in sorted(counts):
+            if counts[style] > 1 and style not in self._style_classes:
+                name = 's%s' % md5(style).hexdigest()[:8]
+                self._style_classes[style] = name
+                classes.append('.%s{%s}\n' % (name, style))
+        if classes:
+            write('<defs><style type="text/css"><![CDATA[\n%s]]></style>'
+                  '</defs>\n' % ''.join(classes))
+
+        precision = self._precision
+        group_clipid = None
+        for clipid, style, url, path_id, xo, yo in items:
+            if clipid != group_clipid:
+                if group_clipid is not None:
+                    write('</g>\n')
+                if clipid is not None:
+                    write('<g clip-path="url(#%s)">\n' % clipid)
+                group_clipid = clipid
+            name = self._style_classes.get(style)
+            if name is None:
+                style = 'style="%s"' % style
+            else:
+                style = 'class="%s"' % name
             if url is not None:
-                self._svgwriter.write('<a xlink:href="%s">' % url)
-            if clipid is not None:
-                write('<g clip-path="url(#%s)">' % clipid)
-            details = 'xlink:href="#%s" x="%f" y="%f"' % (path_id, xo, self.height - yo)
-            style = self._get_style(gc0, rgbFace)
-            self._svgwriter.write ('<use style="%s" %s/>\n' % (style, details))
-            if clipid is not None:
-                write('</g>')
+                write('<a xlink:href="%s">' % url)
+            write('<use xlink:href="#%s" %s x="%s" y="%s"/>\n' % (
+                path_id, style, short_float_fmt(xo, precision),
+                short_float_fmt(self.height - yo, precision)))
             if url is not None:
-                self._svgwriter.write('</a>')
+                write('</a>')
+        if group_clipid is not None:
+            write('</g>\n')
 
         self._path_collection_id += 1
 
@@ -135,11 +135,30 @@ class Collection(artist.Artist, cm.ScalarMappable):
         return val
 
     def get_paths(self):
+        if isinstance(self._paths, mpath.PackedPaths):
+            # Callers may edit the returned list in place (contour
+            # labelling does), so from here on keep a real list.
+            self._paths = list(self._paths)
         return self._paths
 
     def set_paths(self):
         raise NotImplementedError
 
+    def _get_render_paths(self):
+        """
+        Return the paths for drawing, hit testing and extents.  Unlike
+        :meth:`get_paths`, this leaves packed paths packed.
+        """
+        if isinstance(self._paths, mpath.PackedPaths):
+            return self._paths
+        return self.get_paths()
+
+    @staticmethod
+    def _transform_paths_non_affine(transform, paths):
+        if isinstance(paths, mpath.PackedPaths):
+            return paths.transformed_non_affine(transform)
+        return [transform.transform_path_non_affine(p) for p in paths]
+
     def get_transforms(self):
         return self._transforms
 
@@ -147,9 +166,9 @@ class Collection(artist.Artist, cm.ScalarMappable):
         transform = self.get_transform()
         transOffset = self._transOffset
         offsets = self._offsets
-        paths = self.get_paths()
+        paths = self._get_render_paths()
         if not transform.is_affine:
-            paths = [transform.transform_path_non_affine(p) for p in paths]
+            paths = self._transform_paths_non_affine(transform, paths)
             transform = transform.get_affine()
         if not transOffset.is_affine:
             offsets = transOffset.transform_non_affine(offsets)
@@ -162,6 +181,12 @@ class Collection(artist.Artist, cm.ScalarMappable):
         result = result.inverse_transformed(transData)
         return result
 
+    def _get_raster_bbox(self):
+        # everything is drawn with the clipping of the artist
+        if self.get_clip_on():
+            return self.get_clip_box()
+        return None
+
     def get_window_extent(self, renderer):
         bbox = self.get_datalim(transforms.IdentityTransform())
         #TODO:check to ensure that this does not fail for
@@ -174,11 +199,11 @@ class Collection(artist.Artist, cm.ScalarMappable):
         transform = self.get_transform()
         transOffset = self._transOffset
         offsets = self._offsets
-        paths = self.get_paths()
+        paths = self._get_render_paths()
 
         if self.have_units():
             paths = []
-            for path in self.get_paths():
+            for path in self._get_render_paths():
                 vertices = path.vertices
                 xs, ys = vertices[:, 0], vertices[:, 1]
                 xs = self.convert_xunits(xs)
@@ -192,7 +217,7 @@ class Collection(artist.Artist, cm.ScalarMappable):
         offsets = np.asarray(offsets, np.float_)
 
         if not transform.is_affine:
-            paths = [transform.transform_path_non_affine(path) for path in paths]
+            paths = self._transform_paths_non_affine(transform, paths)
             transform = transform.get_affine()
         if not transOffset.is_affine:
             offsets = transOffset.transform_non_affine(offsets)
@@ -565,6 +590,11 @@ class PolyCollection(Collection):
 
         *closed*, when *True*, will explicitly close the polygon.
 
+        The polygons are stored packed, in a single vertex array (see
+        :class:`~matplotlib.path.PackedPaths`); :meth:`get_paths`
+        unpacks them into a list of :class:`~matplotlib.path.Path`
+        views on first use.
+
         %(Collection)s
         """
         Collection.__init__(self,**kwargs)
@@ -573,27 +603,22 @@ class PolyCollection(Collection):
 
     def set_verts(self, verts, closed=True):
         '''This allows one to delay initialization of the vertices.'''
-        if np.ma.isMaskedArray(verts):
-            verts = verts.astype(np.float_).filled(np.nan)
-            # This is much faster than having Path do it one at a time.
+        self._paths = mpath.PackedPaths.from_polylines(verts, closed)
+
+    def set_packed_verts(self, vertices, starts, closed=True):
+        '''
+        Set the polygons from a packed representation: polygon *i* is
+        ``vertices[starts[i]:starts[i+1]]``, so *starts* has one more
+        entry than there are polygons.  This avoids building a
+        separate array per polygon.
+
+        If *closed* is True, a ``CLOSEPOLY`` vertex is added to each
+        nonempty polygon, as in :meth:`set_verts`.
+        '''
         if closed:
-            self._paths = []
-            for xy in verts:
-                if len(xy):
-                    if np.ma.isMaskedArray(xy):
-                        xy = np.ma.concatenate([xy, np.zeros((1,2))])
-                    else:
-                        xy = np.asarray(xy)
-                        xy = np.concatenate([xy, np.zeros((1,2))])
-                    codes = np.empty(xy.shape[0], dtype=mpath.Path.code_type)
-                    codes[:] = mpath.Path.LINETO
-                    codes[0] = mpath.Path.MOVETO
-                    codes[-1] = mpath.Path.CLOSEPOLY
-                    self._paths.append(mpath.Path(xy, codes))
-                else:
-                    self._paths.append(mpath.Path(xy))
+            self._paths = mpath.PackedPaths.closed_polygons(vertices, starts)
         else:
-            self._paths = [mpath.Path(xy) for xy in verts]
+            self._paths = mpath.PackedPaths(vertices, starts)
 
     set_paths = set_verts
 
@@ -831,32 +856,36 @@ class LineCollection(Collection):
 
     def set_segments(self, segments):
         if segments is None: return
-        _segments = []
-
-        for seg in segments:
-
-            if not np.ma.isMaskedArray(seg):
-                seg = np.asarray(seg, np.float_)
-            _segments.append(seg)
+        paths = mpath.PackedPaths.from_polylines(segments)
         if self._uniform_offsets is not None:
-            _segments = self._add_offsets(_segments)
-        self._paths = [mpath.Path(seg) for seg in _segments]
+            paths = self._add_offsets(paths)
+        self._paths = paths
 
     set_verts = set_segments # for compatibility with PolyCollection
     set_paths = set_segments
 
-    def _add_offsets(self, segs):
+    def set_packed_segments(self, vertices, starts):
+        '''
+        Set the segments from a packed representation: segment *i* is
+        ``vertices[starts[i]:starts[i+1]]``, so *starts* has one more
+        entry than there are segments.  This avoids building a
+        separate array per segment.
+        '''
+        paths = mpath.PackedPaths(vertices, starts)
+        if self._uniform_offsets is not None:
+            paths = self._add_offsets(paths)
+        self._paths = paths
+
+    def _add_offsets(self, paths):
         offsets = self._uniform_offsets
-        Nsegs = len(segs)
+        Nsegs = len(paths)
         Noffs = offsets.shape[0]
         if Noffs == 1:
-            for i in range(Nsegs):
-                segs[i] = segs[i] + i * offsets
+            shift = np.arange(Nsegs)[:,np.newaxis] * offsets
         else:
-            for i in range(Nsegs):
-                io = i%Noffs
-                segs[i] = segs[i] + offsets[io:io+1]
-        return segs
+            shift = offsets[np.arange(Nsegs) % Noffs]
+        vertices = paths.vertices + np.repeat(shift, paths.lengths, axis=0)
+        return mpath.PackedPaths(vertices, paths.starts, paths.codes)
 
     def set_color(self, c):
         """
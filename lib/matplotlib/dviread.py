@@ -17,17 +17,117 @@ Interface::
       for x,y,height,width in page.boxes:
           ...
 
+  # or, with the parsed pages of recently read files cached:
+  page = first_page(filename, 72)
+
 """
 
 import errno
+import os
 import matplotlib
 import matplotlib.cbook as mpl_cbook
+from matplotlib.font_manager import pickle_dump, pickle_load
 import numpy as np
 import struct
 import subprocess
 
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5 #Deprecated in 2.5
+
 _dvistate = mpl_cbook.Bunch(pre=0, outer=1, inpage=2, post_post=3, finale=4)
 
+def _page_output(text, boxes, dpi):
+    """
+    Return the Bunch holding the *text* and *boxes* of a page, in dvi
+    units, transformed to *dpi*, along with its width, height and
+    descent.
+    """
+    minx, miny, maxx, maxy = np.inf, np.inf, -np.inf, -np.inf
+    maxy_pure = -np.inf
+    for elt in text + boxes:
+        if len(elt) == 4:   # box
+            x,y,h,w = elt
+            e = 0           # zero depth
+        else:               # glyph
+            x,y,font,g,w = elt
+            h,e = font._height_depth_of(g)
+        minx = min(minx, x)
+        miny = min(miny, y - h)
+        maxx = max(maxx, x + w)
+        maxy = max(maxy, y + e)
+        maxy_pure = max(maxy_pure, y)
+
+    if dpi is None:
+        # special case for ease of debugging: output raw dvi coordinates
+        return mpl_cbook.Bunch(text=text, boxes=boxes,
+                               width=maxx-minx, height=maxy_pure-miny,
+                               descent=maxy-maxy_pure)
+
+    d = dpi / (72.27 * 2**16) # from TeX's "scaled points" to dpi units
+    text =  [ ((x-minx)*d, (maxy-y)*d, f, g, w*d)
+              for (x,y,f,g,w) in text ]
+    boxes = [ ((x-minx)*d, (maxy-y)*d, h*d, w*d) for (x,y,h,w) in boxes ]
+
+    return mpl_cbook.Bunch(text=text, boxes=boxes,
+                           width=(maxx-minx)*d,
+                           height=(maxy_pure-miny)*d,
+                           descent=(maxy-maxy_pure)*d)
+
+def _make_opcodes():
+    """
+    Return the table used by :meth:`Dvi._dispatch` to decode the
+    opcodes that have arguments of fixed sizes; the others are None.
+
+    For each byte, the table holds the name of the method implementing
+    the opcode, the arguments implied by the opcode itself, a
+    :class:`struct.Struct` reading the arguments that follow it in the
+    file (None if there are none), and whether that argument is three
+    bytes long, which struct reads as a byte and a short.
+    """
+    codes = {1: 'B', 2: 'H', 3: 'BH', 4: 'I',
+             -1: 'b', -2: 'h', -3: 'bH', -4: 'i'}
+    def opcode(name, args=(), sizes=()):
+        # sizes are negative for signed arguments
+        if sizes:
+            decoder = struct.Struct('>' + ''.join([codes[n] for n in sizes]))
+        else:
+            decoder = None
+        return name, args, decoder, sizes in ((3,), (-3,))
+
+    table = [None] * 256
+    for byte in range(128):
+        table[byte] = opcode('_set_char', (byte,))
+    for byte in range(171, 235):
+        table[byte] = opcode('_fnt_num', (byte-171,))
+    for n in 1, 2, 3, 4:
+        # the four byte variants are signed
+        size = (n == 4) and -4 or n
+        table[127+n] = opcode('_set_char', sizes=(size,))
+        table[132+n] = opcode('_put_char', sizes=(size,))
+        table[142+n] = opcode('_right', sizes=(-n,))
+        table[147+n] = opcode('_right_w', sizes=(-n,))
+        table[152+n] = opcode('_right_x', sizes=(-n,))
+        table[156+n] = opcode('_down', sizes=(-n,))
+        table[161+n] = opcode('_down_y', sizes=(-n,))
+        table[166+n] = opcode('_down_z', sizes=(-n,))
+        table[234+n] = opcode('_fnt_num', sizes=(size,))
+    table[132] = opcode('_set_rule', sizes=(-4, -4))
+    table[137] = opcode('_put_rule', sizes=(-4, -4))
+    table[138] = opcode('_nop')
+    table[139] = opcode('_bop', sizes=(-4,)*11)
+    table[140] = opcode('_eop')
+    table[141] = opcode('_push')
+    table[142] = opcode('_pop')
+    table[147] = opcode('_right_w', (None,))
+    table[152] = opcode('_right_x', (None,))
+    table[161] = opcode('_down_y', (None,))
+    table[166] = opcode('_down_z', (None,))
+    return table
+
+_opcodes = _make_opcodes()
+
 class Dvi(object):
     """
     A dvi ("device-independent") file, as produced by TeX.
@@ -46,6 +146,10 @@ class Dvi(object):
         self.dpi = dpi
         self.fonts = {}
         self.state = _dvistate.pre
+        # the file is decoded from a string holding all of it
+        self._data = None
+        self._pos = 0
+        self._virtual_fonts = {}
 
     def __iter__(self):
         """
@@ -80,45 +184,21 @@ class Dvi(object):
         Output the text and boxes belonging to the most recent page.
         page = dvi._output()
         """
-        minx, miny, maxx, maxy = np.inf, np.inf, -np.inf, -np.inf
-        maxy_pure = -np.inf
-        for elt in self.text + self.boxes:
-            if len(elt) == 4:   # box
-                x,y,h,w = elt
-                e = 0           # zero depth
-            else:               # glyph
-                x,y,font,g,w = elt
-                h,e = font._height_depth_of(g)
-            minx = min(minx, x)
-            miny = min(miny, y - h)
-            maxx = max(maxx, x + w)
-            maxy = max(maxy, y + e)
-            maxy_pure = max(maxy_pure, y)
-
-        if self.dpi is None:
-            # special case for ease of debugging: output raw dvi coordinates
-            return mpl_cbook.Bunch(text=self.text, boxes=self.boxes,
-                                   width=maxx-minx, height=maxy_pure-miny,
-                                   descent=maxy-maxy_pure)
-
-        d = self.dpi / (72.27 * 2**16) # from TeX's "scaled points" to dpi units
-        text =  [ ((x-minx)*d, (maxy-y)*d, f, g, w*d)
-                  for (x,y,f,g,w) in self.text ]
-        boxes = [ ((x-minx)*d, (maxy-y)*d, h*d, w*d) for (x,y,h,w) in self.boxes ]
-
-        return mpl_cbook.Bunch(text=text, boxes=boxes,
-                               width=(maxx-minx)*d,
-                               height=(maxy_pure-miny)*d,
-                               descent=(maxy-maxy_pure)*d)
+        return _page_output(self.text, self.boxes, self.dpi)
 
     def _read(self):
         """
         Read one page from the file. Return True if successful,
         False if there were no more pages.
         """
+        if self._data is None:
+            self._data = self.file.read()
+        data = self._data
+        dispatch = self._dispatch
         while True:
-            byte = ord(self.file.read(1))
-            self._dispatch(byte)
+            byte = ord(data[self._pos])
+            self._pos += 1
+            dispatch(byte)
 #             if self.state == _dvistate.inpage:
 #                 matplotlib.verbose.report(
 #                     'Dvi._read: after %d at %f,%f' %
@@ -130,12 +210,20 @@ class Dvi(object):
                 self.close()
                 return False
 
+    def _read_bytes(self, nbytes):
+        """
+        Read and return the next *nbytes* bytes as a string.
+        """
+        str = self._data[self._pos:self._pos + nbytes]
+        self._pos += nbytes
+        return str
+
     def _arg(self, nbytes, signed=False):
         """
         Read and return an integer argument *nbytes* long.
         Signedness is determined by the *signed* keyword.
         """
-        str = self.file.read(nbytes)
+        str = self._read_bytes(nbytes)
         value = ord(str[0])
         if signed and value >= 0x80:
             value = value - 0x100
@@ -149,67 +237,29 @@ class Dvi(object):
         arguments from the dvi file and call the method implementing
         that opcode with those arguments.
         """
-        if 0 <= byte <= 127: self._set_char(byte)
-        elif byte == 128: self._set_char(self._arg(1))
-        elif byte == 129: self._set_char(self._arg(2))
-        elif byte == 130: self._set_char(self._arg(3))
-        elif byte == 131: self._set_char(self._arg(4, True))
-        elif byte == 132: self._set_rule(self._arg(4, True), self._arg(4, True))
-        elif byte == 133: self._put_char(self._arg(1))
-        elif byte == 134: self._put_char(self._arg(2))
-        elif byte == 135: self._put_char(self._arg(3))
-        elif byte == 136: self._put_char(self._arg(4, True))
-        elif byte == 137: self._put_rule(self._arg(4, True), self._arg(4, True))
-        elif byte == 138: self._nop()
-        elif byte == 139: self._bop(*[self._arg(4, True) for i in range(11)])
-        elif byte == 140: self._eop()
-        elif byte == 141: self._push()
-        elif byte == 142: self._pop()
-        elif byte == 143: self._right(self._arg(1, True))
-        elif byte == 144: self._right(self._arg(2, True))
-        elif byte == 145: self._right(self._arg(3, True))
-        elif byte == 146: self._right(self._arg(4, True))
-        elif byte == 147: self._right_w(None)
-        elif byte == 148: self._right_w(self._arg(1, True))
-        elif byte == 149: self._right_w(self._arg(2, True))
-        elif byte == 150: self._right_w(self._arg(3, True))
-        elif byte == 151: self._right_w(self._arg(4, True))
-        elif byte == 152: self._right_x(None)
-        elif byte == 153: self._right_x(self._arg(1, True))
-        elif byte == 154: self._right_x(self._arg(2, True))
-        elif byte == 155: self._right_x(self._arg(3, True))
-        elif byte == 156: self._right_x(self._arg(4, True))
-        elif byte == 157: self._down(self._arg(1, True))
-        elif byte == 158: self._down(self._arg(2, True))
-        elif byte == 159: self._down(self._arg(3, True))
-        elif byte == 160: self._down(self._arg(4, True))
-        elif byte == 161: self._down_y(None)
-        elif byte == 162: self._down_y(self._arg(1, True))
-        elif byte == 163: self._down_y(self._arg(2, True))
-        elif byte == 164: self._down_y(self._arg(3, True))
-        elif byte == 165: self._down_y(self._arg(4, True))
-        elif byte == 166: self._down_z(None)
-        elif byte == 167: self._down_z(self._arg(1, True))
-        elif byte == 168: self._down_z(self._arg(2, True))
-        elif byte == 169: self._down_z(self._arg(3, True))
-        elif byte == 170: self._down_z(self._arg(4, True))
-        elif 171 <= byte <= 234: self._fnt_num(byte-171)
-        elif byte == 235: self._fnt_num(self._arg(1))
-        elif byte == 236: self._fnt_num(self._arg(2))
-        elif byte == 237: self._fnt_num(self._arg(3))
-        elif byte == 238: self._fnt_num(self._arg(4, True))
+        opcode = _opcodes[byte]
+        if opcode is not None:
+            name, args, decoder, split = opcode
+            if decoder is not None:
+                values = decoder.unpack_from(self._data, self._pos)
+                self._pos += decoder.size
+                if split:
+                    # a three byte argument, read as a byte and a short
+                    values = (0x10000*values[0] + values[1],)
+                args = args + values
+            getattr(self, name)(*args)
         elif 239 <= byte <= 242:
             len = self._arg(byte-238)
-            special = self.file.read(len)
+            special = self._read_bytes(len)
             self._xxx(special)
         elif 243 <= byte <= 246:
             k = self._arg(byte-242, byte==246)
             c, s, d, a, l = [ self._arg(x) for x in (4, 4, 4, 1, 1) ]
-            n = self.file.read(a+l)
+            n = self._read_bytes(a+l)
             self._fnt_def(k, c, s, d, a, l, n)
         elif byte == 247:
             i, num, den, mag, k = [ self._arg(x) for x in (1, 4, 4, 4, 1) ]
-            x = self.file.read(k)
+            x = self._read_bytes(k)
             self._pre(i, num, den, mag, x)
         elif byte == 248: self._post()
         elif byte == 249: self._post_post()
@@ -259,8 +309,11 @@ class Dvi(object):
         else:
             scale = font._scale
             for x, y, f, g, w in font._vf[char].text:
-                newf = DviFont(scale=_mul2012(scale, f._scale),
-                               tfm=f._tfm, texname=f.texname, vf=f._vf)
+                key = f.texname, _mul2012(scale, f._scale)
+                newf = self._virtual_fonts.get(key)
+                if newf is None:
+                    newf = self._virtual_fonts[key] = DviFont(
+                        scale=key[1], tfm=f._tfm, texname=f.texname, vf=f._vf)
                 self.text.append((self.h + _mul2012(x, scale),
                                   self.v + _mul2012(y, scale),
                                   newf, g, newf._width_of(g)))
@@ -482,10 +535,17 @@ class Vf(Dvi):
     def __getitem__(self, code):
         return self._chars[code]
 
+    def __getstate__(self):
+        # only the parsed characters are needed once the file is read
+        return {'_chars': self._chars, '_first_font': self._first_font}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
     def _dispatch(self, byte):
         # If we are in a packet, execute the dvi instructions
         if self.state == _dvistate.inpage:
-            byte_at = self.file.tell()-1
+            byte_at = self._pos-1
             if byte_at == self._packet_ends:
                 self._finalize_packet()
                 # fall through
@@ -508,7 +568,7 @@ class Vf(Dvi):
             Dvi._dispatch(self, byte)
         elif byte == 247:       # preamble
             i, k = self._arg(1), self._arg(1)
-            x = self.file.read(k)
+            x = self._read_bytes(k)
             cs, ds = self._arg(4), self._arg(4)
             self._pre(i, x, cs, ds)
         elif byte == 248:       # postamble (just some number of 248s)
@@ -520,7 +580,7 @@ class Vf(Dvi):
         if self.state != _dvistate.outer:
             raise ValueError, "Misplaced packet in vf file"
         self.state = _dvistate.inpage
-        self._packet_ends = self.file.tell() + pl
+        self._packet_ends = self._pos + pl
         self._packet_char = cc
         self._packet_width = tfm
         self.h, self.v, self.w, self.x, self.y, self.z = 0, 0, 0, 0, 0, 0
@@ -816,8 +876,19 @@ def find_tex_file(filename, format=None):
 
       `Kpathsea documentation <http://www.tug.org/kpathsea/>`_
         The library that :program:`kpsewhich` is part of.
+
+    The results are cached on disk: a file found before is not
+    looked up again while it exists, and a file that was not found is
+    looked up again when the kpsewhich program or the TeX environment
+    variables change.
     """
 
+    cache = _get_kpsewhich_cache()
+    key = (filename, format)
+    result = cache.get(key)
+    if result is not None and (result == '' or os.path.exists(result)):
+        return result
+
     cmd = ['kpsewhich']
     if format is not None:
         cmd += ['--format=' + format]
@@ -829,6 +900,85 @@ def find_tex_file(filename, format=None):
     result = pipe.communicate()[0].rstrip()
     matplotlib.verbose.report('find_tex_file result: %s' % result,
                               'debug')
+    cache[key] = result
+    _save_kpsewhich_cache()
+    return result
+
+# Parsed font files and kpsewhich results are kept on disk in this
+# directory, for use by later processes; it can be removed at any time.
+_cachedir = os.path.join(matplotlib.get_configdir(), 'dviread.cache')
+_kpsewhich_cache = None
+
+def _kpsewhich_stamp():
+    """
+    Return the location and modification time of the kpsewhich
+    program and the TeX environment variables, which determine what
+    kpsewhich finds.
+    """
+    stamp = []
+    for dir in os.environ.get('PATH', '').split(os.pathsep):
+        for name in ('kpsewhich', 'kpsewhich.exe'):
+            path = os.path.join(dir, name)
+            if os.path.isfile(path):
+                stamp.append((path, os.stat(path).st_mtime))
+                break
+        if stamp:
+            break
+    for name in sorted(os.environ):
+        if name.startswith('TEX') or name.endswith('FONTS'):
+            stamp.append((name, os.environ[name]))
+    return stamp
+
+def _load_kpsewhich_cache():
+    try:
+        stamp, cache = pickle_load(os.path.join(_cachedir, 'kpsewhich'))
+    except:
+        return {}
+    if stamp != _kpsewhich_stamp():
+        return {}
+    return cache
+
+def _get_kpsewhich_cache():
+    global _kpsewhich_cache
+    if _kpsewhich_cache is None:
+        _kpsewhich_cache = _load_kpsewhich_cache()
+    return _kpsewhich_cache
+
+def _save_kpsewhich_cache():
+    # merge in the results saved by other processes in the meantime
+    cache = _load_kpsewhich_cache()
+    cache.update(_get_kpsewhich_cache())
+    try:
+        if not os.path.isdir(_cachedir):
+            os.makedirs(_cachedir)
+        pickle_dump((_kpsewhich_stamp(), cache),
+                    os.path.join(_cachedir, 'kpsewhich'))
+    except (IOError, OSError), msg:
+        matplotlib.verbose.report('Could not save kpsewhich cache: %s' % msg)
+
+def _parse_cached(class_, filename):
+    """
+    Return class_(filename), or the result of parsing the same
+    unchanged file in an earlier process.
+    """
+    stat = os.stat(filename)
+    key = (filename, stat.st_mtime, stat.st_size)
+    cachefile = os.path.join(
+        _cachedir, '%s-%s' % (class_.__name__, md5(filename).hexdigest()))
+    try:
+        cachedkey, result = pickle_load(cachefile)
+        if cachedkey == key:
+            return result
+    except:
+        pass
+
+    result = class_(filename)
+    try:
+        if not os.path.isdir(_cachedir):
+            os.makedirs(_cachedir)
+        pickle_dump((key, result), cachefile)
+    except (IOError, OSError), msg:
+        matplotlib.verbose.report('Could not cache %s: %s' % (filename, msg))
     return result
 
 def _read_nointr(pipe, bufsize=-1):
@@ -844,7 +994,7 @@ def _read_nointr(pipe, bufsize=-1):
 
 # With multiple text objects per figure (e.g. tick labels) we may end
 # up reading the same tfm and vf files many times, so we implement a
-# simple cache. TODO: is this worth making persistent?
+# simple cache, backed by the one on disk.
 
 _tfmcache = {}
 _vfcache = {}
@@ -857,7 +1007,7 @@ def _fontfile(texname, class_, suffix, cache):
 
     filename = find_tex_file(texname + suffix)
     if filename:
-        result = class_(filename)
+        result = _parse_cached(class_, filename)
     else:
         result = None
 
@@ -870,6 +1020,43 @@ def _tfmfile(texname):
 def _vffile(texname):
     return _fontfile(texname, Vf, '.vf', _vfcache)
 
+_psfonts_maps = {}
+
+def get_psfonts_map(mapname):
+    """
+    Return the :class:`PsfontsMap` of the map file *mapname*
+    (e.g. 'pdftex.map') found by :func:`find_tex_file`.  The map is
+    only parsed once, and the parsed map is cached on disk.
+    """
+    result = _psfonts_maps.get(mapname)
+    if result is None:
+        result = _parse_cached(PsfontsMap, find_tex_file(mapname))
+        _psfonts_maps[mapname] = result
+    return result
+
+# The parsed pages of the most recently read dvi files.  Strings are
+# laid out and then drawn, both from the same file, and the files of
+# the TeX cache are named after a hash of their source.
+_pagecache = mpl_cbook.maxdict(100)
+
+def first_page(filename, dpi):
+    """
+    Return the first page of the dvi file *filename* at *dpi*, as the
+    first one returned by iterating over ``Dvi(filename, dpi)``.  The
+    contents of the page are cached, so that only the first call for a
+    file reads it; the returned page should not be modified.
+    """
+    stat = os.stat(filename)
+    key = (filename, stat.st_mtime, stat.st_size)
+    contents = _pagecache.get(key)
+    if contents is None:
+        dvi = Dvi(filename, None)
+        try:
+            page = iter(dvi).next()
+        finally:
+            dvi.close()
+        contents = _pagecache[key] = page.text, page.boxes
+    return _page_output(contents[0], contents[1], dpi)
 
 
 if __name__ == '__main__':
@@ -879,7 +1066,7 @@ if __name__ == '__main__':
     try: dpi = float(sys.argv[2])
     except IndexError: dpi = None
     dvi = Dvi(fname, dpi)
-    fontmap = PsfontsMap(find_tex_file('pdftex.map'))
+    fontmap = get_psfonts_map('pdftex.map')
     for page in dvi:
         print '=== new page ==='
         fPrev = None
@@ -16,6 +16,7 @@ import numpy as np
 import artist
 from artist import Artist, allow_rasterization
 from axes import Axes, SubplotBase, subplot_class_factory
+from axis import Axis, Tick
 from cbook import flatten, allequal, Stack, iterable, is_string_like
 import _image
 import colorbar as cbar
@@ -25,7 +26,8 @@ from patches import Rectangle
 from text import Text, _process_text_args
 
 from legend import Legend
-from transforms import Affine2D, Bbox, BboxTransformTo, TransformedBbox
+from transforms import Affine2D, Bbox, BboxTransformTo, TransformedBbox, \
+     interval_contains
 from projections import projection_factory, get_projection_names, \
     get_projection_class
 from matplotlib.blocking_input import BlockingMouseInput, BlockingKeyMouseInput
@@ -811,6 +813,9 @@ class Figure(Artist):
         if not self.get_visible(): return
         renderer.open_group('figure')
 
+        if rcParams['text.usetex']:
+            self._prepare_tex(renderer)
+
         if self.frameon: self.patch.draw(renderer)
 
         # a list of (zorder, func_to_call, list_of_args)
@@ -879,6 +884,60 @@ class Figure(Artist):
 
         self.canvas.draw_event(renderer)
 
+    def _prepare_tex(self, renderer):
+        """
+        Have *renderer* compile the TeX strings of the texts and tick
+        labels of the figure all at once, before they are drawn.  Only
+        the strings that will be drawn are compiled; errors are left
+        to be reported when the string is drawn.
+        """
+        items = set()
+        def add(s, prop):
+            size = prop.get_size_in_points()
+            # used by the layout for the height of a line
+            items.add(('lp', size))
+            for line in s.split('\n'):
+                if line.strip():
+                    items.add((line, size))
+
+        def add_ticks(axis):
+            interval = axis.get_view_interval()
+            for tick, loc, label in axis.iter_ticks():
+                if tick is None or not label:
+                    continue
+                if not interval_contains(interval, loc):
+                    continue
+                for on, text in ((tick.label1On, tick.label1),
+                                 (tick.label2On, tick.label2)):
+                    if on and text.get_visible():
+                        add(label, text.get_fontproperties())
+
+        # walk the visible artists, as draw would
+        artists = [self]
+        while artists:
+            a = artists.pop()
+            if not a.get_visible():
+                continue
+            if isinstance(a, Text):
+                if a.get_text():
+                    add(a.get_text(), a.get_fontproperties())
+            elif isinstance(a, Axis):
+                add_ticks(a)
+                # the tick labels are set from the locator when drawn
+                artists.extend([c for c in a.get_children()
+                                if not isinstance(c, Tick)])
+                continue
+            elif isinstance(a, Legend):
+                # the title is drawn in the legend box, if it is visible
+                artists.extend([c for c in a.get_children()
+                                if c is not a.get_title()])
+                continue
+            artists.extend(a.get_children())
+        try:
+            renderer.prepare_tex(list(items))
+        except RuntimeError:
+            pass
+
     def draw_artist(self, a):
         """
         draw :class:`matplotlib.artist.Artist` instance *a* only --
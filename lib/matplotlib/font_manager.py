@@ -42,7 +42,7 @@ License   : matplotlib license (PSF compatible)
             see license/LICENSE_TTFQUERY.
 """
 
-import os, sys, glob, subprocess, warnings
+import os, sys, glob, re, subprocess, tempfile, warnings
 try:
     set
 except NameError:
@@ -51,7 +51,7 @@ import matplotlib
 from matplotlib import afm
 from matplotlib import ft2font
 from matplotlib import rcParams, get_configdir
-from matplotlib.cbook import is_string_like
+from matplotlib.cbook import is_string_like, maxdict
 from matplotlib.fontconfig_pattern import \
     parse_fontconfig_pattern, generate_fontconfig_pattern
 
@@ -565,50 +565,79 @@ def afmFontProperty(fontpath, font):
     return FontEntry(fontpath, name, style, variant, weight, stretch, size)
 
 
-def createFontList(fontfiles, fontext='ttf'):
+def createFontEntry(fpath, fontext='ttf'):
+    """
+    Return the :class:`FontEntry` of the font file *fpath*, or None
+    if the file can not be read.
+    """
+    verbose.report('createFontDict: %s' % (fpath), 'debug')
+    if fontext == 'afm':
+        try:
+            fh = open(fpath, 'r')
+        except:
+            verbose.report("Could not open font file %s" % fpath)
+            return None
+        try:
+            try:
+                font = afm.AFM(fh)
+            finally:
+                fh.close()
+        except RuntimeError:
+            verbose.report("Could not parse font file %s"%fpath)
+            return None
+        return afmFontProperty(fpath, font)
+    else:
+        try:
+            font = ft2font.FT2Font(str(fpath))
+        except RuntimeError:
+            verbose.report("Could not open font file %s"%fpath)
+            return None
+        except UnicodeError:
+            verbose.report("Cannot handle unicode filenames")
+            #print >> sys.stderr, 'Bad file is', fpath
+            return None
+        try: return ttfFontProperty(font)
+        except: return None
+
+
+def createFontList(fontfiles, fontext='ttf', index=None):
     """
     A function to create a font lookup list.  The default is to create
     a list of TrueType fonts.  An AFM font list can optionally be
     created.
+
+    *index*, if given, is a dictionary mapping font file paths to
+    (mtime, size, entry) tuples.  Files whose modification time and
+    size match their entry in *index* are not opened again; the
+    others are read and their entries stored in *index*.
     """
 
     fontlist = []
     #  Add fonts from list of known font files.
     seen = {}
     for fpath in fontfiles:
-        verbose.report('createFontDict: %s' % (fpath), 'debug')
         fname = os.path.split(fpath)[1]
         if fname in seen:  continue
         else: seen[fname] = 1
-        if fontext == 'afm':
-            try:
-                fh = open(fpath, 'r')
-            except:
-                verbose.report("Could not open font file %s" % fpath)
-                continue
-            try:
-                try:
-                    font = afm.AFM(fh)
-                finally:
-                    fh.close()
-            except RuntimeError:
-                verbose.report("Could not parse font file %s"%fpath)
-                continue
-            prop = afmFontProperty(fpath, font)
+        if index is None:
+            prop = createFontEntry(fpath, fontext)
         else:
             try:
-                font = ft2font.FT2Font(str(fpath))
-            except RuntimeError:
-                verbose.report("Could not open font file %s"%fpath)
-                continue
-            except UnicodeError:
-                verbose.report("Cannot handle unicode filenames")
-                #print >> sys.stderr, 'Bad file is', fpath
+                stat = os.stat(fpath)
+            except OSError:
+                verbose.report("Could not stat font file %s" % fpath)
                 continue
-            try: prop = ttfFontProperty(font)
-            except: continue
-
-        fontlist.append(prop)
+            key = (stat.st_mtime, stat.st_size)
+            cached = index.get(fpath)
+            if cached is not None and cached[:2] == key:
+                prop = cached[2]
+            else:
+                # unreadable files are recorded too, so that they are
+                # not tried again until they change
+                prop = createFontEntry(fpath, fontext)
+                index[fpath] = key + (prop,)
+        if prop is not None:
+            fontlist.append(prop)
     return fontlist
 
 class FontProperties(object):
@@ -944,19 +973,36 @@ def pickle_dump(data, filename):
     """
     Equivalent to pickle.dump(data, open(filename, 'w'))
     but closes the file to prevent filehandle leakage.
+
+    The data is written to a temporary file that is then renamed to
+    *filename*, so that processes reading or writing the same file at
+    the same time never see it partially written.
     """
-    fh = open(filename, 'w')
+    dirname, basename = os.path.split(os.path.abspath(filename))
+    fd, tmpname = tempfile.mkstemp(prefix=basename, dir=dirname)
     try:
-        pickle.dump(data, fh)
-    finally:
-        fh.close()
+        fh = os.fdopen(fd, 'wb')
+        try:
+            pickle.dump(data, fh, pickle.HIGHEST_PROTOCOL)
+        finally:
+            fh.close()
+        try:
+            os.rename(tmpname, filename)
+        except OSError:
+            # win32 does not rename over an existing file
+            os.remove(filename)
+            os.rename(tmpname, filename)
+    except:
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+        raise
 
 def pickle_load(filename):
     """
     Equivalent to pickle.load(open(filename, 'r'))
     but closes the file to prevent filehandle leakage.
     """
-    fh = open(filename, 'r')
+    fh = open(filename, 'rb')
     try:
         data = pickle.load(fh)
     finally:
@@ -965,24 +1011,68 @@ def pickle_load(filename):
 
 class FontManager:
     """
-    On import, the :class:`FontManager` singleton instance creates a
+    On first use, the :class:`FontManager` singleton instance creates a
     list of TrueType fonts based on the font properties: name, style,
     variant, weight, stretch, and size.  The :meth:`findfont` method
     does a nearest neighbor search to find the font that most closely
     matches the specification.  If no good enough match is found, a
     default font is returned.
+
+    The properties of each font file are kept in an index keyed by
+    the file's path, along with its modification time and size.  An
+    *index* from a previous :class:`FontManager` can be passed in so
+    that only the font files that were added or changed since it was
+    built are opened.  The index is not pickled with the font manager,
+    but saved in a file of its own, which outlives the font cache.
     """
     # Increment this version number whenever the font cache data
     # format or behavior has changed and requires a existing font
     # cache files to be rebuilt.
-    __version__ = 7
+    __version__ = 9
 
-    def __init__(self, size=None, weight='normal'):
+    def __init__(self, size=None, weight='normal', index=None):
         self._version = self.__version__
 
         self.__default_weight = weight
         self.default_size = size
 
+        self.ttffiles, self.afmfiles = self._find_font_files()
+        self.defaultFamily = {
+            'ttf': 'Bitstream Vera Sans',
+            'afm': 'Helvetica'}
+        self.defaultFont = {}
+
+        for fname in self.ttffiles:
+            verbose.report('trying fontname %s' % fname, 'debug')
+            if fname.lower().find('vera.ttf')>=0:
+                self.defaultFont['ttf'] = fname
+                break
+        else:
+            # use anything
+            self.defaultFont['ttf'] = self.ttffiles[0]
+
+        if index is None:
+            index = {}
+        else:
+            index = index.copy()
+        self.ttflist = createFontList(self.ttffiles, index=index)
+        self.afmlist = createFontList(self.afmfiles, fontext='afm',
+                                      index=index)
+        self.defaultFont['afm'] = None
+
+        # forget the fonts that have been removed
+        self._index = {}
+        for fname in self.ttffiles + self.afmfiles:
+            if fname in index:
+                self._index[fname] = index[fname]
+
+        self._reset_lookup()
+
+    def _find_font_files(self):
+        """
+        Return the lists of the TrueType and AFM font files on the font
+        search path.
+        """
         paths = [os.path.join(rcParams['datapath'], 'fonts', 'ttf'),
                  os.path.join(rcParams['datapath'], 'fonts', 'afm'),
                  os.path.join(rcParams['datapath'], 'fonts', 'pdfcorefonts')]
@@ -999,32 +1089,75 @@ class FontManager:
                     paths.append(ttfpath)
 
         verbose.report('font search path %s'%(str(paths)))
-        #  Load TrueType fonts and create font dictionary.
-
-        self.ttffiles = findSystemFonts(paths) + findSystemFonts()
-        self.defaultFamily = {
-            'ttf': 'Bitstream Vera Sans',
-            'afm': 'Helvetica'}
-        self.defaultFont = {}
-
-        for fname in self.ttffiles:
-            verbose.report('trying fontname %s' % fname, 'debug')
-            if fname.lower().find('vera.ttf')>=0:
-                self.defaultFont['ttf'] = fname
-                break
-        else:
-            # use anything
-            self.defaultFont['ttf'] = self.ttffiles[0]
-
-        self.ttflist = createFontList(self.ttffiles)
 
-        self.afmfiles = findSystemFonts(paths, fontext='afm') + \
+        ttffiles = findSystemFonts(paths) + findSystemFonts()
+        afmfiles = findSystemFonts(paths, fontext='afm') + \
             findSystemFonts(fontext='afm')
-        self.afmlist = createFontList(self.afmfiles, fontext='afm')
-        self.defaultFont['afm'] = None
+        return ttffiles, afmfiles
 
-        self.ttf_lookup_cache = {}
-        self.afm_lookup_cache = {}
+    def _is_current(self):
+        """
+        Return whether the font files on the search path are still
+        those the font lists were made from, unchanged since they were
+        entered in the index.
+        """
+        if not self._index:
+            return False
+        ttffiles, afmfiles = self._find_font_files()
+        if (set(ttffiles) != set(self.ttffiles) or
+            set(afmfiles) != set(self.afmfiles)):
+            return False
+        for fname in ttffiles + afmfiles:
+            # the files skipped as duplicates are not in the index
+            entry = self._index.get(fname)
+            if entry is None:
+                continue
+            try:
+                stat = os.stat(fname)
+            except OSError:
+                return False
+            if entry[:2] != (stat.st_mtime, stat.st_size):
+                return False
+        return True
+
+    def __getstate__(self):
+        # the lookup caches and indexes are rebuilt on demand, and the
+        # index of the font files is saved on its own
+        state = self.__dict__.copy()
+        for name in ('ttf_lookup_cache', 'afm_lookup_cache', '_name_index',
+                     '_index'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._index = {}
+        self._reset_lookup()
+
+    def _reset_lookup(self):
+        self.ttf_lookup_cache = maxdict(1000)
+        self.afm_lookup_cache = maxdict(1000)
+        self._name_index = {}
+
+    def _get_name_index(self, fontext):
+        """
+        Return a dictionary mapping the lower case family names of the
+        fonts of type *fontext* to their positions in the font list,
+        and whether all of those fonts are scalable.
+        """
+        index = self._name_index.get(fontext)
+        if index is None:
+            if fontext == 'afm':
+                fontlist = self.afmlist
+            else:
+                fontlist = self.ttflist
+            positions = {}
+            scalable = True
+            for i, font in enumerate(fontlist):
+                positions.setdefault(font.name.lower(), []).append(i)
+                scalable = scalable and font.size == 'scalable'
+            index = self._name_index[fontext] = positions, scalable
+        return index
 
     def get_default_weight(self):
         """
@@ -1183,8 +1316,13 @@ class FontManager:
         `directory`, is specified, will only return fonts from the
         given directory (or subdirectory of that directory).
 
-        The result is cached, so subsequent lookups don't have to
-        perform the O(n) nearest neighbor search.
+        Only the fonts whose family could match one of the families
+        of *prop* are scored, found through an index of the font list
+        by family name; fonts of any other family score 10 or more,
+        which is never good enough.  The result is cached, so
+        subsequent lookups don't have to search at all.  The cache
+        ignores the size of *prop* when all fonts are scalable, so
+        that the different sizes of a font share one entry.
 
         If `fallback_to_default` is True, will fallback to the default
         font family (usually "Bitstream Vera Sans" or "Helvetica") if
@@ -1207,16 +1345,36 @@ class FontManager:
         else:
             font_cache = self.ttf_lookup_cache
             fontlist = self.ttflist
+        name_index, scalable = self._get_name_index(fontext)
 
+        families = [family.lower() for family in prop.get_family()]
+        key = (tuple(families), prop.get_style(), prop.get_variant(),
+               prop.get_weight(), prop.get_stretch())
+        if not scalable:
+            key += (prop.get_size(),)
         if directory is None:
-            cached = font_cache.get(hash(prop))
+            cached = font_cache.get(key)
             if cached:
                 return cached
 
+        names = set()
+        for family in families:
+            if family in font_family_aliases:
+                if family in ('sans', 'sans serif'):
+                    family = 'sans-serif'
+                names.update([x.lower() for x in rcParams['font.' + family]])
+            else:
+                names.add(family)
+        positions = []
+        for name in names:
+            positions.extend(name_index.get(name, ()))
+        positions.sort()
+
         best_score = 1e64
         best_font = None
 
-        for font in fontlist:
+        for i in positions:
+            font = fontlist[i]
             if (directory is not None and
                 os.path.commonprefix([font.fname, directory]) != directory):
                 continue
@@ -1268,7 +1426,7 @@ class FontManager:
                 raise ValueError("No valid font could be found")
 
         if directory is None:
-            font_cache[hash(prop)] = result
+            font_cache[key] = result
         return result
 
 
@@ -1290,65 +1448,241 @@ def is_opentype_cff_font(filename):
         return result
     return False
 
-fontManager = None
+class _LazyFontManager(object):
+    """
+    Stands in for the :class:`FontManager` singleton until it is
+    first used, so that importing this module does not read the font
+    cache.
+    """
+    def __getattr__(self, name):
+        return getattr(_get_fontmanager(), name)
+
+    def __setattr__(self, name, value):
+        setattr(_get_fontmanager(), name, value)
+
+fontManager = _LazyFontManager()
 
 _fmcache = os.path.join(get_configdir(), 'fontList.cache')
 
+# The index of the font files is kept apart from the font cache, so
+# that it survives changes of the FontManager version.  Increment
+# this version number whenever the format of the index entries
+# changes.
+_fmindex = os.path.join(get_configdir(), 'fontIndex.cache')
+_fmindex_version = 1
+
+def _load_index():
+    """
+    Return the index of the font files saved in *_fmindex*, or an
+    empty one if it is missing, unreadable or out of date.
+    """
+    try:
+        version, index = pickle_load(_fmindex)
+    except:
+        return {}
+    if version != _fmindex_version:
+        return {}
+    return index
+
 def _rebuild():
     global fontManager
-    fontManager = FontManager()
-    pickle_dump(fontManager, _fmcache)
+    # reuse the index of the current font manager, or the saved one,
+    # so that only new or changed font files are opened
+    if isinstance(fontManager, FontManager) and fontManager._index:
+        index = fontManager._index
+    else:
+        index = _load_index()
+    fontManager = FontManager(index=index)
+    for data, filename in ((fontManager, _fmcache),
+                           ((_fmindex_version, fontManager._index),
+                            _fmindex)):
+        try:
+            pickle_dump(data, filename)
+        except (IOError, OSError), msg:
+            verbose.report("Could not save font cache %s: %s"
+                           % (filename, msg))
     verbose.report("generated new fontManager")
 
+def _get_fontmanager():
+    """
+    Return the :class:`FontManager` singleton, loading it from the
+    font cache, or building it if the cache is missing or out of date,
+    or the font files have changed, the first time it is needed.
+    """
+    global fontManager
+    if isinstance(fontManager, _LazyFontManager):
+        try:
+            cached = pickle_load(_fmcache)
+        except:
+            cached = None
+        if getattr(cached, '_version', None) != FontManager.__version__:
+            _rebuild()
+            return fontManager
+        cached._index = _load_index()
+        if cached._is_current():
+            fontManager = cached
+            fontManager.default_size = None
+            verbose.report("Using fontManager instance from %s" % _fmcache)
+        else:
+            fontManager = cached
+            _rebuild()
+    return fontManager
+
 # The experimental fontconfig-based backend.
-if USE_FONTCONFIG and sys.platform != 'win32':
-    import re
+_fc_match_regex = re.compile(r'\sfile:\s+"([^"]*)"')
+
+def _fc_match_file(output, fontext):
+    """
+    Return the first font file of type *fontext* listed in the
+    *output* of ``fc-match -sv``, or None.
+    """
+    fontexts = get_fontext_synonyms(fontext)
+    for match in _fc_match_regex.finditer(output):
+        file = match.group(1)
+        if os.path.splitext(file)[1][1:] in fontexts:
+            return file
+    return None
+
+def fc_match(pattern, fontext):
+    """
+    Return the font file of type *fontext* that ``fc-match`` matches
+    to the fontconfig *pattern*, or None.
+    """
+    return fc_match_many([pattern], fontext)[0]
 
-    def fc_match(pattern, fontext):
-        fontexts = get_fontext_synonyms(fontext)
-        ext = "." + fontext
+def fc_match_many(patterns, fontext, maxprocs=16):
+    """
+    Return the list of the font files of type *fontext* that
+    ``fc-match`` matches to each of the fontconfig *patterns*, None
+    where there is no match.  Up to *maxprocs* ``fc-match`` processes
+    are run at the same time, so that resolving many patterns costs
+    little more than resolving one.
+    """
+    files = []
+    for i in range(0, len(patterns), maxprocs):
+        pipes = []
+        for pattern in patterns[i:i + maxprocs]:
+            try:
+                pipes.append(subprocess.Popen(['fc-match', '-sv', pattern],
+                                              stdout=subprocess.PIPE))
+            except OSError:
+                pipes.append(None)
+        for pipe in pipes:
+            file = None
+            if pipe is not None:
+                output = pipe.communicate()[0]
+                if pipe.returncode == 0:
+                    file = _fc_match_file(output, fontext)
+            files.append(file)
+    return files
+
+_fc_match_cache = None
+_fc_match_cachefile = os.path.join(get_configdir(), 'fcMatch.cache')
+
+def _fc_config_stamp():
+    """
+    Return the modification times of the fontconfig configuration,
+    font cache and font directories, and the fontconfig environment
+    variables.  The persistent fc-match cache is discarded when they
+    change, which they do when fonts are installed or removed or when
+    fontconfig is reconfigured.
+    """
+    paths = ['/etc/fonts', '/etc/fonts/conf.d', '/etc/fonts/fonts.conf',
+             '/var/cache/fontconfig']
+    home = os.environ.get('HOME')
+    if home is not None:
+        for name in ('.fonts', '.fonts.conf', '.fontconfig',
+                     os.path.join('.cache', 'fontconfig')):
+            paths.append(os.path.join(home, name))
+    paths.extend(X11FontDirectories)
+    paths.extend(OSXFontDirectories)
+    stamp = []
+    for path in paths:
         try:
-            pipe = subprocess.Popen(['fc-match', '-sv', pattern], stdout=subprocess.PIPE)
-            output = pipe.communicate()[0]
+            stamp.append((path, os.stat(path).st_mtime))
         except OSError:
-            return None
-        if pipe.returncode == 0:
-            for match in _fc_match_regex.finditer(output):
-                file = match.group(1)
-                if os.path.splitext(file)[1][1:] in fontexts:
-                    return file
-        return None
+            pass
+    for name in ('FONTCONFIG_FILE', 'FONTCONFIG_PATH'):
+        stamp.append((name, os.environ.get(name)))
+    return stamp
+
+def _load_fc_match_cache():
+    """
+    Return the persistent fc-match cache, a dictionary mapping
+    (pattern, fontext) pairs to font files, or an empty dictionary if
+    the cache is missing or out of date.
+    """
+    try:
+        stamp, matches = pickle_load(_fc_match_cachefile)
+    except:
+        return {}
+    if stamp != _fc_config_stamp():
+        return {}
+    return matches
+
+def _get_fc_match_cache():
+    global _fc_match_cache
+    if _fc_match_cache is None:
+        _fc_match_cache = _load_fc_match_cache()
+    return _fc_match_cache
+
+def _save_fc_match_cache():
+    # merge in the matches saved by other processes since the cache
+    # was loaded, so that concurrent workers fill a common cache
+    matches = _load_fc_match_cache()
+    matches.update(_get_fc_match_cache())
+    try:
+        pickle_dump((_fc_config_stamp(), matches), _fc_match_cachefile)
+    except (IOError, OSError), msg:
+        verbose.report("Could not save fc-match cache %s: %s" %
+                       (_fc_match_cachefile, msg))
 
-    _fc_match_regex = re.compile(r'\sfile:\s+"([^"]*)"')
-    _fc_match_cache = {}
+def fc_findfonts(props, fontext='ttf'):
+    """
+    Return the list of the font files that fontconfig matches to each
+    of the :class:`FontProperties` or fontconfig patterns in *props*.
 
-    def findfont(prop, fontext='ttf'):
+    The matches are cached on disk, and the patterns that are not in
+    the cache are resolved together with :func:`fc_match_many`.
+    """
+    patterns = []
+    for prop in props:
         if not is_string_like(prop):
             prop = prop.get_fontconfig_pattern()
-        cached = _fc_match_cache.get(prop)
-        if cached is not None:
-            return cached
+        patterns.append(prop)
+
+    cache = _get_fc_match_cache()
+    missing = []
+    for pattern in patterns:
+        cached = cache.get((pattern, fontext))
+        if ((cached is None or not os.path.isfile(cached)) and
+            pattern not in missing):
+            missing.append(pattern)
+    if missing:
+        files = fc_match_many(missing, fontext)
+        if None in files:
+            default = fc_match(':', fontext)
+        for pattern, file in zip(missing, files):
+            if file is None:
+                file = default
+            cache[(pattern, fontext)] = file
+        _save_fc_match_cache()
+    return [cache[(pattern, fontext)] for pattern in patterns]
 
-        result = fc_match(prop, fontext)
-        if result is None:
-            result = fc_match(':', fontext)
+if USE_FONTCONFIG and sys.platform != 'win32':
+    def findfont(prop, fontext='ttf'):
+        return fc_findfonts([prop], fontext)[0]
 
-        _fc_match_cache[prop] = result
-        return result
+    findfonts = fc_findfonts
 
 else:
-    try:
-        fontManager = pickle_load(_fmcache)
-        if (not hasattr(fontManager, '_version') or
-            fontManager._version != FontManager.__version__):
-            _rebuild()
-        else:
-            fontManager.default_size = None
-            verbose.report("Using fontManager instance from %s" % _fmcache)
-    except:
-        _rebuild()
-
     def findfont(prop, **kw):
-        global fontManager
-        font = fontManager.findfont(prop, **kw)
-        return font
+        return _get_fontmanager().findfont(prop, **kw)
+
+    def findfonts(props, **kw):
+        """
+        Return the list of the font files that best match each of the
+        :class:`FontProperties` in *props*.
+        """
+        manager = _get_fontmanager()
+        return [manager.findfont(prop, **kw) for prop in props]
@@ -15,6 +15,7 @@ from matplotlib.artist import allow_rasterization
 import matplotlib.colors as mcolors
 import matplotlib.cm as cm
 import matplotlib.cbook as cbook
+import matplotlib.mlab as mlab
 
 # For clarity, names from _image are given explicitly in this module:
 import matplotlib._image as _image
@@ -358,6 +359,12 @@ class _AxesImageBase(martist.Artist, cm.ScalarMappable):
             renderer.draw_image(gc, l, b, im)
         gc.restore()
 
+    def _get_raster_bbox(self):
+        # images are clipped to the axes
+        if self.axes is None:
+            return None
+        return self.axes.bbox
+
     def contains(self, mouseevent):
         """
         Test whether the mouse event occured within the image.
@@ -768,6 +775,88 @@ class NonUniformImage(AxesImage):
             raise RuntimeError('Cannot change colors after loading data')
         cm.ScalarMappable.set_cmap(self, cmap)
 
+class SpecgramImage(AxesImage):
+    """
+    An image of the latest *ncols* columns of the spectrogram of a
+    signal that is fed in pieces with :meth:`add`, for monitoring live
+    signals.  Each call transforms only the newly completed segments
+    (see :class:`~matplotlib.mlab.StreamingSpecgram`) and scrolls them
+    into a buffer allocated once, so the same image is redrawn instead
+    of a new one being made by every call to
+    :meth:`~matplotlib.axes.Axes.specgram`.
+
+    Like :meth:`~matplotlib.axes.Axes.specgram`, the image shows
+    10*log10 of the spectrum, with time along x and frequency along y.
+    """
+    def __init__(self, ax, ncols=100, NFFT=256, Fs=2, Fc=0,
+                 detrend=mlab.detrend_none, window=mlab.window_hanning,
+                 noverlap=128, pad_to=None, sides='default',
+                 scale_by_freq=None, vmin=None, vmax=None, **kwargs):
+        """
+        *ncols* is the number of segments shown; *vmin* and *vmax* fix
+        the color limits, which otherwise follow the data shown.  The
+        spectral arguments are those of
+        :meth:`~matplotlib.axes.Axes.specgram`, and the other *kwargs*
+        are passed to :class:`AxesImage`.
+        """
+        kwargs.setdefault('origin', 'lower')
+        AxesImage.__init__(self, ax, **kwargs)
+        self.spectrogram = mlab.StreamingSpecgram(
+            NFFT, Fs, detrend, window, noverlap, pad_to, sides, scale_by_freq)
+        self.ncols = ncols
+        self.Fc = Fc
+        self._ring = None
+        self._head = 0
+        self._scale_to_data = vmin is None and vmax is None
+        if not self._scale_to_data:
+            self.set_clim(vmin, vmax)
+
+    def add(self, x):
+        """
+        Append the samples *x* to the signal and scroll the columns
+        they complete into the image.  Return the number of new
+        columns.
+        """
+        Pxx, t = self.spectrogram.add(x)
+        k = min(Pxx.shape[1], self.ncols)
+        if k == 0:
+            return 0
+        Z = 10. * np.log10(Pxx[:, -k:])
+
+        # The columns are kept in a ring buffer twice as wide as the
+        # image, with each one written twice, so that the latest ncols
+        # columns are always a contiguous view of it.
+        ncols = self.ncols
+        if self._ring is None:
+            self._ring = ma.masked_all((Z.shape[0], 2*ncols))
+        pos = (self._head + np.arange(k)) % ncols
+        self._ring[:, pos] = Z
+        self._ring[:, pos + ncols] = Z
+        self._head = (self._head + k) % ncols
+        self._A = self._ring[:, self._head:self._head + ncols]
+        self._imcache = None
+        self._rgbacache = None
+        self._oldxslice = None
+        self._oldyslice = None
+
+        dt = (self.spectrogram.NFFT - self.spectrogram.noverlap) / \
+             float(self.spectrogram.Fs)
+        xmax = t[-1] + dt / 2.
+        freqs = self.spectrogram.freqs + self.Fc
+        self.set_extent((xmax - ncols*dt, xmax, freqs[0], freqs[-1]))
+        if self._scale_to_data:
+            self.autoscale()
+        else:
+            self.changed()
+        return k
+
+    @allow_rasterization
+    def draw(self, renderer, *args, **kwargs):
+        # nothing to show until the first segment is complete
+        if self._A is None:
+            return
+        AxesImage.draw(self, renderer, *args, **kwargs)
+
 class PcolorImage(martist.Artist, cm.ScalarMappable):
     '''
     Make a pcolor-style plot with an irregular rectangular grid.
@@ -1035,6 +1124,11 @@ class BboxImage(_AxesImageBase):
 
         self.bbox = bbox
 
+    def _get_raster_bbox(self):
+        # the image is drawn at its own bbox, which may lie outside the
+        # axes and may need the renderer
+        return None
+
     def get_window_extent(self, renderer=None):
         if renderer is None:
             renderer = self.get_figure()._cachedRenderer
@@ -385,6 +385,12 @@ class Line2D(Artist):
             self.pickradius = p
         self._picker = p
 
+    def _get_raster_bbox(self):
+        # everything is drawn with the clipping of the artist
+        if self.get_clip_on():
+            return self.get_clip_box()
+        return None
+
     def get_window_extent(self, renderer):
         bbox = Bbox.unit()
         bbox.update_from_data_xy(self.get_transform().transform(self.get_xydata()),
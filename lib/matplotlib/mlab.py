@@ -63,6 +63,15 @@ Functions that don't exist in MATLAB, but are useful anyway:
 :meth:`cross_from_above`
     return the indices where a 1D array crosses a threshold from above
 
+:meth:`grouped_reduce`
+    reduce the values of each group of an integer labelling
+
+:class:`HexBinner`
+    accumulate (possibly chunked) data into the cells of hexbin
+
+:class:`HistAccumulator`
+    accumulate the histogram of chunked data
+
 
 record array helper functions
 -------------------------------
@@ -82,6 +91,12 @@ A collection of helper methods for numpyrecord arrays
 :meth:`csv2rec`
     import record array from CSV file with type inspection
 
+:meth:`csv2rec_columnar`
+    import large CSV files into record arrays column by column
+
+:meth:`csv2rec_chunks`
+    iterate over a CSV file as record arrays of a fixed number of rows
+
 :meth:`rec_append_fields`
     adds  field(s)/array(s) to record array
 
@@ -142,7 +157,7 @@ care--function signatures may differ):
 """
 
 from __future__ import division
-import csv, warnings, copy, os, operator
+import csv, warnings, copy, os, operator, itertools, datetime
 
 import numpy as np
 ma = np.ma
@@ -200,14 +215,56 @@ def detrend_linear(y):
     a = y.mean() - b*x.mean()
     return y - (b*x + a)
 
+def _detrend_segments(detrend, segments):
+    """
+    Apply *detrend* to every row of the 2-D array *segments*.  The
+    detrending functions defined here work on all the rows at once;
+    any other function is called on each row in turn.
+    """
+    if detrend is detrend_none:
+        return segments
+    elif detrend is detrend_mean:
+        return segments - segments.mean(axis=1)[:, np.newaxis]
+    elif detrend is detrend_linear:
+        x = np.arange(segments.shape[1], dtype=np.float_)
+        xm = x - x.mean()
+        means = segments.mean(axis=1)
+        b = np.dot(segments, xm) / np.dot(xm, xm)
+        a = means - b*x.mean()
+        return segments - (b[:, np.newaxis]*x + a[:, np.newaxis])
+    return np.array([detrend(segment) for segment in segments])
+
+def _stride_segments(x, start, n, NFFT, step):
+    """
+    Return the *n* segments of length *NFFT* of *x* that begin at
+    *start*, *start* + *step*, ... as an (*n*, *NFFT*) view of *x*.
+    """
+    stride = x.strides[0]
+    try:
+        as_strided = np.lib.stride_tricks.as_strided
+    except AttributeError: # numpy < 1.2, copy the segments
+        return np.array([x[i:i+NFFT]
+                         for i in range(start, start + n*step, step)],
+                        x.dtype).reshape((n, NFFT))
+    return as_strided(
+        x[start:], shape=(n, NFFT), strides=(step*stride, stride))
+
+# The number of samples transformed at once by _spectral_helper;
+# segments are processed in blocks of about this size so that the
+# temporary arrays stay small however long the data is.
+_spectral_block_size = 2**20
+
 #This is a helper function that implements the commonality between the
 #psd, csd, and spectrogram.  It is *NOT* meant to be used outside of mlab
 def _spectral_helper(x, y, NFFT=256, Fs=2, detrend=detrend_none,
         window=window_hanning, noverlap=0, pad_to=None, sides='default',
-        scale_by_freq=None):
+        scale_by_freq=None, dtype=None, average=False):
     #The checks for if y is x are so that we can use the same function to
     #implement the core of psd(), csd(), and spectrogram() without doing
-    #extra calculations.  We return the unaveraged Pxy, freqs, and t.
+    #extra calculations.  We return the unaveraged Pxy, freqs, and t;
+    #Pxy is real when y is x.  If average is True the mean of Pxy over
+    #the segments is accumulated block by block instead, so that psd()
+    #and csd() never hold the spectra of all the segments.
     same_data = y is x
 
     #Make sure we're dealing with a numpy array. If y and x were the same
@@ -234,6 +291,11 @@ def _spectral_helper(x, y, NFFT=256, Fs=2, detrend=detrend_none,
     if scale_by_freq is None:
         scale_by_freq = True
 
+    if dtype is None:
+        dtype = np.float_
+
+    is_complex = np.iscomplexobj(x) or (not same_data and np.iscomplexobj(y))
+
     # For real x, ignore the negative frequencies unless told otherwise
     if (sides == 'default' and np.iscomplexobj(x)) or sides == 'twosided':
         numFreqs = pad_to
@@ -257,45 +319,69 @@ def _spectral_helper(x, y, NFFT=256, Fs=2, detrend=detrend_none,
     else:
         windowVals = window(np.ones((NFFT,), x.dtype))
 
-    step = NFFT - noverlap
-    ind = np.arange(0, len(x) - NFFT + 1, step)
-    n = len(ind)
-    Pxy = np.zeros((numFreqs,n), np.complex_)
-
-    # do the ffts of the slices
-    for i in range(n):
-        thisX = x[ind[i]:ind[i]+NFFT]
-        thisX = windowVals * detrend(thisX)
-        fx = np.fft.fft(thisX, n=pad_to)
-
-        if same_data:
-            fy = fx
-        else:
-            thisY = y[ind[i]:ind[i]+NFFT]
-            thisY = windowVals * detrend(thisY)
-            fy = np.fft.fft(thisY, n=pad_to)
-        Pxy[:,i] = np.conjugate(fx[:numFreqs]) * fy[:numFreqs]
-
     # Scale the spectrum by the norm of the window to compensate for
     # windowing loss; see Bendat & Piersol Sec 11.5.2.
-    Pxy *= 1 / (np.abs(windowVals)**2).sum()
-
     # Also include scaling factors for one-sided densities and dividing by the
     # sampling frequency, if desired. Scale everything, except the DC component
-    # and the NFFT/2 component:
-    Pxy[1:-1] *= scaling_factor
-
-    #But do scale those components by Fs, if required
+    # and the NFFT/2 component, which are only scaled by Fs, if required
+    scale = np.empty(numFreqs)
+    scale.fill(1. / (np.abs(windowVals)**2).sum())
+    scale[1:-1] *= scaling_factor
     if scale_by_freq:
-        Pxy[[0,-1]] /= Fs
+        scale[[0,-1]] /= Fs
 
-    t = 1./Fs * (ind + NFFT / 2.)
-    freqs = float(Fs) / pad_to * np.arange(numFreqs)
+    # the real fft computes exactly the one-sided spectrum of real data
+    onesided = numFreqs < pad_to
+    if onesided and not is_complex:
+        fft = np.fft.rfft
+    else:
+        fft = np.fft.fft
 
+    freqs = float(Fs) / pad_to * np.arange(numFreqs)
+    order = np.arange(numFreqs)
     if (np.iscomplexobj(x) and sides == 'default') or sides == 'twosided':
         # center the frequency range at zero
         freqs = np.concatenate((freqs[numFreqs//2:] - Fs, freqs[:numFreqs//2]))
-        Pxy = np.concatenate((Pxy[numFreqs//2:, :], Pxy[:numFreqs//2, :]), 0)
+        order = np.concatenate((order[numFreqs//2:], order[:numFreqs//2]))
+
+    step = NFFT - noverlap
+    ind = np.arange(0, len(x) - NFFT + 1, step)
+    n = len(ind)
+    if same_data:
+        result_dtype = np.dtype(dtype)
+    else:
+        # the type of the cross spectrum (numpy.result_type needs numpy 1.6)
+        result_dtype = (np.zeros(0, dtype) + np.zeros(0, np.complex64)).dtype
+    if average:
+        Pxy = np.zeros(numFreqs, same_data and np.float_ or np.complex_)
+    else:
+        Pxy = np.empty((numFreqs, n), result_dtype)
+
+    # do the ffts of blocks of segments, all at once
+    block = max(_spectral_block_size // pad_to, 1)
+    for start in range(0, n, block):
+        m = min(block, n - start)
+        thisX = _stride_segments(x, ind[start], m, NFFT, step)
+        thisX = _detrend_segments(detrend, thisX)
+        fx = fft(thisX * windowVals, n=pad_to, axis=1)[:, :numFreqs]
+        if same_data:
+            Pblock = fx.real**2 + fx.imag**2
+        else:
+            thisY = _stride_segments(y, ind[start], m, NFFT, step)
+            thisY = _detrend_segments(detrend, thisY)
+            fy = fft(thisY * windowVals, n=pad_to, axis=1)[:, :numFreqs]
+            Pblock = np.conjugate(fx) * fy
+        if average:
+            Pxy += Pblock.sum(axis=0)
+        else:
+            Pxy[:, start:start+block] = Pblock.T[order]
+
+    if average:
+        Pxy = (Pxy[order] * scale[order] / n).astype(result_dtype)
+    else:
+        Pxy *= scale[order][:, np.newaxis]
+
+    t = 1./Fs * (ind + NFFT / 2.)
 
     return Pxy, freqs, t
 
@@ -359,9 +445,18 @@ docstring.interpd.update(PSD=cbook.dedent("""
           The default is True for MATLAB compatibility.
 """))
 
+docstring.interpd.update(Precision="""
+  *dtype*: [ None | numpy.float64 | numpy.float32 ]
+      The precision of the returned spectra; numpy.float32 gives
+      float32 (or complex64) results that take half the memory.
+      The transforms themselves are always done in double
+      precision.  None is the same as numpy.float64.
+""")
+
 @docstring.dedent_interpd
 def psd(x, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
-        noverlap=0, pad_to=None, sides='default', scale_by_freq=None):
+        noverlap=0, pad_to=None, sides='default', scale_by_freq=None,
+        dtype=None):
     """
     The power spectral density by Welch's average periodogram method.
     The vector *x* is divided into *NFFT* length blocks.  Each block
@@ -376,6 +471,7 @@ def psd(x, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
         Array or sequence containing the data
 
     %(PSD)s
+    %(Precision)s
 
     Returns the tuple (*Pxx*, *freqs*).
 
@@ -386,12 +482,13 @@ def psd(x, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
 
     """
     Pxx,freqs = csd(x, x, NFFT, Fs, detrend, window, noverlap, pad_to, sides,
-        scale_by_freq)
+        scale_by_freq, dtype)
     return Pxx.real,freqs
 
 @docstring.dedent_interpd
 def csd(x, y, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
-        noverlap=0, pad_to=None, sides='default', scale_by_freq=None):
+        noverlap=0, pad_to=None, sides='default', scale_by_freq=None,
+        dtype=None):
     """
     The cross power spectral density by Welch's average periodogram
     method.  The vectors *x* and *y* are divided into *NFFT* length
@@ -408,6 +505,7 @@ def csd(x, y, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
         Array or sequence containing the data
 
     %(PSD)s
+    %(Precision)s
 
     Returns the tuple (*Pxy*, *freqs*).
 
@@ -416,15 +514,17 @@ def csd(x, y, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
         Procedures, John Wiley & Sons (1986)
     """
     Pxy, freqs, t = _spectral_helper(x, y, NFFT, Fs, detrend, window,
-        noverlap, pad_to, sides, scale_by_freq)
+        noverlap, pad_to, sides, scale_by_freq, dtype, average=True)
 
-    if len(Pxy.shape) == 2 and Pxy.shape[1]>1:
-        Pxy = Pxy.mean(axis=1)
+    # a single segment has always been returned as a column
+    if len(t) == 1:
+        Pxy.shape = len(freqs), 1
     return Pxy, freqs
 
 @docstring.dedent_interpd
 def specgram(x, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
-        noverlap=128, pad_to=None, sides='default', scale_by_freq=None):
+        noverlap=128, pad_to=None, sides='default', scale_by_freq=None,
+        dtype=None):
     """
     Compute a spectrogram of data in *x*.  Data are split into *NFFT*
     length segements and the PSD of each section is computed.  The
@@ -436,6 +536,7 @@ def specgram(x, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
     spectrum is returned.
 
     %(PSD)s
+    %(Precision)s
 
     Returns a tuple (*Pxx*, *freqs*, *t*):
 
@@ -458,17 +559,76 @@ def specgram(x, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
     assert(NFFT > noverlap)
 
     Pxx, freqs, t = _spectral_helper(x, x, NFFT, Fs, detrend, window,
-        noverlap, pad_to, sides, scale_by_freq)
-    Pxx = Pxx.real #Needed since helper implements generically
+        noverlap, pad_to, sides, scale_by_freq, dtype)
 
     return Pxx, freqs, t
 
+class StreamingSpecgram:
+    """
+    Compute the spectrogram of a signal that arrives in pieces, such
+    as a live audio feed.  The samples passed to :meth:`add` are
+    appended to those left over from the previous call, and only the
+    segments completed by the new samples are transformed, so the
+    columns returned by successive calls are exactly those that
+    :func:`specgram` would return for the whole signal.
+
+    The arguments are those of :func:`specgram`.
+    """
+    def __init__(self, NFFT=256, Fs=2, detrend=detrend_none,
+                 window=window_hanning, noverlap=128, pad_to=None,
+                 sides='default', scale_by_freq=None, dtype=None):
+        assert(NFFT > noverlap)
+        self.NFFT = NFFT
+        self.Fs = Fs
+        self.detrend = detrend
+        self.window = window
+        self.noverlap = noverlap
+        self.pad_to = pad_to
+        self.sides = sides
+        self.scale_by_freq = scale_by_freq
+        self.dtype = dtype
+        self.freqs = None
+        self._pending = None
+        self._offset = 0  # the index in the signal of _pending[0]
+
+    def add(self, x):
+        """
+        Append the samples *x* to the signal.  Return the tuple
+        (*Pxx*, *t*) for the segments completed by them; *Pxx* has one
+        column per segment, and no columns if no segment was
+        completed.
+        """
+        x = np.asarray(x)
+        if self._pending is not None and len(self._pending):
+            x = np.concatenate((self._pending, x))
+        step = self.NFFT - self.noverlap
+        n = max((len(x) - self.NFFT) // step + 1, 0)
+        if n == 0:
+            self._pending = x
+            if self.freqs is None:
+                return np.zeros((0, 0)), np.zeros(0)
+            return np.zeros((len(self.freqs), 0), self.dtype), np.zeros(0)
+
+        x, rest = x[:(n-1)*step + self.NFFT], x[n*step:]
+        Pxx, freqs, t = _spectral_helper(x, x, self.NFFT, self.Fs,
+                                         self.detrend, self.window,
+                                         self.noverlap, self.pad_to,
+                                         self.sides, self.scale_by_freq,
+                                         self.dtype)
+        self.freqs = freqs
+        t += self._offset / float(self.Fs)
+        # keep the samples the next segments will start from
+        self._pending = rest.copy()
+        self._offset += n*step
+        return Pxx, t
+
 _coh_error = """Coherence is calculated by averaging over *NFFT*
 length segments.  Your signal is too short for your choice of *NFFT*.
 """
 @docstring.dedent_interpd
 def cohere(x, y, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
-        noverlap=0, pad_to=None, sides='default', scale_by_freq=None):
+        noverlap=0, pad_to=None, sides='default', scale_by_freq=None,
+        dtype=None):
     """
     The coherence between *x* and *y*.  Coherence is the normalized
     cross spectral density:
@@ -481,6 +641,7 @@ def cohere(x, y, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
         Array or sequence containing the data
 
     %(PSD)s
+    %(Precision)s
 
     The return value is the tuple (*Cxy*, *f*), where *f* are the
     frequencies of the coherence vector. For cohere, scaling the
@@ -497,11 +658,11 @@ def cohere(x, y, NFFT=256, Fs=2, detrend=detrend_none, window=window_hanning,
     if len(x)<2*NFFT:
         raise ValueError(_coh_error)
     Pxx, f = psd(x, NFFT, Fs, detrend, window, noverlap, pad_to, sides,
-        scale_by_freq)
+        scale_by_freq, dtype)
     Pyy, f = psd(y, NFFT, Fs, detrend, window, noverlap, pad_to, sides,
-        scale_by_freq)
+        scale_by_freq, dtype)
     Pxy, f = csd(x, y, NFFT, Fs, detrend, window, noverlap, pad_to, sides,
-        scale_by_freq)
+        scale_by_freq, dtype)
 
     Cxy = np.divide(np.absolute(Pxy)**2, Pxx*Pyy)
     Cxy.shape = (len(f),)
@@ -515,7 +676,7 @@ def cohere_pairs( X, ij, NFFT=256, Fs=2, detrend=detrend_none,
                   window=window_hanning, noverlap=0,
                   preferSpeedOverMemory=True,
                   progressCallback=donothing_callback,
-                  returnPxx=False):
+                  returnPxx=False, memoryBudget=None, numThreads=1):
 
     u"""
     Call signature::
@@ -536,19 +697,19 @@ def cohere_pairs( X, ij, NFFT=256, Fs=2, detrend=detrend_none,
           for j in range(i+1,64):
               ij.append( (i,j) )
 
-    *preferSpeedOverMemory* is an optional bool. Defaults to true. If
-    False, limits the caching by only making one, rather than two,
-    complex cache arrays. This is useful if memory becomes critical.
-    Even when *preferSpeedOverMemory* is False, :func:`cohere_pairs`
-    will still give significant performace gains over calling
-    :func:`cohere` for each pair, and will use subtantially less
-    memory than if *preferSpeedOverMemory* is True.  In my tests with
-    a 43000,64 array over all nonredundant pairs,
-    *preferSpeedOverMemory* = True delivered a 33% performance boost
-    on a 1.7GHZ Athlon with 512MB RAM compared with
-    *preferSpeedOverMemory* = False.  But both solutions were more
-    than 10x faster than naively crunching all possible pairs through
-    :func:`cohere`.
+    The FFTs of every segment of every channel used are computed once
+    and cached.  The cross spectra are then computed for blocks of
+    pairs at a time with array operations.
+
+    *memoryBudget* is the number of bytes the temporary arrays of a
+    block of pairs may use; it sets the number of pairs per block.
+    The default is 64MB, or 16MB if *preferSpeedOverMemory* is False.
+    The FFT cache, about twice the size of the used columns of *X*,
+    and the results come on top of this.
+
+    *numThreads* is the number of threads working on blocks of pairs
+    at once.  numpy releases the interpreter lock in its array
+    operations, so the blocks are really computed in parallel.
 
     Returns::
 
@@ -579,8 +740,7 @@ def cohere_pairs( X, ij, NFFT=256, Fs=2, detrend=detrend_none,
     number of pairs, this function is :math:`O(N)` for most of the
     heavy lifting, whereas calling cohere for each pair is
     :math:`O(N^2)`.  However, because of the caching, it is also more
-    memory intensive, making 2 additional complex arrays with
-    approximately the same number of elements as *X*.
+    memory intensive.
 
     See :file:`test/cohere_pairs_test.py` in the src tree for an
     example script that shows that this :func:`cohere_pairs` and
@@ -593,8 +753,11 @@ def cohere_pairs( X, ij, NFFT=256, Fs=2, detrend=detrend_none,
             :math:`P_{xy}`, :math:`P_{xx}` and :math:`P_{yy}`.
     """
     numRows, numCols = X.shape
+    if noverlap >= NFFT:
+        raise ValueError('noverlap must be less than NFFT, so that the '
+                         'segments advance')
 
-    # zero pad if X is too short
+    # zero pad if X is too short; it then holds at least one segment
     if numRows < NFFT:
         tmp = X
         X = np.zeros( (NFFT, numCols), X.dtype)
@@ -607,66 +770,89 @@ def cohere_pairs( X, ij, NFFT=256, Fs=2, detrend=detrend_none,
     allColumns = set()
     for i,j in ij:
         allColumns.add(i); allColumns.add(j)
+    allColumns = sorted(allColumns)
     Ncols = len(allColumns)
+    colIndex = dict([(iCol, k) for k, iCol in enumerate(allColumns)])
 
     # for real X, ignore the negative frequencies
-    if np.iscomplexobj(X): numFreqs = NFFT
-    else: numFreqs = NFFT//2+1
+    if np.iscomplexobj(X):
+        numFreqs = NFFT
+        fft = np.fft.fft
+    else:
+        numFreqs = NFFT//2+1
+        fft = np.fft.rfft
+
+    if memoryBudget is None:
+        if preferSpeedOverMemory:
+            memoryBudget = 2**26
+        else:
+            memoryBudget = 2**24
 
     # cache the FFT of every windowed, detrended NFFT length segement
-    # of every channel.  If preferSpeedOverMemory, cache the conjugate
-    # as well
+    # of every channel
     if cbook.iterable(window):
         assert(len(window) == NFFT)
         windowVals = window
     else:
         windowVals = window(np.ones(NFFT, X.dtype))
-    ind = range(0, numRows-NFFT+1, NFFT-noverlap)
-    numSlices = len(ind)
-    FFTSlices = {}
-    FFTConjSlices = {}
-    Pxx = {}
-    slices = range(numSlices)
+    step = NFFT-noverlap
+    numSlices = (numRows-NFFT)//step + 1
     normVal = np.linalg.norm(windowVals)**2
-    for iCol in allColumns:
-        progressCallback(i/Ncols, 'Cacheing FFTs')
-        Slices = np.zeros( (numSlices,numFreqs), dtype=np.complex_)
-        for iSlice in slices:
-            thisSlice = X[ind[iSlice]:ind[iSlice]+NFFT, iCol]
-            thisSlice = windowVals*detrend(thisSlice)
-            Slices[iSlice,:] = np.fft.fft(thisSlice)[:numFreqs]
-
-        FFTSlices[iCol] = Slices
-        if preferSpeedOverMemory:
-            FFTConjSlices[iCol] = np.conjugate(Slices)
-        Pxx[iCol] = np.divide(np.mean(abs(Slices)**2), normVal)
-    del Slices, ind, windowVals
-
-    # compute the coherences and phases for all pairs using the
-    # cached FFTs
+    FFTSlices = np.empty((Ncols, numSlices, numFreqs), np.complex_)
+    Pxx = np.empty((Ncols, numFreqs))
+    for k, iCol in enumerate(allColumns):
+        progressCallback(k/Ncols, 'Cacheing FFTs')
+        Slices = _stride_segments(X[:,iCol], 0, numSlices, NFFT, step)
+        Slices = windowVals*_detrend_segments(detrend, Slices)
+        FFTSlices[k] = fft(Slices, axis=1)[:, :numFreqs]
+        Pxx[k] = np.mean(abs(FFTSlices[k])**2, axis=0) / normVal
+    del Slices, windowVals
+
+    # compute the cross spectra of blocks of pairs using the cached
+    # FFTs; each pair in a block needs two copies of its slices and
+    # one of their product
+    N = len(ij)
+    I = np.array([colIndex[i] for i,j in ij], int)
+    J = np.array([colIndex[j] for i,j in ij], int)
+    pairBytes = 3 * FFTSlices.itemsize * numSlices * numFreqs
+    blockSize = max(memoryBudget // pairBytes, 1)
+    blocks = range(0, N, blockSize)
+    Pxy = np.empty((N, numFreqs), np.complex_)
+
+    def computeBlocks(starts):
+        for start in starts:
+            block = slice(start, start + blockSize)
+            thisPxy = np.conjugate(FFTSlices[J[block]])
+            thisPxy *= FFTSlices[I[block]]
+            Pxy[block] = thisPxy.mean(axis=1)
+            progressCallback(min(start + blockSize, N)/N,
+                             'Computing coherences')
+
+    numThreads = max(min(numThreads, len(blocks)), 1)
+    if numThreads == 1:
+        computeBlocks(blocks)
+    else:
+        import threading
+        threads = [threading.Thread(target=computeBlocks,
+                                    args=(blocks[k::numThreads],))
+                   for k in range(numThreads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    Pxy /= normVal
+
+    CxyAll = abs(Pxy)**2 / (Pxx[I]*Pxx[J])
+    PhaseAll = np.arctan2(Pxy.imag, Pxy.real)
     Cxy = {}
     Phase = {}
-    count = 0
-    N = len(ij)
-    for i,j in ij:
-        count +=1
-        if count%10==0:
-            progressCallback(count/N, 'Computing coherences')
-
-        if preferSpeedOverMemory:
-            Pxy = FFTSlices[i] * FFTConjSlices[j]
-        else:
-            Pxy = FFTSlices[i] * np.conjugate(FFTSlices[j])
-        if numSlices>1: Pxy = np.mean(Pxy)
-        #Pxy = np.divide(Pxy, normVal)
-        Pxy /= normVal
-        #Cxy[(i,j)] = np.divide(np.absolute(Pxy)**2, Pxx[i]*Pxx[j])
-        Cxy[i,j] = abs(Pxy)**2 / (Pxx[i]*Pxx[j])
-        Phase[i,j] =  np.arctan2(Pxy.imag, Pxy.real)
+    for k, (i, j) in enumerate(ij):
+        Cxy[i,j] = CxyAll[k]
+        Phase[i,j] = PhaseAll[k]
 
     freqs = Fs/NFFT*np.arange(numFreqs)
     if returnPxx:
-        return Cxy, Phase, freqs, Pxx
+        return Cxy, Phase, freqs, dict(zip(allColumns, Pxx))
     else:
         return Cxy, Phase, freqs
 
@@ -1299,6 +1485,336 @@ class FIFOBuffer:
 
         self.dataLim.update_numerix(x, y, True)
 
+def _bincount(x, weights=None, minlength=0):
+    """
+    :func:`numpy.bincount` with the *minlength* argument, which needs
+    numpy 1.6; the counts of the values of *x* in ``range(minlength)``
+    and above.
+    """
+    x = np.asarray(x, int)
+    if weights is None:
+        dtype = np.int_
+    else:
+        dtype = np.float_
+    if len(x):
+        counts = np.bincount(x, weights)
+    else:
+        counts = np.zeros(0, dtype)
+    if len(counts) < minlength:
+        counts = np.concatenate(
+            (counts, np.zeros(minlength - len(counts), counts.dtype)))
+    return counts
+
+def grouped_reduce(index, values, n, func):
+    """
+    Reduce *values* over the groups given by the integer array *index*,
+    whose entries lie in ``range(n)``, returning an array of length *n*
+    with ``func(values[index==i])`` at *i*, or nan where group *i* is
+    empty.
+
+    Sums, means, maxima and minima (*func* is one of :func:`numpy.sum`,
+    :func:`numpy.mean`, :func:`numpy.max`, :func:`numpy.min` or the
+    builtins :func:`sum`, :func:`max` and :func:`min`) are computed
+    without any python level loop.  Any other *func* is called once
+    per non-empty group, on the slice of the sorted *values* holding
+    that group.
+    """
+    index = np.asarray(index, int)
+    values = np.asarray(values, float)
+    result = np.empty(n, float)
+    result.fill(np.nan)
+    if not len(index):
+        return result
+    counts = _bincount(index, minlength=n)
+    full = counts > 0
+    kind = _grouped_reducers.get(func)
+    if kind in ('sum', 'mean'):
+        sums = _bincount(index, values, n)
+        if kind == 'mean':
+            sums[full] /= counts[full]
+        result[full] = sums[full]
+        return result
+
+    order = index.argsort(kind='mergesort')
+    values = values[order]
+    starts = np.cumsum(counts) - counts
+    if kind == 'max':
+        result[full] = np.maximum.reduceat(values, starts[full])
+    elif kind == 'min':
+        result[full] = np.minimum.reduceat(values, starts[full])
+    else:
+        for i in np.flatnonzero(full):
+            result[i] = func(values[starts[i]:starts[i]+counts[i]])
+    return result
+
+_grouped_reducers = {np.sum: 'sum', sum: 'sum',
+                     np.mean: 'mean',
+                     np.max: 'max', max: 'max',
+                     np.min: 'min', min: 'min'}
+
+class HexBinner:
+    """
+    Assign points to the hexagonal cells of :meth:`Axes.hexbin
+    <matplotlib.axes.Axes.hexbin>` and accumulate counts, or the
+    values of *C*, per cell.
+
+    Data can be fed in chunks with :meth:`add`, so a data set too large
+    to hold in memory can be binned a piece at a time::
+
+        binner = HexBinner((0, 1, 0, 1), gridsize=50,
+                           reduce_C_function=np.mean)
+        for x, y, C in chunks:
+            binner.add(x, y, C)
+        binner.render(ax, mincnt=1)
+
+    Counts and the sum, mean, max and min reductions keep only one
+    running value per cell; other *reduce_C_function* callables need
+    every value, so the chunks are kept until :meth:`get_values`.
+
+    The cells are numbered as in hexbin: the ``(nx+1)*(ny+1)`` cells
+    of the first lattice, in row-major order, followed by the
+    ``nx*ny`` cells of the second.
+    """
+    def __init__(self, extent, gridsize=100, xscale='linear',
+                 yscale='linear', reduce_C_function=None):
+        """
+        *extent* is ``(xmin, xmax, ymin, ymax)``; as with hexbin, the
+        limits of a log-scaled direction are given as powers of ten.
+        *gridsize*, *xscale* and *yscale* are as for hexbin.  Set
+        *reduce_C_function* when values of *C* will be added.
+        """
+        if cbook.iterable(gridsize):
+            nx, ny = gridsize
+        else:
+            nx = gridsize
+            ny = int(nx/np.sqrt(3))
+        xmin, xmax, ymin, ymax = [float(v) for v in extent]
+        # In the x-direction, the hexagons exactly cover the region
+        # from xmin to xmax. Need some padding to avoid roundoff errors.
+        padding = 1.e-9 * (xmax - xmin)
+        xmin -= padding
+        xmax += padding
+        self.nx, self.ny = nx, ny
+        self.xmin, self.xmax, self.ymin, self.ymax = xmin, xmax, ymin, ymax
+        self.sx = (xmax-xmin) / nx
+        self.sy = (ymax-ymin) / ny
+        self.xscale, self.yscale = xscale, yscale
+        self.n = (nx+1)*(ny+1) + nx*ny
+        self.reduce_C_function = reduce_C_function
+
+        self.counts = np.zeros(self.n, int)
+        kind = _grouped_reducers.get(reduce_C_function)
+        if reduce_C_function is None:
+            self._partial = None
+        elif kind in ('sum', 'mean'):
+            self._partial = np.zeros(self.n, float)
+        elif kind == 'max':
+            self._partial = np.empty(self.n, float)
+            self._partial.fill(-np.inf)
+        elif kind == 'min':
+            self._partial = np.empty(self.n, float)
+            self._partial.fill(np.inf)
+        else:
+            self._partial = []
+
+    def cell_index(self, x, y):
+        """
+        Return the index of the cell holding each point of *x*, *y*,
+        or -1 for points outside the grid.
+        """
+        x = np.asarray(x, float)
+        y = np.asarray(y, float)
+        if self.xscale == 'log':
+            if np.any(x <= 0.0):
+                raise ValueError("x contains non-positive values, so can not be log-scaled")
+            x = np.log10(x)
+        if self.yscale == 'log':
+            if np.any(y <= 0.0):
+                raise ValueError("y contains non-positive values, so can not be log-scaled")
+            y = np.log10(y)
+        nx1, ny1 = self.nx+1, self.ny+1
+        x = (x-self.xmin)/self.sx
+        y = (y-self.ymin)/self.sy
+        ix1 = np.round(x).astype(int)
+        iy1 = np.round(y).astype(int)
+        ix2 = np.floor(x).astype(int)
+        iy2 = np.floor(y).astype(int)
+
+        d1 = (x-ix1)**2 + 3.0 * (y-iy1)**2
+        d2 = (x-ix2-0.5)**2 + 3.0 * (y-iy2-0.5)**2
+        bdist = (d1<d2)
+        index = np.where(bdist, ix1*ny1 + iy1,
+                         nx1*ny1 + ix2*self.ny + iy2)
+        inside = np.where(bdist,
+                          (ix1>=0) & (ix1<nx1) & (iy1>=0) & (iy1<ny1),
+                          (ix2>=0) & (ix2<self.nx) & (iy2>=0) & (iy2<self.ny))
+        index[~inside] = -1
+        return index
+
+    def add(self, x, y, C=None):
+        """
+        Bin the points *x*, *y* (and their values *C*, if the binner
+        was created with a *reduce_C_function*).  Points outside the
+        grid are ignored.
+        """
+        index = self.cell_index(x, y)
+        inside = index >= 0
+        index = index[inside]
+        self.counts += _bincount(index, minlength=self.n)
+        if self._partial is None:
+            return
+        if C is None:
+            raise ValueError("C is required with a reduce_C_function")
+        C = np.asarray(C, float)[inside]
+        if isinstance(self._partial, list):
+            self._partial.append((index, C))
+            return
+        kind = _grouped_reducers[self.reduce_C_function]
+        if kind in ('sum', 'mean'):
+            self._partial += _bincount(index, C, self.n)
+        else:
+            values = grouped_reduce(index, C, self.n, self.reduce_C_function)
+            # update the cells with a value, whose partial result is
+            # nan or beaten by the new one
+            if kind == 'max':
+                better = ~(values <= self._partial)
+            else:
+                better = ~(values >= self._partial)
+            better &= ~np.isnan(values)
+            self._partial[better] = values[better]
+
+    def get_values(self):
+        """
+        Return the value of every cell: the counts if there is no
+        *reduce_C_function*, otherwise the reduced values of *C*, with
+        nan for empty cells.
+        """
+        if self._partial is None:
+            return self.counts.astype(float)
+        full = self.counts > 0
+        if isinstance(self._partial, list):
+            if not self._partial:
+                index, C = np.zeros(0, int), np.zeros(0)
+            else:
+                index = np.concatenate([p[0] for p in self._partial])
+                C = np.concatenate([p[1] for p in self._partial])
+            return grouped_reduce(index, C, self.n, self.reduce_C_function)
+        values = np.empty(self.n, float)
+        values.fill(np.nan)
+        values[full] = self._partial[full]
+        if _grouped_reducers[self.reduce_C_function] == 'mean':
+            values[full] /= self.counts[full]
+        return values
+
+    def get_offsets(self):
+        """
+        Return the (*n*, 2) array of cell centers, in the binned (that
+        is, log10 for log scales) coordinates.
+        """
+        nx1, ny1, nx2, ny2 = self.nx+1, self.ny+1, self.nx, self.ny
+        offsets = np.zeros((self.n, 2), float)
+        offsets[:nx1*ny1,0] = np.repeat(np.arange(nx1), ny1)
+        offsets[:nx1*ny1,1] = np.tile(np.arange(ny1), nx1)
+        offsets[nx1*ny1:,0] = np.repeat(np.arange(nx2) + 0.5, ny2)
+        offsets[nx1*ny1:,1] = np.tile(np.arange(ny2), nx2) + 0.5
+        offsets[:,0] = self.xmin + self.sx * offsets[:,0]
+        offsets[:,1] = self.ymin + self.sy * offsets[:,1]
+        return offsets
+
+    def render(self, ax, **kwargs):
+        """
+        Draw the binned data on the :class:`~matplotlib.axes.Axes`
+        *ax* with :meth:`~matplotlib.axes.Axes.hexbin`, which gets the
+        remaining *kwargs*, and return its collection.
+        """
+        return ax.hexbin(self, None, **kwargs)
+
+class HistAccumulator:
+    """
+    Accumulate the histogram of a data set fed in chunks with
+    :meth:`add`, using memory proportional to the number of bins
+    only, and draw it with :meth:`render`::
+
+        acc = HistAccumulator(50, range=(0, 10))
+        for chunk in chunks:
+            acc.add(chunk)
+        acc.render(ax, histtype='step')
+
+    When *bins* is an integer and no *range* is given, the edges can
+    be found in a first pass by calling :meth:`scan` on every chunk;
+    otherwise the range of the first chunk passed to :meth:`add` fixes
+    them.  Values that fall outside the edges are not binned, but
+    their number (or weight) is kept in the *underflow* and *overflow*
+    attributes.
+    """
+    def __init__(self, bins=10, range=None):
+        """
+        *bins* is either the number of equal width bins spanning
+        *range*, or a sequence of bin edges, as for
+        :func:`numpy.histogram`.
+        """
+        if cbook.iterable(bins):
+            self.edges = np.asarray(bins, float)
+            self.counts = np.zeros(len(self.edges) - 1)
+        else:
+            self.edges = None
+            self.counts = None
+        self.bins = bins
+        self.range = range
+        self.underflow = 0
+        self.overflow = 0
+
+    def scan(self, x):
+        """
+        Widen the range of the bins to include the values of *x*.
+        """
+        if self.edges is not None:
+            raise ValueError("The bin edges have already been fixed")
+        x = np.asarray(x, float).ravel()
+        if not len(x):
+            return
+        lo, hi = x.min(), x.max()
+        if self.range is not None:
+            lo, hi = min(lo, self.range[0]), max(hi, self.range[1])
+        self.range = lo, hi
+
+    def add(self, x, weights=None):
+        """
+        Add the values *x*, with optional *weights*, to the histogram.
+        """
+        x = np.asarray(x, float).ravel()
+        if self.edges is None:
+            if self.range is None:
+                if not len(x):
+                    return
+                self.range = x.min(), x.max()
+            self.edges = np.histogram([], self.bins, self.range)[1]
+            self.counts = np.zeros(len(self.edges) - 1)
+        if weights is not None:
+            weights = np.asarray(weights, float).ravel()
+        counts, edges = np.histogram(x, self.edges, weights=weights)
+        self.counts += counts
+        under = x < self.edges[0]
+        over = x > self.edges[-1]
+        if weights is None:
+            self.underflow += under.sum()
+            self.overflow += over.sum()
+        else:
+            self.underflow += weights[under].sum()
+            self.overflow += weights[over].sum()
+
+    def render(self, ax, **kwargs):
+        """
+        Draw the histogram on the :class:`~matplotlib.axes.Axes` *ax*
+        with :meth:`~matplotlib.axes.Axes.hist`, passing on *kwargs*
+        (*histtype*, *normed*, *cumulative*, ...), and return what
+        hist returns.
+        """
+        if self.edges is None:
+            raise ValueError("No data has been added")
+        return ax.hist(self.edges[:-1], self.edges, weights=self.counts,
+                       **kwargs)
+
 def movavg(x,n):
     """
     Compute the len(*n*) moving average of *x*.
@@ -1832,6 +2348,28 @@ def rec_keep_fields(rec, names):
 
 
 
+def _sorted_key_groups(columns):
+    """
+    Sort the rows whose keys are made of the 1-D arrays *columns*, the
+    first column varying slowest, and find the groups of rows with
+    equal keys.  Return *order*, the indices that sort the rows, and
+    *starts*, the positions in *order* at which the groups begin.
+    """
+    codes = []
+    for col in columns:
+        col = np.asarray(col)
+        if col.dtype.kind == 'O':
+            # lexsort cannot compare objects; sort their ranks instead
+            col = np.unique(col, return_inverse=True)[1]
+        codes.append(col)
+    order = np.lexsort(codes[::-1])
+    new = np.zeros(len(order), np.bool_)
+    new[:1] = True
+    for col in codes:
+        col = col[order]
+        new[1:] |= col[1:] != col[:-1]
+    return order, np.flatnonzero(new)
+
 def rec_groupby(r, groupby, stats):
     """
     *r* is a numpy record array
@@ -1850,32 +2388,25 @@ def rec_groupby(r, groupby, stats):
     for each outname name in the *stats* argument, with the associated
     stat summary output.
     """
-    # build a dictionary from groupby keys-> list of indices into r with
-    # those keys
-    rowd = dict()
-    for i, row in enumerate(r):
-        key = tuple([row[attr] for attr in groupby])
-        rowd.setdefault(key, []).append(i)
+    # sort the rows by the groupby keys; each group is then a
+    # contiguous slice of the sorted columns
+    order, starts = _sorted_key_groups([r[attr] for attr in groupby])
+    ends = np.append(starts[1:], len(r))
 
-    # sort the output by groupby keys
-    keys = rowd.keys()
-    keys.sort()
-
-    rows = []
-    for key in keys:
-        row = list(key)
-        # get the indices for this groupby key
-        ind = rowd[key]
-        thisr = r[ind]
-        # call each stat function for this groupby slice
-        row.extend([func(thisr[attr]) for attr, func, outname in stats])
-        rows.append(row)
+    arrays = [r[attr][order[starts]] for attr in groupby]
+    sortedd = dict()
+    for attr, func, outname in stats:
+        if attr not in sortedd:
+            sortedd[attr] = r[attr][order]
+        values = sortedd[attr]
+        # call each stat function for each groupby slice
+        arrays.append([func(values[i0:i1]) for i0, i1 in zip(starts, ends)])
 
     # build the output record array with groupby and outname attributes
     attrs, funcs, outnames = zip(*stats)
     names = list(groupby)
     names.extend(outnames)
-    return np.rec.fromrecords(rows, names=names)
+    return np.rec.fromarrays(arrays, names=names)
 
 
 
@@ -1931,30 +2462,44 @@ def rec_join(key, r1, r2, jointype='inner', defaults=None, r1postfix='1', r2post
         if name not in r2.dtype.names:
             raise ValueError('r2 does not have key field %s'%name)
 
-    def makekey(row):
-        return tuple([row[name] for name in key])
-
-    r1d = dict([(makekey(row),i) for i,row in enumerate(r1)])
-    r2d = dict([(makekey(row),i) for i,row in enumerate(r2)])
-
-    r1keys = set(r1d.keys())
-    r2keys = set(r2d.keys())
-
-    common_keys = r1keys & r2keys
-
-    r1ind = np.array([r1d[k] for k in common_keys])
-    r2ind = np.array([r2d[k] for k in common_keys])
-
-    common_len = len(common_keys)
+    # number the distinct keys of r1 and r2 together in sorted order,
+    # then match the rows with equal numbers
+    n1, n2 = len(r1), len(r2)
+    order, starts = _sorted_key_groups(
+        [np.concatenate((r1[name], r2[name])) for name in key])
+    new = np.zeros(n1+n2, np.int_)
+    new[starts] = 1
+    ids = np.empty(n1+n2, np.int_)
+    ids[order] = np.cumsum(new) - 1
+    r1ids, r2ids = ids[:n1], ids[n1:]
+
+    # the row of each key in r1 and r2, or -1; as with a dict, the last
+    # of the rows with the same key is kept
+    r1pos = np.empty(len(starts), np.int_)
+    r1pos.fill(-1)
+    r1pos[r1ids] = np.arange(n1)
+    r2pos = np.empty(len(starts), np.int_)
+    r2pos.fill(-1)
+    r2pos[r2ids] = np.arange(n2)
+    in1, in2 = r1pos >= 0, r2pos >= 0
+
+    common = np.flatnonzero(in1 & in2)
+    r1ind = r1pos[common]
+    r2ind = r2pos[common]
+    rowids = [common]
+
+    common_len = len(r1ind)
     left_len = right_len = 0
     if jointype == "outer" or jointype == "leftouter":
-        left_keys = r1keys.difference(r2keys)
-        left_ind = np.array([r1d[k] for k in left_keys])
+        left = np.flatnonzero(in1 & ~in2)
+        left_ind = r1pos[left]
         left_len = len(left_ind)
+        rowids.append(left)
     if jointype == "outer":
-        right_keys = r2keys.difference(r1keys)
-        right_ind = np.array([r2d[k] for k in right_keys])
+        right = np.flatnonzero(in2 & ~in1)
+        right_ind = r2pos[right]
         right_len = len(right_ind)
+        rowids.append(right)
 
     def key_desc(name):
         'if name is a string key, use the larger size of r1 or r2 before merging'
@@ -2023,7 +2568,8 @@ def rec_join(key, r1, r2, jointype='inner', defaults=None, r1postfix='1', r2post
         if jointype == "outer" and right_len:
             newrec[newfield][-right_len:] = r2[field][right_ind]
 
-    newrec.sort(order=key)
+    # the key numbers follow the sort order of the keys
+    newrec = newrec[np.argsort(np.concatenate(rowids))]
 
     return newrec
 
@@ -2082,6 +2628,39 @@ def recs_join(key, name, recs, jointype='outer', missing=0., postfixes=None):
     return np.rec.fromrecords(results, names=names)
 
 
+# map column names that clash with builtins -- TODO - extend this list
+_csv_itemd = {
+    'return' : 'return_',
+    'file' : 'file_',
+    'print' : 'print_',
+    }
+
+def _csv_header_names(headers):
+    """
+    Turn the CSV header row *headers* into valid, unique record array
+    names, as described in :func:`csv2rec`.
+    """
+    # remove these chars
+    delete = set("""~!@#$%^&*()-=+~\|]}[{';: /?.>,<""")
+    delete.add('"')
+
+    names = []
+    seen = dict()
+    for i, item in enumerate(headers):
+        item = item.strip().lower().replace(' ', '_')
+        item = ''.join([c for c in item if c not in delete])
+        if not len(item):
+            item = 'column%d'%i
+
+        item = _csv_itemd.get(item, item)
+        cnt = seen.get(item, 0)
+        if cnt>0:
+            names.append(item + '_%d'%cnt)
+        else:
+            names.append(item)
+        seen[item] = cnt+1
+    return names
+
 def csv2rec(fname, comments='#', skiprows=0, checkrows=0, delimiter=',',
             converterd=None, names=None, missing='', missingd=None,
             use_mrecords=False):
@@ -2230,13 +2809,6 @@ def csv2rec(fname, comments='#', skiprows=0, checkrows=0, delimiter=',',
         else: return func
 
 
-    # map column names that clash with builtins -- TODO - extend this list
-    itemd = {
-        'return' : 'return_',
-        'file' : 'file_',
-        'print' : 'print_',
-        }
-
     def get_converters(reader):
 
         converters = None
@@ -2273,25 +2845,7 @@ def csv2rec(fname, comments='#', skiprows=0, checkrows=0, delimiter=',',
             headers = row
             break
 
-        # remove these chars
-        delete = set("""~!@#$%^&*()-=+~\|]}[{';: /?.>,<""")
-        delete.add('"')
-
-        names = []
-        seen = dict()
-        for i, item in enumerate(headers):
-            item = item.strip().lower().replace(' ', '_')
-            item = ''.join([c for c in item if c not in delete])
-            if not len(item):
-                item = 'column%d'%i
-
-            item = itemd.get(item, item)
-            cnt = seen.get(item, 0)
-            if cnt>0:
-                names.append(item + '_%d'%cnt)
-            else:
-                names.append(item)
-            seen[item] = cnt+1
+        names = _csv_header_names(headers)
 
     else:
         if cbook.is_string_like(names):
@@ -2340,6 +2894,339 @@ def csv2rec(fname, comments='#', skiprows=0, checkrows=0, delimiter=',',
     return r
 
 
+def _csv_missing(values, name, missing, missingd):
+    """
+    Return the mask of the entries of the string array *values* of
+    column *name* that signify missing data, as in :func:`csv2rec`.
+    """
+    mask = values == ''
+    if missing != '':
+        mask |= values == missing
+    if name in missingd:
+        mask |= values == missingd[name]
+    return mask
+
+def _csv_parse_dates(values, kind):
+    """
+    Parse the string array *values* into an object array of
+    :class:`datetime.date` (*kind* = 'date') or
+    :class:`datetime.datetime` (*kind* = 'datetime') instances.  Dates
+    repeat a lot in most files, so each distinct string is parsed once.
+    """
+    import dateutil.parser
+    if not len(values):
+        return np.empty(0, np.object_)
+    unique, inverse = np.unique(values, return_inverse=True)
+    parsed = np.empty(len(unique), np.object_)
+    for k, value in enumerate(unique):
+        d = dateutil.parser.parse(value)
+        if kind == 'date':
+            if d.hour>0 or d.minute>0 or d.second>0:
+                raise ValueError('not a date')
+            d = d.date()
+        parsed[k] = d
+    return parsed[inverse]
+
+# the column types tried by csv2rec_chunks, in order, and the values
+# that fill their missing entries
+_csv_kinds = ('bool', 'int', 'float', 'date', 'datetime', 'str')
+_csv_defaults = {'bool' : None, 'int' : -1, 'float' : np.nan, 'str' : ''}
+
+def _csv_convert(values, mask, kind):
+    """
+    Convert the string array *values* to an array of *kind*, filling
+    the entries where *mask* is True with the default value of *kind*.
+    Bool columns with missing entries are object arrays, holding None
+    for those, as in :func:`csv2rec`.  *kind* may also be a converter
+    function, which is called on every entry that is not missing;
+    missing ones become None.
+    """
+    if callable(kind):
+        return np.array([None if m else kind(v) for v, m in zip(values, mask)])
+    if kind == 'str':
+        out = values.copy()
+        out[mask] = ''
+        return out
+    valid = values[~mask]
+    if kind == 'bool':
+        if not ((valid == 'True') | (valid == 'False')).all():
+            raise ValueError('invalid bool')
+        out = values == 'True'
+        if mask.any():
+            out = out.astype(np.object_)
+            out[mask] = None
+        return out
+    if kind in ('date', 'datetime'):
+        out = np.empty(len(values), np.object_)
+        out.fill(datetime.date(1,1,1))
+        out[~mask] = _csv_parse_dates(valid, kind)
+        return out
+    dtype = {'int' : np.int_, 'float' : np.float_}[kind]
+    out = np.empty(len(values), dtype)
+    out[mask] = _csv_defaults[kind]
+    out[~mask] = valid.astype(dtype)
+    return out
+
+def _csv_widen(values, mask, kind='bool'):
+    """
+    Convert the string array *values* with the first of the types of
+    :data:`_csv_kinds`, from *kind* on, that holds all of them, and
+    return that type and the converted array.
+    """
+    for kind in _csv_kinds[list(_csv_kinds).index(kind):-1]:
+        try:
+            return kind, _csv_convert(values, mask, kind)
+        except (ValueError, OverflowError, TypeError):
+            pass
+    return 'str', _csv_convert(values, mask, 'str')
+
+def _csv_chunks(fh, kinds, chunksize, comments, skiprows, checkrows,
+                delimiter, converterd, names, missing, missingd, usecols):
+    """
+    Yield the record arrays of :func:`csv2rec_chunks` read from the
+    file handle *fh*.  *kinds* is a dictionary mapping the column names
+    to their types, which is filled from the first rows for the
+    columns it does not hold yet, and updated whenever a column is
+    widened.
+    """
+    lines = fh
+    if delimiter==' ':
+        # treat runs of spaces as a single separator, see csv2rec
+        lines = (' '.join(line.split()) for line in fh)
+    reader = csv.reader(lines, delimiter=delimiter)
+    for row in itertools.islice(reader, skiprows):
+        pass
+
+    def isdata(row):
+        return len(row) and not row[0].startswith(comments)
+
+    if names is None:
+        for row in reader:
+            if isdata(row):
+                names = _csv_header_names(row)
+                break
+        else:
+            return
+    elif cbook.is_string_like(names):
+        names = [n.strip() for n in names.split(',')]
+
+    if usecols is None:
+        usecols = range(len(names))
+    else:
+        usecols = [names.index(c) if cbook.is_string_like(c) else c
+                   for c in usecols]
+    usenames = [names[j] for j in usecols]
+
+    checked = False
+    # the first chunk read holds at least the rows to check
+    size = max(chunksize, checkrows)
+    while 1:
+        chunk = list(itertools.islice(reader, size))
+        if not chunk:
+            break
+        size = chunksize
+        rows = [row for row in chunk if isdata(row)]
+        if not rows:
+            continue
+        if min([len(row) for row in rows]) < len(names):
+            # pad short rows with missing entries
+            rows = [row + ['']*(len(names)-len(row)) for row in rows]
+
+        if not checked:
+            # pick the column types from the first rows
+            columns = zip(*rows[:checkrows or None])
+            for j, name in zip(usecols, usenames):
+                if name in kinds:
+                    continue
+                func = converterd.get(j)
+                if func is None:
+                    func = converterd.get(name)
+                if func is None:
+                    sample = np.array(columns[j])
+                    mask = _csv_missing(sample, name, missing, missingd)
+                    func = _csv_widen(sample, mask)[0]
+                kinds[name] = func
+            checked = True
+
+        for start in range(0, len(rows), chunksize):
+            columns = zip(*rows[start:start+chunksize])
+            arrays = []
+            for j, name in zip(usecols, usenames):
+                values = np.array(columns[j])
+                mask = _csv_missing(values, name, missing, missingd)
+                kind = kinds[name]
+                if callable(kind):
+                    arrays.append(_csv_convert(values, mask, kind))
+                else:
+                    kinds[name], array = _csv_widen(values, mask, kind)
+                    arrays.append(array)
+            yield np.rec.fromarrays(arrays, names=usenames)
+
+def csv2rec_chunks(fname, chunksize=100000, comments='#', skiprows=0,
+                   checkrows=1000, delimiter=',', converterd=None,
+                   names=None, missing='', missingd=None, usecols=None):
+    """
+    Load the data of the comma/space/tab delimited file in *fname*
+    into record arrays of at most *chunksize* rows each, and return an
+    iterator over them.
+
+    The file is parsed a column at a time: the type of each column is
+    guessed from the first *checkrows* rows (all the rows of the first
+    chunk if *checkrows* is 0) and the whole column of every chunk is
+    then converted at once.  The types are tried in the same order as
+    :func:`csv2rec` (bool, int, float, date, datetime and str).  A
+    value further down that does not fit widens the type of its column
+    in the same order, from the chunk holding it on; the chunks already
+    returned keep the narrower type.  Dates are parsed once for every
+    distinct string.  Unlike :func:`csv2rec`, comment lines are
+    skipped when guessing the types.
+
+    *comments*, *skiprows*, *delimiter*, *converterd*, *names*,
+    *missing* and *missingd* are as in :func:`csv2rec`.  Missing
+    entries are filled with None, -1, nan, date(1,1,1) or '' for the
+    respective types, and with None for columns with a converter.
+
+    - *usecols*: if not *None*, a sequence of the column numbers or
+      names to load; the other columns are not converted at all.
+
+    For a single record array of the whole file, which may be memory
+    mapped, see :func:`csv2rec_columnar`.
+    """
+    if converterd is None:
+        converterd = dict()
+
+    if missingd is None:
+        missingd = {}
+
+    fh = cbook.to_filehandle(fname)
+    for chunk in _csv_chunks(fh, {}, chunksize, comments, skiprows,
+                             checkrows, delimiter, converterd, names,
+                             missing, missingd, usecols):
+        yield chunk
+    fh.close()
+
+def csv2rec_columnar(fname, comments='#', skiprows=0, checkrows=1000,
+                     delimiter=',', converterd=None, names=None, missing='',
+                     missingd=None, usecols=None, chunksize=100000,
+                     memmap=None):
+    """
+    Load data from comma/space/tab delimited file in *fname* into a
+    numpy record array and return the record array, or *None* if no
+    rows are found.
+
+    This is a faster and leaner alternative to :func:`csv2rec` for
+    large files: the file is read in chunks of *chunksize* rows, whose
+    columns are converted in bulk as described in
+    :func:`csv2rec_chunks`, and no Python objects are kept for the
+    individual rows.  When a column is widened after its first chunk,
+    the file is read again with the wider type, so *fname* must then
+    be a file name or a file handle that can seek.  All the other
+    arguments except *memmap* are as in :func:`csv2rec_chunks`.
+
+    - *memmap*: if not *None*, the name of a file in which the record
+      array is built, chunk by chunk, and which is then returned as a
+      :class:`numpy.memmap`, so that the data never need to fit in
+      memory.  Memory mapped arrays cannot hold objects, so date and
+      datetime columns are stored as floating point days as returned
+      by :func:`matplotlib.dates.date2num`, missing bool entries are
+      stored as False, and the width of string columns is set by the
+      first chunk.
+    """
+    if converterd is None:
+        converterd = dict()
+
+    if missingd is None:
+        missingd = {}
+
+    fh = cbook.to_filehandle(fname)
+    start = fh.tell()
+    kinds = {}
+
+    def read():
+        # None marks the start of each pass over the file
+        while 1:
+            yield None
+            used = None
+            for chunk in _csv_chunks(fh, kinds, chunksize, comments,
+                                     skiprows, checkrows, delimiter,
+                                     converterd, names, missing, missingd,
+                                     usecols):
+                if used is not None and kinds != used:
+                    break
+                used = kinds.copy()
+                yield chunk
+            else:
+                return
+            fh.seek(start)
+
+    if memmap is None:
+        try:
+            for chunk in read():
+                if chunk is None:
+                    chunks = []
+                else:
+                    chunks.append(chunk)
+        finally:
+            fh.close()
+        if not chunks:
+            return None
+        # string columns are as wide as their widest chunk
+        dtype = []
+        for name in chunks[0].dtype.names:
+            fields = [chunk.dtype.fields[name][0] for chunk in chunks]
+            dtype.append((name, max(fields, key=lambda dt: dt.itemsize)))
+        r = np.empty(sum([len(chunk) for chunk in chunks]), dtype)
+        start = 0
+        for chunk in chunks:
+            for name in chunk.dtype.names:
+                r[name][start:start+len(chunk)] = chunk[name]
+            start += len(chunk)
+        return r.view(np.recarray)
+
+    from matplotlib.dates import date2num
+    out_fh = file(memmap, 'wb')
+    try:
+        for chunk in read():
+            if chunk is None:
+                out_fh.seek(0)
+                out_fh.truncate()
+                dtype = None
+                numRows = 0
+                continue
+            if dtype is None:
+                dtype = []
+                for name in chunk.dtype.names:
+                    dt = chunk.dtype.fields[name][0]
+                    if kinds[name] == 'bool':
+                        dt = np.bool_
+                    elif dt.kind == 'O':
+                        dt = np.float_
+                    dtype.append((name, dt))
+                dtype = np.dtype(dtype)
+            out = np.empty(len(chunk), dtype)
+            for name in dtype.names:
+                values = chunk[name]
+                if kinds[name] == 'bool':
+                    values = values.astype(np.bool_)
+                elif values.dtype.kind == 'O':
+                    values = date2num(values)
+                elif (values.dtype.kind == 'S' and
+                      values.dtype.itemsize > dtype.fields[name][0].itemsize):
+                    raise ValueError('The strings of column %s are wider '
+                                     'than in the first chunk; use a larger '
+                                     'chunksize' % name)
+                out[name] = values
+            out.tofile(out_fh)
+            numRows += len(out)
+    finally:
+        out_fh.close()
+        fh.close()
+    if not numRows:
+        return None
+    return np.memmap(memmap, dtype, mode='r+', shape=(numRows,)).view(
+        np.recarray)
+
+
 # a series of classes for describing the format intentions of various rec views
 class FormatObj:
     def tostr(self, x):
@@ -680,13 +680,210 @@ class Path(object):
         cls._hatch_dict[(hatchpattern, density)] = hatch_path
         return hatch_path
 
+class PackedPaths(object):
+    """
+    A read-only sequence of paths stored in one contiguous vertex
+    array.
+
+    Path *i* is made of ``vertices[starts[i]:starts[i+1]]``; *starts*
+    thus holds the offset of each path into *vertices*, plus a final
+    entry for the total number of vertices.  *codes* is either None,
+    in which case every path is a polyline, or an array of codes
+    parallel to *vertices*.
+
+    Indexing returns a :class:`Path` whose vertices and codes are views
+    into the packed arrays.  These are made on demand and not kept, so
+    a large number of small paths costs a handful of arrays rather
+    than one Python object per path.  A :class:`PackedPaths` may be
+    passed anywhere a sequence of paths is accepted, e.g. to the
+    renderers' :meth:`draw_path_collection`.
+
+    As with :class:`Path`, the arrays should be treated as immutable.
+    """
+    def __init__(self, vertices, starts, codes=None):
+        if ma.isMaskedArray(vertices):
+            vertices = vertices.astype(np.float_).filled(np.nan)
+        else:
+            vertices = np.asarray(vertices, np.float_)
+        vertices = vertices.reshape((len(vertices), 2))
+        starts = np.asarray(starts, np.intp)
+        assert starts.ndim == 1 and len(starts) >= 1
+        assert starts[0] == 0 and starts[-1] == len(vertices)
+        if codes is not None:
+            codes = np.asarray(codes, Path.code_type)
+            assert codes.shape == (len(vertices),)
+
+        self.vertices = vertices
+        self.starts = starts
+        self.codes = codes
+        self.lengths = np.diff(starts)
+
+        # The per-path flags that Path computes in its constructor are
+        # computed here for all paths at once, using running counts of
+        # the offending vertices.
+        def count_per_path(flags):
+            counts = np.zeros((len(flags) + 1,), np.intp)
+            np.cumsum(flags, out=counts[1:])
+            return counts[starts[1:]] - counts[starts[:-1]]
+
+        self._has_nonfinite = count_per_path(
+            ~np.isfinite(vertices).all(axis=1)) > 0
+        if codes is None:
+            self._has_curves = False
+            self._should_simplify = self.lengths >= 128
+        else:
+            self._has_curves = bool(np.any((codes == Path.CURVE3) |
+                                           (codes == Path.CURVE4)))
+            self._should_simplify = ((self.lengths >= 128) &
+                (count_per_path(codes > Path.LINETO) == 0))
+        self._should_simplify &= bool(rcParams['path.simplify'])
+        self._simplify_threshold = rcParams['path.simplify_threshold']
+
+    @classmethod
+    def from_polylines(cls, verts, closed=False):
+        """
+        Pack *verts*, a sequence of (*nv*, 2) vertex arrays (which may
+        be masked) or an (*npaths*, *nv*, 2) array, into a
+        :class:`PackedPaths`.
+
+        If *closed* is True, the paths are closed as described in
+        :meth:`closed_polygons`.
+        """
+        if ma.isMaskedArray(verts):
+            verts = verts.astype(np.float_).filled(np.nan)
+        if isinstance(verts, np.ndarray) and verts.ndim == 3:
+            npaths, nv, two = verts.shape
+            assert two == 2
+            vertices = np.asarray(verts, np.float_).reshape((npaths * nv, 2))
+            starts = np.arange(npaths + 1) * nv
+        else:
+            verts = [cls._as_vertex_array(xy) for xy in verts]
+            starts = np.zeros((len(verts) + 1,), np.intp)
+            np.cumsum([len(xy) for xy in verts], out=starts[1:])
+            if len(verts):
+                vertices = np.concatenate(verts)
+            else:
+                vertices = np.zeros((0, 2), np.float_)
+        if closed:
+            return cls.closed_polygons(vertices, starts)
+        return cls(vertices, starts)
+
+    @classmethod
+    def closed_polygons(cls, vertices, starts):
+        """
+        Make a :class:`PackedPaths` of closed polygons from packed
+        *vertices* and *starts*.  Each nonempty polygon gets an extra
+        ``CLOSEPOLY`` vertex, in the same way as
+        :class:`~matplotlib.collections.PolyCollection`.
+        """
+        vertices = cls._as_vertex_array(vertices)
+        starts = np.asarray(starts, np.intp)
+        lengths = np.diff(starts)
+        nonempty = lengths > 0
+        # Make room for one closing vertex after each nonempty polygon.
+        new_starts = starts.copy()
+        new_starts[1:] += np.cumsum(nonempty)
+        packed = np.zeros((new_starts[-1], 2), np.float_)
+        if len(vertices):
+            shift = np.repeat(new_starts[:-1] - starts[:-1], lengths)
+            packed[np.arange(len(vertices)) + shift] = vertices
+        codes = np.empty((len(packed),), Path.code_type)
+        codes.fill(Path.LINETO)
+        codes[new_starts[:-1][nonempty]] = Path.MOVETO
+        codes[new_starts[1:][nonempty] - 1] = Path.CLOSEPOLY
+        return cls(packed, new_starts, codes)
+
+    @staticmethod
+    def _as_vertex_array(xy):
+        if ma.isMaskedArray(xy):
+            xy = xy.astype(np.float_).filled(np.nan)
+        else:
+            xy = np.asarray(xy, np.float_)
+        if not len(xy):
+            xy = xy.reshape((0, 2))
+        return xy
+
+    def __repr__(self):
+        return "PackedPaths(%d paths, %d vertices)" % (
+            len(self), len(self.vertices))
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __getitem__(self, i):
+        n = len(self.lengths)
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError("PackedPaths index out of range")
+        start, stop = self.starts[i], self.starts[i + 1]
+        # Bypass Path.__init__: the arrays are already validated and
+        # the flags it would compute are known.
+        path = Path.__new__(Path)
+        path.vertices = self.vertices[start:stop]
+        if self.codes is None:
+            path.codes = None
+        else:
+            path.codes = self.codes[start:stop]
+        path.should_simplify = bool(self._should_simplify[i])
+        path.simplify_threshold = self._simplify_threshold
+        path.has_nonfinite = bool(self._has_nonfinite[i])
+        path._interpolation_steps = 1
+        return path
+
+    def __iter__(self):
+        for i in xrange(len(self.lengths)):
+            yield self[i]
+
+    def transformed_non_affine(self, transform):
+        """
+        Return a copy of the packed paths, transformed only by the
+        non-affine part of *transform*.  This is the packed equivalent
+        of :meth:`~matplotlib.transforms.Transform.transform_path_non_affine`.
+        """
+        return PackedPaths(transform.transform_non_affine(self.vertices),
+                           self.starts, self.codes)
+
+    def get_collection_extents(self, master_transform, offsets,
+                               offset_trans):
+        """
+        Compute the (*x0*, *y0*, *x1*, *y1*) extents of the paths as
+        drawn by a collection with no per-path transforms, directly
+        from the packed vertex array.  *offsets* are cycled over the
+        paths and must not outnumber them.
+        """
+        keep = np.isfinite(self.vertices).all(axis=1)
+        if self.codes is not None:
+            keep &= (self.codes != Path.CLOSEPOLY)
+        xy = master_transform.transform(self.vertices)
+        if len(offsets) and len(xy):
+            offsets = offset_trans.transform(np.asarray(offsets, np.float_))
+            index = np.repeat(np.arange(len(self)) % len(offsets),
+                              self.lengths)
+            xy += offsets[index]
+        xy = xy[keep]
+        if not len(xy):
+            return np.inf, np.inf, -np.inf, -np.inf
+        x0, y0 = xy.min(axis=0)
+        x1, y1 = xy.max(axis=0)
+        return x0, y0, x1, y1
+
 _get_path_collection_extents = get_path_collection_extents
 def get_path_collection_extents(*args):
     """
     Given a sequence of :class:`Path` objects, returns the bounding
     box that encapsulates all of them.
+
+    If the sequence is a :class:`PackedPaths`, and there are no
+    per-path transforms, the extents are computed from its vertex
+    array in one pass.
     """
     from transforms import Bbox
     if len(args[1]) == 0:
         raise ValueError("No paths provided")
+    master_transform, paths, all_transforms, offsets, offset_trans = args
+    if (isinstance(paths, PackedPaths) and not paths._has_curves and
+            not len(all_transforms) and len(offsets) <= len(paths)):
+        return Bbox.from_extents(*paths.get_collection_extents(
+            master_transform, offsets, offset_trans))
     return Bbox.from_extents(*_get_path_collection_extents(*args))
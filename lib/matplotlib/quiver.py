@@ -19,6 +19,7 @@ import numpy as np
 from numpy import ma
 import matplotlib.collections as collections
 import matplotlib.transforms as transforms
+import matplotlib.path as mpath
 import matplotlib.text as mtext
 import matplotlib.artist as martist
 from matplotlib.artist import allow_rasterization
@@ -379,6 +380,11 @@ class Quiver(collections.PolyCollection):
     is limited to things that might have changed, so there
     should be no performance penalty from putting the calculations
     in the draw() method.
+
+    The arrow polygons are kept in a single packed (N, 8, 2) vertex
+    array; the :class:`~matplotlib.path.Path` for each arrow is a view
+    into it, so set_UVC() followed by a redraw overwrites the vertices
+    in place instead of building N new paths.
     """
 
     @docstring.Substitution(_quiver_doc)
@@ -413,6 +419,9 @@ class Quiver(collections.PolyCollection):
                                             closed=False,
                                             **kw)
         self.polykw = kw
+        self._verts = None
+        self._verts_mask = ma.nomask
+        self._arrow_paths = None
         self.set_UVC(U, V, C)
         self._initialized = False
 
@@ -452,10 +461,43 @@ class Quiver(collections.PolyCollection):
         if (self._new_UV or self.angles == 'xy'
                 or self.scale_units in ['x','y', 'xy']):
             verts = self._make_verts(self.U, self.V)
-            self.set_verts(verts, closed=False)
+            self._set_arrow_verts(verts)
             self._new_UV = False
         collections.PolyCollection.draw(self, renderer)
 
+    def _set_arrow_verts(self, XY):
+        """
+        Copy the (N, 8, 2) arrow vertices *XY* into the packed vertex
+        buffer shared by the arrow paths.  The buffer and its paths
+        are only rebuilt when the number of arrows changes, or when
+        the paths have been replaced through set_verts().
+        """
+        mask = self.Umask
+        if ma.isMaskedArray(XY):
+            XY = XY.astype(np.float_).filled(np.nan)
+        if (self._verts is None or self._verts.shape != XY.shape
+                or self._paths is not self._arrow_paths):
+            self._verts = np.array(XY, np.float_)
+            # Each path wraps a view of one row of the buffer, so the
+            # vertices can be rewritten without touching the paths.
+            self._arrow_paths = [mpath.Path(xy) for xy in self._verts]
+            self._paths = self._arrow_paths
+            self._verts_mask = mask
+            return
+        self._verts[...] = XY
+        # Path computes has_nonfinite once, in its constructor; masked
+        # arrows are the only source of nans, so only a change in the
+        # mask requires the flags to be refreshed.
+        if mask is self._verts_mask or (
+                mask is not ma.nomask and self._verts_mask is not ma.nomask
+                and np.array_equal(mask, self._verts_mask)):
+            return
+        if mask is ma.nomask:
+            mask = np.zeros((len(self._arrow_paths),), bool)
+        for path, masked in zip(self._arrow_paths, mask):
+            path.has_nonfinite = bool(masked)
+        self._verts_mask = self.Umask
+
     def set_UVC(self, U, V, C=None):
         U = ma.masked_invalid(U, copy=False).ravel()
         V = ma.masked_invalid(V, copy=False).ravel()
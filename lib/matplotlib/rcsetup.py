@@ -252,6 +252,10 @@ validate_cairo_format = ValidateInStrings('cairo_format',
                             ['png', 'ps', 'pdf', 'svg'],
                             ignorecase=True)
 
+validate_png_filter = ValidateInStrings('png_filter',
+                            ['auto', 'none', 'sub', 'up', 'avg', 'paeth'],
+                            ignorecase=True)
+
 validate_ps_papersize = ValidateInStrings('ps_papersize',[
     'auto', 'letter', 'legal', 'ledger',
     'a0', 'a1', 'a2','a3', 'a4', 'a5', 'a6', 'a7', 'a8', 'a9', 'a10',
@@ -524,14 +528,22 @@ defaultParams = {
     'ps.usedistiller'    : [False, validate_ps_distiller], # use ghostscript or xpdf to distill ps output
     'ps.distiller.res'   : [6000, validate_int],     # dpi
     'ps.fonttype'        : [3, validate_fonttype], # 3 (Type3) or 42 (Truetype)
+    'ps.precision'       : [3, validate_int],      # number of decimals of the path coordinates
+    'png.compression'    : [6, validate_int],        # zlib compression level from 0 to 9
+    'png.filter'         : ['auto', validate_png_filter], # scanline filter
+    'png.palette'        : [False, validate_bool],   # write indexed color files when possible
+    'png.threads'        : [1, validate_int],        # number of threads compressing the image
     'pdf.compression'    : [6, validate_int],        # compression level from 0 to 9; 0 to disable
     'pdf.inheritcolor'   : [False, validate_bool],   # ignore any color-setting commands from the frontend
     'pdf.use14corefonts' : [False, validate_bool],  # use only the 14 PDF core fonts
                                                     # embedded in every PDF viewing application
     'pdf.fonttype'      : [3, validate_fonttype],  # 3 (Type3) or 42 (Truetype)
+    'pdf.precision'     : [6, validate_int],       # number of decimals of the path coordinates
     'svg.image_inline'  : [True, validate_bool],    # write raster image data directly into the svg file
     'svg.image_noscale' : [False, validate_bool],  # suppress scaling of raster data embedded in SVG
     'svg.embed_char_paths' : [True, validate_bool],  # True to save all characters as paths in the SVG
+    'svg.precision'     : [6, validate_int],    # number of decimals of the coordinates
+    'svg.compact_paths' : [False, validate_bool],  # write path data with relative coordinates
 
     'docstring.hardcopy' : [False, validate_bool],  # set this when you want to generate hardcopy docstring
     'plugins.directory' : ['.matplotlib_plugins', str], # where plugin directory is locate
@@ -1,4 +1,7 @@
 import os
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 def report_memory(i):
     pid = os.getpid()
@@ -62,3 +65,45 @@ def report_memory(i):
 ##     # w/o text and w/o write_png: Average memory consumed per loop: 0.02
 ##     # w/o text and w/ write_png : Average memory consumed per loop: 0.3400
 ##     # w/ text and w/ write_png  : Average memory consumed per loop: 0.32
+
+
+def test_render_buffer():
+    fig = Figure(figsize=(2, 1), dpi=50)
+    canvas = FigureCanvasAgg(fig)
+    fig.add_subplot(111).plot([1, 3, 2])
+    canvas.draw()
+    rgba = canvas.get_rgba_array().copy()
+    assert rgba.shape == (50, 100, 4)
+
+    rgb = canvas.tostring_rgb()
+    out = np.empty(len(rgb), np.uint8)
+    assert canvas.tostring_rgb(out) is None
+    assert out.tostring() == rgb
+
+    # render into the second slot of a caller owned "ring" of frames
+    ring = np.zeros((2, 50, 100, 4), np.uint8)
+    canvas.set_render_buffer(ring[1])
+    canvas.draw()
+    assert (ring[1] == rgba).all()
+    assert (ring[0] == 0).all()
+
+def test_png_options():
+    from cStringIO import StringIO
+    from matplotlib import _png
+
+    def render(**options):
+        fig = Figure(figsize=(2, 1), dpi=50)
+        canvas = FigureCanvasAgg(fig)
+        fig.add_subplot(111).bar([0, 1], [1, 2], color=['r', 'g'],
+                                 linewidth=0)
+        buf = StringIO()
+        canvas.print_png(buf, **options)
+        buf.seek(0)
+        return _png.read_png(buf)
+
+    expected = render()
+    for options in (dict(compression=0, filter='none'),
+                    dict(palette=True),
+                    dict(threads=3, filter='sub'),
+                    dict(threads=4, palette=True)):
+        assert (render(**options) == expected).all()
@@ -0,0 +1,79 @@
+import numpy as np
+
+from matplotlib.backend_bases import FigureCanvasBase, RendererBase
+from matplotlib.backends.backend_mixed import MixedModeRenderer
+from matplotlib.figure import Figure
+
+class ImageRecorder(RendererBase):
+    def __init__(self):
+        RendererBase.__init__(self)
+        self.images = []
+
+    def draw_image(self, gc, x, y, im):
+        self.images.append((x, y, im.as_rgba_str()))
+
+def draw_rasterized(fig, whole_figure=False):
+    width, height = fig.get_size_inches()
+    recorder = ImageRecorder()
+    renderer = MixedModeRenderer(fig, width, height, 200, recorder)
+    if whole_figure:
+        renderer._get_region = lambda bbox: (0, 0, width * 200, height * 200)
+    fig.draw(renderer)
+    fig.set_dpi(72)
+    return recorder.images, renderer
+
+def test_raster_regions():
+    fig = Figure(figsize=(8, 6), dpi=72)
+    FigureCanvasBase(fig)
+    fig.patch.set_visible(False)
+    data = np.arange(100).reshape((10, 10))
+    ax1 = fig.add_axes([0.1, 0.1, 0.2, 0.2])
+    ax1.pcolormesh(data, rasterized=True)
+    ax1.plot([0, 10], [10, 0], lw=5, rasterized=True)
+    ax2 = fig.add_axes([0.6, 0.6, 0.3, 0.3])
+    ax2.set_rasterization_zorder(1)
+    ax2.pcolormesh(data, zorder=0)
+    for ax in (ax1, ax2):
+        ax.set_axis_off()
+
+    images, renderer = draw_rasterized(fig)
+    # the artists of the first axes share an image
+    assert len(images) == 2
+    # the buffers only cover the axes
+    assert max([len(buf) for buf in renderer._buffers]) < 0.1 * 1600 * 1200 * 4
+    # the images are those drawn at the size of the figure
+    assert images == draw_rasterized(fig, whole_figure=True)[0]
+
+def test_raster_unclipped_children():
+    fig = Figure(figsize=(8, 6), dpi=72)
+    FigureCanvasBase(fig)
+    fig.patch.set_visible(False)
+    ax = fig.add_axes([0.1, 0.1, 0.2, 0.2])
+    ax.set_axis_off()
+    # the box of the text is drawn without the clipping of the text
+    text = ax.text(0.5, 0.5, 'boxed', bbox=dict(facecolor='red'),
+                   clip_on=True, rasterized=True)
+    text.set_clip_box(ax.bbox.frozen().shrunk(0.01, 0.01))
+    images = draw_rasterized(fig)[0]
+    assert len(images) == 1
+    assert images == draw_rasterized(fig, whole_figure=True)[0]
+
+def test_raster_bbox_image():
+    from cStringIO import StringIO
+    from matplotlib.offsetbox import AnnotationBbox, OffsetImage
+    fig = Figure(figsize=(4, 3), dpi=72)
+    canvas = FigureCanvasBase(fig)
+    fig.patch.set_visible(False)
+    ax = fig.add_axes([0.1, 0.1, 0.4, 0.4])
+    ax.set_axis_off()
+    # the image has no axes, and lies outside of those it annotates
+    image = OffsetImage(np.arange(16).reshape((4, 4)), zoom=5)
+    image.get_children()[0].set_rasterized(True)
+    ab = AnnotationBbox(image, (0.8, 0.8), xycoords='figure fraction',
+                        frameon=False)
+    ax.add_artist(ab)
+    for format in ('pdf', 'svg', 'ps'):
+        canvas.print_figure(StringIO(), format=format)
+    images = draw_rasterized(fig)[0]
+    assert len(images) == 1
+    assert images == draw_rasterized(fig, whole_figure=True)[0]
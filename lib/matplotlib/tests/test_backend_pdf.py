@@ -0,0 +1,42 @@
+import re
+from cStringIO import StringIO
+
+import numpy as np
+
+from matplotlib import rcParams
+from matplotlib.backends.backend_pdf import FigureCanvasPdf, PdfPages
+from matplotlib.figure import Figure
+
+def save_pages(npages):
+    fh = StringIO()
+    pdf = PdfPages(fh)
+    data = np.arange(100).reshape((10, 10))
+    for i in range(npages):
+        fig = Figure()
+        FigureCanvasPdf(fig)
+        ax = fig.add_subplot(111)
+        ax.imshow(data, interpolation='nearest')
+        ax.plot(range(10), 'o')
+        ax.plot(range(10, 0, -1), 'o')
+        pdf.savefig(fig)
+    saved = pdf._file.deduplicatedBytes
+    pdf.close()
+    return fh.getvalue(), saved
+
+def test_shared_xobjects():
+    compression = rcParams['pdf.compression']
+    rcParams['pdf.compression'] = 0
+    try:
+        single, saved_single = save_pages(1)
+        output, saved = save_pages(3)
+    finally:
+        rcParams['pdf.compression'] = compression
+
+    # the images and markers of the first page are used on the others
+    for subtype in ('/Subtype /Image', '/Subtype /Form'):
+        assert output.count(subtype) == single.count(subtype)
+    # only the reuses on later pages count as saved
+    assert saved_single == 0
+    width = int(re.search(r'/Width (\d+)', output).group(1))
+    height = int(re.search(r'/Height (\d+)', output).group(1))
+    assert saved > 2 * width * height * 4
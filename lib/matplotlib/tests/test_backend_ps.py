@@ -0,0 +1,29 @@
+import re
+from cStringIO import StringIO
+
+from matplotlib.backends import backend_ps
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_ps import FigureCanvasPS
+
+def test_spooled_body():
+    fig = Figure()
+    FigureCanvasPS(fig)
+    ax = fig.add_subplot(111)
+    ax.plot(range(10000))
+    ax.set_title('streamed')
+
+    outputs = []
+    spool_size = backend_ps._spool_size
+    try:
+        # in memory, then through a temporary file
+        for backend_ps._spool_size in (spool_size, 1):
+            fh = StringIO()
+            fig.savefig(fh, format='eps')
+            outputs.append(re.sub('%%CreationDate: .*', '', fh.getvalue()))
+    finally:
+        backend_ps._spool_size = spool_size
+    assert outputs[0] == outputs[1]
+    assert outputs[0].startswith('%!PS-Adobe-3.0 EPSF-3.0\n')
+    assert outputs[0].endswith('\nend\nshowpage\n\n')
+    # the characters of the title are in the embedded font
+    assert '/m{' in outputs[0] and '/d{' in outputs[0]
@@ -1,8 +1,12 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import cStringIO as StringIO
+import re
 import xml.parsers.expat
 from matplotlib.testing.decorators import knownfailureif
+from matplotlib.backends.backend_svg import RendererSVG
+from matplotlib.path import Path
+from matplotlib.transforms import Affine2D
 
 def test_visibility():
     # This is SF 2856495. See
@@ -27,3 +31,71 @@ def test_visibility():
 
     parser = xml.parsers.expat.ParserCreate()
     parser.Parse(buf) # this will raise ExpatError if the svg is invalid
+
+def _parse_path_data(d):
+    # return the absolute vertices of svg path data
+    tokens = re.findall(r'[MLQCZmlqcz]|-?(?:\d+\.?\d*|\.\d+)', d)
+    nargs = {'m': 2, 'l': 2, 'q': 4, 'c': 6, 'z': 0}
+    vertices = []
+    x = y = xstart = ystart = 0.0
+    command = None
+    i = 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+        elif command.lower() == 'm':
+            # a moveto is followed by implicit linetos
+            command = command.isupper() and 'L' or 'l'
+        n = nargs[command.lower()]
+        args = [float(val) for val in tokens[i:i+n]]
+        i += n
+        if command.lower() == 'z':
+            x, y = xstart, ystart
+            continue
+        if command.islower():
+            args = [val + (x, y)[j % 2] for j, val in enumerate(args)]
+        vertices.extend(args)
+        x, y = args[-2:]
+        if command.lower() == 'm':
+            xstart, ystart = x, y
+    return vertices
+
+def test_compact_paths():
+    path = Path([[0, 0], [10.25, -3.5], [0.125, 0.5], [7, 8], [1, 2], [0, 0],
+                 [-2.5, 3], [4.75, 4.5], [1, 1], [2, 3], [5, 5], [6.001, 1]],
+                [Path.MOVETO, Path.LINETO, Path.LINETO, Path.CURVE4,
+                 Path.CURVE4, Path.CURVE4, Path.CLOSEPOLY, Path.MOVETO,
+                 Path.LINETO, Path.CURVE3, Path.CURVE3, Path.LINETO])
+    transform = Affine2D().scale(1 / 3.)
+    renderer = RendererSVG(100, 100, StringIO.StringIO())
+    absolute = renderer._convert_path(path, transform, simplify=False)
+    renderer._compact_paths = True
+    compact = renderer._convert_path(path, transform, simplify=False)
+    assert len(compact) < len(absolute)
+    assert np.allclose(_parse_path_data(compact),
+                       _parse_path_data(absolute), atol=1e-6)
+
+    renderer._precision = 2
+    data = renderer._convert_path(path, transform, simplify=False)
+    assert np.allclose(_parse_path_data(data),
+                       _parse_path_data(absolute), atol=0.006)
+
+def test_collection_styles():
+    fig = plt.figure()
+    ax = fig.add_subplot(1, 1, 1)
+    ax.scatter(np.arange(100), np.arange(100),
+               c=np.arange(100) % 2, edgecolors='none')
+    fd = StringIO.StringIO()
+    fig.savefig(fd, format='svg')
+    buf = fd.getvalue()
+    fd.close()
+    parser = xml.parsers.expat.ParserCreate()
+    parser.Parse(buf)
+
+    # the two styles are defined as classes once, and the points share
+    # the clip group of the axes
+    assert buf.count('<use xlink:href="#coll') == 100
+    assert len(re.findall(r'\n\.s[0-9a-f]{8}\{', buf)) == 2
+    assert len(re.findall(r'<use[^>]*class=', buf)) == 100
+    assert len(re.findall(r'<g clip-path=', buf)) == 1
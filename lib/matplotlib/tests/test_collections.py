@@ -0,0 +1,81 @@
+import numpy as np
+import numpy.ma as ma
+from numpy.testing import assert_array_equal, assert_almost_equal
+from matplotlib.collections import PolyCollection, LineCollection
+from matplotlib.path import Path, PackedPaths, get_path_collection_extents
+from matplotlib.transforms import Affine2D
+
+def test_packed_polygons_match_paths():
+    verts = [np.arange(6).reshape((3, 2)), [], [(0, 0), (1, 0)]]
+    col = PolyCollection(verts)
+    paths = col._paths
+    assert isinstance(paths, PackedPaths)
+    assert len(paths) == 3
+
+    assert_array_equal(paths[0].vertices, [[0, 1], [2, 3], [4, 5], [0, 0]])
+    assert_array_equal(paths[0].codes,
+                       [Path.MOVETO, Path.LINETO, Path.LINETO,
+                        Path.CLOSEPOLY])
+    assert len(paths[1]) == 0
+    assert_array_equal(paths[2].codes,
+                       [Path.MOVETO, Path.LINETO, Path.CLOSEPOLY])
+
+    # get_paths hands out a real list, which then replaces the packing
+    unpacked = col.get_paths()
+    assert isinstance(unpacked, list)
+    assert col.get_paths() is unpacked
+
+def test_packed_verts():
+    col = PolyCollection([])
+    col.set_packed_verts(np.arange(10.).reshape((5, 2)), [0, 2, 2, 5])
+    assert [len(p) for p in col._paths] == [3, 0, 4]
+    assert_array_equal(col._paths[2].vertices[:3], [[4, 5], [6, 7], [8, 9]])
+
+def test_packed_extents():
+    segs = [[(0, 0), (1, 2)], [(np.nan, 5), (3, -1)], [(2, 2)]]
+    packed = PackedPaths.from_polylines(segs)
+    paths = [Path(seg) for seg in segs]
+    trans = Affine2D().scale(2.0).frozen()
+    offset_trans = Affine2D().translate(1, 1).frozen()
+    for offsets in (np.zeros((0, 2)), [(1, 0)], [(1, 0), (0, 1), (5, 5)]):
+        offsets = np.asarray(offsets, np.float_)
+        expected = get_path_collection_extents(trans, paths, [], offsets,
+                                               offset_trans)
+        actual = get_path_collection_extents(trans, packed, [], offsets,
+                                             offset_trans)
+        assert_almost_equal(actual.extents, expected.extents)
+
+def test_line_collection_uniform_offsets():
+    segs = [np.zeros((2, 2)), np.ones((3, 2))]
+    col = LineCollection(segs, offsets=(1, 2))
+    assert_array_equal(col.get_paths()[0].vertices, np.zeros((2, 2)))
+    assert_array_equal(col.get_paths()[1].vertices, [[2, 3]] * 3)
+
+def _drawn_quiver(U, V):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    X, Y = np.meshgrid(np.arange(3), np.arange(2))
+    q = ax.quiver(X, Y, U, V, width=0.01, scale=10)
+    canvas.draw()
+    return q, canvas
+
+def test_quiver_set_uvc_in_place():
+    U = np.ones((2, 3))
+    q, canvas = _drawn_quiver(U, U)
+    paths = q.get_paths()
+    path_ids = [id(p) for p in paths]
+
+    U = np.arange(6.).reshape((2, 3))
+    V = ma.array(-U, mask=[[0, 1, 0], [0, 0, 0]])
+    for U, V in [(U, -U), (U, V), (U + 1, V), (U, -U)]:
+        q.set_UVC(U, V)
+        canvas.draw()
+        assert q.get_paths() is paths
+        assert [id(p) for p in q.get_paths()] == path_ids
+        fresh = _drawn_quiver(U, V)[0].get_paths()
+        for path, expected in zip(paths, fresh):
+            assert_array_equal(path.vertices, expected.vertices)
+            assert path.has_nonfinite == expected.has_nonfinite
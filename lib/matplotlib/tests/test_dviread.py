@@ -0,0 +1,95 @@
+import os
+import shutil
+import struct
+import tempfile
+
+from matplotlib import dviread
+
+def write_tfm(filename):
+    # characters 65-67, with widths of 0.5 and 0.25 design sizes
+    lh, bc, ec, nw, nh, nd = 2, 65, 67, 3, 2, 2
+    header = struct.pack('!12H', 0, lh, bc, ec, nw, nh, nd, 0, 0, 0, 0, 0)
+    header += struct.pack('!2I', 0, 10 << 20)
+    char_info = struct.pack('!12B', 1, 0x11, 0, 0,
+                                    2, 0x10, 0, 0,
+                                    1, 0x01, 0, 0)
+    fh = open(filename, 'wb')
+    fh.write(header + char_info +
+             struct.pack('!3I', 0, 1 << 19, 1 << 18) +    # widths
+             struct.pack('!2I', 0, 1 << 19) +             # heights
+             struct.pack('!2I', 0, 1 << 17))              # depths
+    fh.close()
+
+def write_dvi(filename):
+    ops = [struct.pack('>BBIIIB', 247, 2, 25400000, 7227 * 2**16, 1000, 0),
+           struct.pack('>B11i', 139, *([0] * 10 + [-1])),
+           struct.pack('>BBIIIBB5s', 243, 0, 0, 10 * 2**16, 10 * 2**16,
+                       0, 5, 'dummy'),
+           chr(171),                                      # fnt_num_0
+           chr(65),                                       # set_char_65
+           chr(145) + struct.pack('>i', 100000)[1:],      # right3
+           chr(141),                                      # push
+           chr(158) + struct.pack('>h', -200),            # down2
+           chr(128) + chr(67),                            # set1
+           chr(142),                                      # pop
+           chr(150) + struct.pack('>i', 1000)[1:],        # w3
+           chr(147),                                      # w0
+           chr(153) + struct.pack('>b', 5),               # x1
+           chr(152),                                      # x0
+           chr(163) + struct.pack('>h', 300),             # y2
+           chr(161),                                      # y0
+           chr(170) + struct.pack('>i', -100),            # z4
+           chr(166),                                      # z0
+           chr(137) + struct.pack('>ii', 10, 20),         # put_rule
+           chr(66),                                       # set_char_66
+           chr(132) + struct.pack('>ii', -1, 50),         # set_rule
+           chr(134) + struct.pack('>H', 65),              # put2
+           chr(140),                                      # eop
+           chr(248)]                                      # post
+    fh = open(filename, 'wb')
+    fh.write(''.join(ops))
+    fh.close()
+
+def test_dvi():
+    tmpdir = tempfile.mkdtemp()
+    cachedir = dviread._cachedir
+    try:
+        dviread._cachedir = os.path.join(tmpdir, 'cache')
+        tfmfile = os.path.join(tmpdir, 'dummy.tfm')
+        write_tfm(tfmfile)
+        tfm = dviread._parse_cached(dviread.Tfm, tfmfile)
+        assert tfm.width == {65: 1 << 19, 66: 1 << 18, 67: 1 << 19}
+        # the second time, the parsed file is read from the cache
+        cached = dviread._parse_cached(dviread.Tfm, tfmfile)
+        assert cached is not tfm and cached.width == tfm.width
+        assert len(os.listdir(dviread._cachedir)) == 1
+
+        dviread._tfmcache['dummy'] = tfm
+        dviread._vfcache['dummy'] = None
+        dvifile = os.path.join(tmpdir, 'test.dvi')
+        write_dvi(dvifile)
+        page = dviread.first_page(dvifile, None)
+        w65, w66 = 327680, 163840
+        h = w65 + 100000
+        assert [(x, y, g, w) for x, y, f, g, w in page.text] == [
+            (0, 0, 65, w65),
+            (h, -200, 67, w65),
+            (h + 2010, 400, 66, w66),
+            (h + 2010 + w66 + 50, 400, 65, w65)]
+        assert page.text[0][2].texname == 'dummy'
+        assert page.boxes == [(h + 2010, 400, 10, 20)]
+
+        # pages are scaled from the cached contents
+        page72 = dviread.first_page(dvifile, 72)
+        dvi = dviread.Dvi(dvifile, 72)
+        expected = iter(dvi).next()
+        dvi.close()
+        assert page72.text == expected.text
+        assert page72.boxes == expected.boxes
+        assert (page72.width, page72.height, page72.descent) == \
+            (expected.width, expected.height, expected.descent)
+    finally:
+        dviread._cachedir = cachedir
+        dviread._tfmcache.pop('dummy', None)
+        dviread._vfcache.pop('dummy', None)
+        shutil.rmtree(tmpdir)
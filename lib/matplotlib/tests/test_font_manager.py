@@ -0,0 +1,174 @@
+import os
+import shutil
+import tempfile
+
+import matplotlib
+from matplotlib import font_manager
+
+def test_font_index():
+    fontdir = os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf')
+    tmpdir = tempfile.mkdtemp()
+    try:
+        fnames = []
+        for name in ('Vera.ttf', 'VeraBd.ttf'):
+            fname = os.path.join(tmpdir, name)
+            shutil.copy(os.path.join(fontdir, name), fname)
+            fnames.append(fname)
+        broken = os.path.join(tmpdir, 'broken.ttf')
+        open(broken, 'w').write('not a font')
+        fnames.append(broken)
+
+        index = {}
+        fontlist = font_manager.createFontList(fnames, index=index)
+        assert [font.fname for font in fontlist] == fnames[:2]
+        assert sorted(index) == sorted(fnames)
+        assert index[broken][2] is None
+
+        # unchanged files reuse their entries
+        again = font_manager.createFontList(fnames, index=index)
+        assert [id(font) for font in again] == [id(font) for font in fontlist]
+
+        # changed files are read again
+        stat = os.stat(fnames[0])
+        os.utime(fnames[0], (stat.st_atime, stat.st_mtime + 10))
+        again = font_manager.createFontList(fnames, index=index)
+        assert again[0] is not fontlist[0]
+        assert again[0].name == fontlist[0].name
+        assert again[1] is fontlist[1]
+
+        # the cache is replaced, never rewritten in place
+        cache = os.path.join(tmpdir, 'index.cache')
+        font_manager.pickle_dump(index, cache)
+        font_manager.pickle_dump(index, cache)
+        assert sorted(os.listdir(tmpdir)) == sorted(
+            [os.path.basename(fname) for fname in fnames] + ['index.cache'])
+        loaded = font_manager.pickle_load(cache)
+        assert loaded[fnames[1]][2].name == fontlist[1].name
+    finally:
+        shutil.rmtree(tmpdir)
+
+def test_findfont_index():
+    fm = font_manager.FontManager()
+
+    def scan(prop):
+        # the exhaustive search that the name index narrows down
+        best_score, best_font = 10.0, None
+        for font in fm.ttflist:
+            score = (fm.score_family(prop.get_family(), font.name) * 10.0 +
+                     fm.score_style(prop.get_style(), font.style) +
+                     fm.score_variant(prop.get_variant(), font.variant) +
+                     fm.score_weight(prop.get_weight(), font.weight) +
+                     fm.score_stretch(prop.get_stretch(), font.stretch) +
+                     fm.score_size(prop.get_size(), font.size))
+            if score < best_score:
+                best_score, best_font = score, font
+        return best_font.fname
+
+    for family in ('serif', 'sans', 'monospace', 'STIXGeneral',
+                   ['cmr10', 'sans-serif'], 'Bitstream Vera Sans Mono'):
+        for style in ('normal', 'italic'):
+            for weight in ('normal', 'bold', 300):
+                prop = font_manager.FontProperties(
+                    family=family, style=style, weight=weight)
+                assert fm.findfont(prop) == scan(prop)
+
+    # all the bundled fonts are scalable, so sizes share cache entries
+    ncached = len(fm.ttf_lookup_cache)
+    for size in (6, 10, 'large', 24.5):
+        fm.findfont(font_manager.FontProperties(family='serif', size=size,
+                                                stretch='condensed'))
+    assert len(fm.ttf_lookup_cache) == ncached + 1
+
+def test_fc_match_cache():
+    output = ('Pattern has 2 elts (size 16)\n'
+              '\tfile: "/usr/share/fonts/type1/n019003l.pfb"(s)\n'
+              'Pattern has 2 elts (size 16)\n'
+              '\tfile: "/usr/share/fonts/truetype/DejaVuSans.ttf"(s)\n')
+    assert (font_manager._fc_match_file(output, 'ttf') ==
+            '/usr/share/fonts/truetype/DejaVuSans.ttf')
+    assert font_manager._fc_match_file(output, 'afm') is None
+
+    vera = os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf',
+                        'Vera.ttf')
+    tmpdir = tempfile.mkdtemp()
+    cachefile = font_manager._fc_match_cachefile
+    try:
+        font_manager._fc_match_cachefile = os.path.join(tmpdir, 'fc.cache')
+        font_manager._fc_match_cache = {(':family=vera', 'ttf'): vera}
+        font_manager._save_fc_match_cache()
+
+        # a new process finds the matches on disk
+        font_manager._fc_match_cache = None
+        assert font_manager.fc_findfonts([':family=vera'] * 2) == [vera] * 2
+        prop = font_manager.FontProperties(family='vera')
+        font_manager._fc_match_cache[
+            (prop.get_fontconfig_pattern(), 'ttf')] = vera
+        assert font_manager.fc_findfonts([prop]) == [vera]
+    finally:
+        font_manager._fc_match_cachefile = cachefile
+        font_manager._fc_match_cache = None
+        shutil.rmtree(tmpdir)
+
+def test_font_index_cache():
+    tmpdir = tempfile.mkdtemp()
+    fontdir = os.path.join(tmpdir, 'fonts')
+    os.mkdir(fontdir)
+    extra = os.path.join(fontdir, 'IndexTest.ttf')
+    shutil.copy(os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf',
+                             'Vera.ttf'), extra)
+    saved = (font_manager._fmcache, font_manager._fmindex,
+             font_manager.fontManager, font_manager.createFontEntry,
+             font_manager._rebuild, os.environ.get('TTFPATH'))
+    opened = []
+    def createFontEntry(fpath, fontext='ttf'):
+        opened.append(fpath)
+        return saved[3](fpath, fontext)
+    rebuilt = []
+    def _rebuild():
+        rebuilt.append(True)
+        saved[4]()
+
+    def load():
+        del opened[:], rebuilt[:]
+        font_manager.fontManager = font_manager._LazyFontManager()
+        return font_manager._get_fontmanager()
+
+    try:
+        font_manager._fmcache = os.path.join(tmpdir, 'fontList.cache')
+        font_manager._fmindex = os.path.join(tmpdir, 'fontIndex.cache')
+        font_manager.createFontEntry = createFontEntry
+        font_manager._rebuild = _rebuild
+        os.environ['TTFPATH'] = fontdir
+        fm = load()
+        assert extra in opened
+        assert extra in [font.fname for font in fm.ttflist]
+
+        # the cache is used while the fonts do not change
+        load()
+        assert opened == [] and not rebuilt
+
+        # a new font manager, e.g. of a new version, reuses the index
+        os.remove(font_manager._fmcache)
+        load()
+        assert opened == [] and rebuilt
+
+        # changed fonts are noticed and read again, alone
+        stat = os.stat(extra)
+        os.utime(extra, (stat.st_atime, stat.st_mtime + 10))
+        load()
+        assert opened == [extra] and rebuilt
+
+        # and so are removed ones
+        os.remove(extra)
+        fm = load()
+        assert opened == [] and rebuilt
+        assert extra not in [font.fname for font in fm.ttflist]
+    finally:
+        (font_manager._fmcache, font_manager._fmindex,
+         font_manager.fontManager, font_manager.createFontEntry,
+         font_manager._rebuild) = saved[:5]
+        if saved[5] is None:
+            del os.environ['TTFPATH']
+        else:
+            os.environ['TTFPATH'] = saved[5]
+        shutil.rmtree(tmpdir)
@@ -123,6 +123,33 @@ def test_imshow():
 
     fig.savefig('imshow')
 
+def test_specgram_stream():
+    np.random.seed(0)
+    x = np.random.randn(3000)
+    Pxx, freqs, t = plt.mlab.specgram(x, NFFT=128, noverlap=64)
+    fig = plt.figure()
+    ax = fig.add_subplot(111)
+    im = ax.specgram_stream(ncols=10, NFFT=128, noverlap=64)
+    fig.canvas.draw()
+    for i in range(0, 3000, 500):
+        im.add(x[i:i+500])
+        fig.canvas.draw()
+    assert_array_equal(im.get_array(), 10 * np.log10(Pxx[:, -10:]))
+    assert im.get_extent()[1] == t[-1] + 16
+
+def test_specgram_dtype():
+    np.random.seed(0)
+    x = np.random.randn(3000)
+    expected = plt.mlab.specgram(x, NFFT=128, noverlap=64,
+                                 dtype=np.float32)[0]
+    fig = plt.figure()
+    fig.add_subplot(111)
+    Pxx, freqs, t, im = plt.specgram(x, NFFT=128, noverlap=64,
+                                     dtype=np.float32)
+    assert Pxx.dtype == np.float32
+    assert_array_equal(Pxx, expected)
+    plt.close(fig)
+
 if __name__=='__main__':
     import nose
     nose.runmodule(argv=['-s','--with-doctest'], exit=False)
@@ -1,6 +1,6 @@
 import numpy as np
 import matplotlib.mlab as mlab
-import tempfile
+import tempfile, os
 from nose.tools import raises
 
 def test_colinear_pca():
@@ -55,3 +55,252 @@ def test_prctile():
     for pi, expectedi in zip(p,expected):
         actuali = mlab.prctile(ob1,pi)
         assert np.allclose( expectedi, actuali )
+
+def test_bincount():
+    counts = mlab._bincount([1, 3, 1], minlength=5)
+    assert counts.tolist() == [0, 2, 0, 1, 0]
+    sums = mlab._bincount([1, 3, 1], [0.5, 2., 1.], 2)
+    assert sums.tolist() == [0, 1.5, 0, 2]
+    assert mlab._bincount([], minlength=3).tolist() == [0, 0, 0]
+
+def test_grouped_reduce():
+    index = np.array([2, 0, 2, 2, 0])
+    values = np.array([1., 5., 3., 2., 4.])
+    for func, expected in ((np.sum, [9, np.nan, 6]),
+                           (np.mean, [4.5, np.nan, 2]),
+                           (np.max, [5, np.nan, 3]),
+                           (min, [4, np.nan, 1]),
+                           (np.median, [4.5, np.nan, 2])):
+        result = mlab.grouped_reduce(index, values, 3, func)
+        assert np.allclose(result[[0, 2]], np.take(expected, [0, 2]))
+        assert np.isnan(result[1])
+
+def test_hexbinner_chunks():
+    np.random.seed(0)
+    x, y, C = np.random.rand(3, 1000)
+    for func in (None, np.mean, np.max, np.min, np.median):
+        whole = mlab.HexBinner((0, 1, 0, 1), 10, reduce_C_function=func)
+        whole.add(x, y, C)
+        chunked = mlab.HexBinner((0, 1, 0, 1), 10, reduce_C_function=func)
+        for i in range(0, 1000, 300):
+            chunked.add(x[i:i+300], y[i:i+300], C[i:i+300])
+        assert (whole.counts == chunked.counts).all()
+        assert whole.counts.sum() == 1000
+        expected, actual = whole.get_values(), chunked.get_values()
+        assert (np.isnan(expected) == np.isnan(actual)).all()
+        full = ~np.isnan(expected)
+        assert np.allclose(expected[full], actual[full])
+
+def test_hist_accumulator():
+    from matplotlib.figure import Figure
+    np.random.seed(0)
+    x = np.random.randn(1000)
+    acc = mlab.HistAccumulator(20)
+    for i in range(0, 1000, 300):
+        acc.scan(x[i:i+300])
+    for i in range(0, 1000, 300):
+        acc.add(x[i:i+300])
+    counts, edges = np.histogram(x, 20)
+    assert np.allclose(acc.edges, edges)
+    assert np.allclose(acc.counts, counts)
+
+    # the first chunk fixes the edges without a scan
+    acc = mlab.HistAccumulator(5)
+    acc.add([1, 2, 3])
+    acc.add([0, 2, 4, 5], weights=[1, 1, 2, 3])
+    assert np.allclose(acc.counts, [1, 0, 2, 0, 1])
+    assert (acc.underflow, acc.overflow) == (1, 5)
+
+    ax = Figure().add_subplot(111)
+    n, bins, patches = acc.render(ax)
+    assert np.allclose(n, acc.counts)
+    assert [p.get_height() for p in patches] == list(acc.counts)
+
+def test_spectral_blocks():
+    np.random.seed(0)
+    x = np.random.randn(5000)
+    y = x + np.random.randn(5000)
+    Pxx, freqs, t = mlab.specgram(x, NFFT=128, noverlap=32,
+                                  detrend=mlab.detrend_linear)
+    Pxy, freqs = mlab.csd(x, y, NFFT=128, noverlap=32)
+
+    # the reference periodogram of one segment
+    segment = mlab.detrend_linear(x[96:224]) * mlab.window_hanning(np.ones(128))
+    fx = np.fft.fft(segment)[:65]
+    expected = np.abs(fx)**2 / (mlab.window_hanning(np.ones(128))**2).sum()
+    expected[1:-1] *= 2
+    assert np.allclose(Pxx[:, 1], expected / 2)
+
+    block_size = mlab._spectral_block_size
+    mlab._spectral_block_size = 300
+    try:
+        Pxx2, freqs2, t2 = mlab.specgram(x, NFFT=128, noverlap=32,
+                                         detrend=mlab.detrend_linear)
+        Pxy2, freqs2 = mlab.csd(x, y, NFFT=128, noverlap=32)
+        Pxx32, freqs32, t32 = mlab.specgram(x, NFFT=128, noverlap=32,
+                                            detrend=mlab.detrend_linear,
+                                            dtype=np.float32)
+    finally:
+        mlab._spectral_block_size = block_size
+    assert np.allclose(Pxx, Pxx2)
+    assert np.allclose(Pxy, Pxy2)
+    assert Pxx32.dtype == np.float32
+    assert np.allclose(Pxx, Pxx32, rtol=1e-5)
+
+def test_streaming_specgram():
+    np.random.seed(0)
+    x = np.random.randn(3000)
+    Pxx, freqs, t = mlab.specgram(x, NFFT=128, noverlap=64)
+    stream = mlab.StreamingSpecgram(NFFT=128, noverlap=64)
+    columns, times = [], []
+    for i in range(0, 3000, 170):
+        P, tt = stream.add(x[i:i+170])
+        columns.append(P)
+        times.append(tt)
+    assert np.allclose(np.hstack([c for c in columns if c.size]), Pxx)
+    assert np.allclose(np.concatenate(times), t)
+    assert np.allclose(stream.freqs, freqs)
+
+def test_cohere_pairs():
+    np.random.seed(0)
+    X = np.random.randn(2000, 5)
+    X[:, 1] += X[:, 0]
+    ij = [(0, 1), (0, 2), (3, 4), (1, 4), (2, 2)]
+    Cxy, Phase, freqs, Pxx = mlab.cohere_pairs(X, ij, NFFT=128, noverlap=32,
+                                               detrend=mlab.detrend_mean,
+                                               returnPxx=True)
+    for i, j in ij:
+        C, f = mlab.cohere(X[:, i], X[:, j], NFFT=128, noverlap=32,
+                           detrend=mlab.detrend_mean)
+        assert np.allclose(Cxy[i, j], C)
+    assert np.allclose(freqs, f)
+    assert sorted(Pxx) == [0, 1, 2, 3, 4]
+
+    # tiny blocks spread over threads give the same answer
+    Cxy2, Phase2, freqs2 = mlab.cohere_pairs(X, ij, NFFT=128, noverlap=32,
+                                             detrend=mlab.detrend_mean,
+                                             memoryBudget=1, numThreads=3)
+    for i, j in ij:
+        assert np.allclose(Cxy2[i, j], Cxy[i, j])
+        assert np.allclose(Phase2[i, j], Phase[i, j])
+
+    # short inputs are zero padded to one segment, and segments that
+    # do not advance are refused up front
+    Cxy, Phase, freqs = mlab.cohere_pairs(X[:100], ij, NFFT=128)
+    assert len(freqs) == 65
+    for noverlap in (128, 200):
+        try:
+            mlab.cohere_pairs(X, ij, NFFT=128, noverlap=noverlap)
+        except ValueError:
+            pass
+        else:
+            assert False, 'noverlap=%d was accepted' % noverlap
+
+def test_csv2rec_columnar():
+    from cStringIO import StringIO
+    txt = ('date,price,qty,flag,name,note\n'
+           '2010-01-04,1.5,3,True,abc,\n'
+           '2010-01-05,,4,False,de,x\n'
+           '# a comment\n'
+           '2010-01-05,2.5,,True,,n/a\n'
+           '2010-01-06,3,7,False,fghij,yy\n')
+    expected = mlab.csv2rec(StringIO(txt.replace('# a comment\n', '')),
+                            missingd={'note':'n/a'})
+    r = mlab.csv2rec_columnar(StringIO(txt), chunksize=2,
+                              missingd={'note':'n/a'})
+    assert r.dtype.names == expected.dtype.names
+    for name in expected.dtype.names:
+        if name == 'price':
+            np.testing.assert_array_equal(r[name], expected[name])
+        else:
+            assert list(r[name]) == list(expected[name])
+
+    chunks = list(mlab.csv2rec_chunks(StringIO(txt), chunksize=3,
+                                      usecols=['qty', 0]))
+    assert [len(c) for c in chunks] == [3, 1]
+    assert chunks[0].dtype.names == ('qty', 'date')
+
+    fd, fname = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        m = mlab.csv2rec_columnar(StringIO(txt), memmap=fname,
+                                  usecols=['date', 'qty'])
+        assert m.dtype['date'] == np.float_
+        assert list(m.qty) == [3, 4, -1, 7]
+        assert np.fromfile(fname, m.dtype).shape == (4,)
+        del m
+    finally:
+        os.remove(fname)
+
+def test_csv2rec_columnar_widen():
+    from cStringIO import StringIO
+    # the bools miss entries, and the types of qty and code only show
+    # after the rows checked
+    txt = ('flag,qty,code\n'
+           'True,1,17\n'
+           ',2,18\n'
+           'False,3,19\n'
+           'True,4.5,x1\n'
+           ',5,10\n')
+    expected = mlab.csv2rec(StringIO(txt))
+    assert list(expected.flag) == [True, None, False, True, None]
+
+    chunks = list(mlab.csv2rec_chunks(StringIO(txt), chunksize=2,
+                                      checkrows=1))
+    assert [c.qty.dtype.kind for c in chunks] == ['i', 'f', 'f']
+    assert list(chunks[1].code) == ['19', 'x1']
+    assert list(chunks[0].flag) == [True, None]
+
+    for chunksize in (1, 2, 10):
+        r = mlab.csv2rec_columnar(StringIO(txt), chunksize=chunksize,
+                                  checkrows=1)
+        assert r.dtype == expected.dtype
+        for name in expected.dtype.names:
+            assert list(r[name]) == list(expected[name])
+
+    fd, fname = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        m = mlab.csv2rec_columnar(StringIO(txt), memmap=fname, chunksize=2,
+                                  checkrows=1)
+        assert list(m.flag) == [True, False, False, True, False]
+        assert list(m.qty) == [1, 2, 3, 4.5, 5]
+        assert list(m.code) == ['17', '18', '19', 'x1', '10']
+        del m
+    finally:
+        os.remove(fname)
+
+def test_rec_groupby_join():
+    r = np.rec.fromarrays([[2, 1, 2, 1, 2], ['b', 'a', 'a', 'a', 'b'],
+                           [1., 2., 3., 4., 5.]], names='i,s,x')
+    g = mlab.rec_groupby(r, ('s', 'i'), (('x', len, 'n'),
+                                         ('x', np.sum, 'total')))
+    assert list(g.s) == ['a', 'a', 'b']
+    assert list(g.i) == [1, 2, 2]
+    assert list(g.n) == [2, 1, 2]
+    assert list(g.total) == [6., 3., 6.]
+
+    r1 = np.rec.fromarrays([[3, 1, 2], ['x', 'y', 'z'], [.3, .1, .2]],
+                           names='k,a,x')
+    r2 = np.rec.fromarrays([[4, 2, 3], [40., 20., 30.]], names='k,x')
+    j = mlab.rec_join('k', r1, r2)
+    assert list(j.k) == [2, 3]
+    assert list(j.x1) == [.2, .3]
+    assert list(j.x2) == [20., 30.]
+    j = mlab.rec_join('k', r1, r2, jointype='outer', defaults={'x2': -1.})
+    assert list(j.k) == [1, 2, 3, 4]
+    assert list(j.a[:3]) == ['y', 'z', 'x']
+    assert list(j.x2) == [-1., 20., 30., 40.]
+
+def test_rec_join_duplicate_keys():
+    # as before the keys were sorted, the last row of each key is used
+    r1 = np.rec.fromarrays([[1, 2, 2, 5], [10, 20, 21, 50]], names='k,x')
+    r2 = np.rec.fromarrays([[2, 3, 3, 1], [200, 300, 301, 100]], names='k,y')
+    expected = {'inner': [(1, 10, 100), (2, 21, 200)],
+                'leftouter': [(1, 10, 100), (2, 21, 200), (5, 50, -2)],
+                'outer': [(1, 10, 100), (2, 21, 200), (3, -1, 301),
+                          (5, 50, -2)]}
+    for jointype, rows in expected.items():
+        j = mlab.rec_join('k', r1, r2, jointype=jointype,
+                          defaults={'x': -1, 'y': -2})
+        assert j.tolist() == rows
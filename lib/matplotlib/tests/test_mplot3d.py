@@ -0,0 +1,75 @@
+import numpy as np
+from numpy.testing import assert_array_equal, assert_almost_equal
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from mpl_toolkits.mplot3d import Axes3D, art3d, proj3d
+
+def test_poly3d_depth_sort():
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = Axes3D(fig)
+    verts = [[(0, 0, 0), (1, 0, 0), (1, 1, 0)],
+             [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],
+             [(0, 0, .5), (1, 1, .5)]]
+    col = art3d.Poly3DCollection(verts, facecolors=np.eye(3))
+    ax.add_collection3d(col)
+    canvas.draw()
+
+    M = ax.get_proj()
+    depths = []
+    for poly in verts:
+        xs, ys, zs = np.transpose(poly)
+        depths.append(np.mean(proj3d.proj_transform(xs, ys, zs, M)[2]))
+    order = np.argsort(depths)[::-1]
+
+    paths = col.get_paths()
+    assert [len(verts[i]) + 1 for i in order] == [len(p) for p in paths]
+    for i, path in zip(order, paths):
+        xs, ys, zs = np.transpose(verts[i])
+        txs, tys, tzs = proj3d.proj_transform(xs, ys, zs, M)
+        assert_almost_equal(path.vertices[:-1], np.transpose([txs, tys]))
+    assert_array_equal(col.get_facecolors()[:, :3],
+                       np.eye(3)[order])
+
+def test_surface_polygons():
+    fig = Figure()
+    ax = Axes3D(fig)
+    X, Y = np.meshgrid(np.arange(5.), np.arange(4.))
+    Z = X + 10*Y
+    col = ax.plot_surface(X, Y, Z, rstride=2, cstride=3)
+    # patches of 3x4 and 3x2 points on the first row, 2x4 and 2x2 on
+    # the second; each boundary repeats its first point at the end
+    assert_array_equal(np.diff(col._starts), [11, 7, 9, 5])
+    first = col._vec[:3, :11].T
+    assert_array_equal(first[:, 2], [0, 1, 2, 3, 13, 23, 22, 21, 20, 10, 0])
+
+def test_projection_batch():
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = Axes3D(fig)
+    line, = ax.plot([0, 1, 2], [1, 0, 1], [0, 1, 0])
+    X, Y = np.meshgrid(np.arange(3.), np.arange(3.))
+    segs = ax.plot_wireframe(X, Y, np.ones((3, 3)))
+    canvas.draw()
+
+    M = ax.get_proj()
+    xs, ys, zs = proj3d.proj_transform(np.array([0, 1, 2]),
+                                       np.array([1, 0, 1]),
+                                       np.array([0, 1, 0]), M)
+    assert_almost_equal(line.get_xdata(), xs)
+    assert_almost_equal(line.get_ydata(), ys)
+    assert_almost_equal(segs.get_paths()[0].vertices[:, 0],
+                        proj3d.proj_transform(np.arange(3.), np.zeros(3),
+                                              np.ones(3), M)[0])
+
+    # an unchanged view reuses the projected points; new data or a
+    # new view does not
+    projected = line.project3d(M)
+    canvas.draw()
+    assert line.project3d(ax.M) is projected
+    line.set_3d_properties([1, 1, 1])
+    assert line.project3d(ax.M) is not projected
+    projected = segs.project3d(ax.M)
+    ax.view_init(10, 20)
+    canvas.draw()
+    assert segs.project3d(ax.M) is not projected
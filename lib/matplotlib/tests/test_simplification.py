@@ -221,6 +221,60 @@ def test_para_equal_perp():
     ax.plot(x + 1, y + 1, 'ro')
     fig.savefig('para_equal_perp')
 
+def test_convert_to_string():
+    from matplotlib._path import convert_to_string
+    from matplotlib.mlab import quad2cubic
+
+    def fmt(val, precision):
+        s = '%.*f' % (precision, val)
+        if '.' in s:
+            s = s.rstrip('0').rstrip('.')
+        return s != '-0' and s or '0'
+
+    np.random.seed(0)
+    verts = np.random.uniform(-100, 100, (40, 2))
+    verts[7] = np.nan
+    codes = np.array([Path.MOVETO] + [Path.LINETO] * 9 +
+                     [Path.CURVE3] * 6 + [Path.CURVE4] * 9 +
+                     [Path.CLOSEPOLY] + [Path.MOVETO] + [Path.LINETO] * 13,
+                     np.uint8)
+    path = Path(verts, codes)
+    trans = transforms.Affine2D().rotate_deg(30).scale(1.5)
+    ops = ('m', 'l', '', 'c', 'cl')
+
+    # the same as formatting the segments one at a time
+    for precision in (0, 3, 6):
+        expected = []
+        last = None
+        for points, code in path.iter_segments(trans):
+            if code == Path.CLOSEPOLY:
+                expected.append('cl')
+            else:
+                op = ops[code - 1]
+                if code == Path.CURVE3:
+                    points = quad2cubic(*(list(last[-2:]) + list(points)))[2:]
+                    op = 'c'
+                expected.append(' '.join([fmt(val, precision)
+                                          for val in points] + [op]))
+            last = points
+        assert convert_to_string(path, trans, None, None, precision,
+                                 ops, True) == '\n'.join(expected)
+
+    path = Path([[0, 0], [1.5, -2], [3, 1], [1, 2], [0, 0]],
+                [Path.MOVETO, Path.LINETO, Path.CURVE3, Path.CURVE3,
+                 Path.CLOSEPOLY])
+    assert (convert_to_string(path, None, None, False, 2,
+                              ('M', 'L', 'Q', 'C', 'z'), False) ==
+            'M0 0L1.5 -2Q3 1 1 2z')
+    # clipped as by iter_segments
+    path = Path([[-100, 0], [400, 0]])
+    clip = (0, -1, 200, 1)
+    expected = ''.join(['%s%s %s' % ('.ML'[code], fmt(x, 2), fmt(y, 2))
+                        for (x, y), code in path.iter_segments(clip=clip)])
+    assert expected != 'M-100 0L400 0'
+    assert (convert_to_string(path, None, clip, False, 2,
+                              ('M', 'L', 'Q', 'C', 'z'), False) == expected)
+
 if __name__=='__main__':
     import nose
     nose.runmodule(argv=['-s','--with-doctest'], exit=False)
@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+
+from matplotlib.texmanager import TexManager
+
+def test_run_jobs():
+    texmanager = TexManager()
+    results = {}
+    workdirs = []
+
+    def job(i, status):
+        workdir = tempfile.mkdtemp(dir=texmanager.texcache)
+        workdirs.append(workdir)
+        code = ('import sys; open("out", "w").write("%d"); '
+                'sys.stdout.write("job %d"); sys.exit(%d)' % (i, i, status))
+
+        def finish(exit_status, report):
+            if exit_status:
+                raise RuntimeError('job %d failed' % i)
+            fh = open(os.path.join(workdir, 'out'))
+            results[i] = fh.read(), report
+            fh.close()
+        return [sys.executable, '-c', code], workdir, finish
+
+    texmanager._run_jobs([job(i, 0) for i in range(6)], numjobs=3)
+    assert results == dict([(i, (str(i), 'job %d' % i)) for i in range(6)])
+
+    # the other jobs still run when one fails, and the error is raised
+    # once they are done
+    results.clear()
+    try:
+        texmanager._run_jobs([job(0, 0), job(1, 1), job(2, 0)], numjobs=2)
+    except RuntimeError, err:
+        assert str(err) == 'job 1 failed'
+    else:
+        assert False, 'the failed job was not reported'
+    assert sorted(results) == [0, 2]
+
+    # the working directories are removed
+    assert not [d for d in workdirs if os.path.exists(d)]
+
+def test_png_job_latex_failure():
+    texmanager = TexManager()
+    def make_dvi(tex, fontsize):
+        raise RuntimeError('LaTeX failed')
+    texmanager.make_dvi = make_dvi
+    before = set(os.listdir(texmanager.texcache))
+    try:
+        texmanager._make_png_job('$x$', 12, 100)
+    except RuntimeError:
+        pass
+    else:
+        assert False, 'the LaTeX failure was not reported'
+    # no working directory is left in the cache
+    assert set(os.listdir(texmanager.texcache)) == before
+
+def test_prepare_tex():
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(211)
+    ax.set_title('shown_title')
+    ax.set_xticks([0, 0.5, 2])
+    ax.set_xlim(0, 1)
+    ax.set_xticklabels(['zero', 'half', 'two'])
+    ax.set_yticks([])
+    ax.plot([0, 1], label='shown_label')
+    ax.legend()
+    hidden = fig.add_subplot(212)
+    hidden.set_title('hidden_title')
+    hidden.set_visible(False)
+    ax.plot([1, 0], label='leg_label')
+    legend = fig.legend(ax.get_lines()[1:], ['leg_label'])
+    legend.set_visible(False)
+
+    class Renderer:
+        def prepare_tex(self, items):
+            self.items = items
+    renderer = Renderer()
+    fig._prepare_tex(renderer)
+    strings = set([s for s, size in renderer.items])
+    for s in ('shown_title', 'shown_label', 'zero', 'half'):
+        assert s in strings
+    # hidden artists, ticks outside the view and the empty legend title
+    for s in ('hidden_title', 'leg_label', 'two', 'None'):
+        assert s not in strings
+
+    # errors are left to be reported when the strings are drawn
+    def fail(items):
+        raise RuntimeError('LaTeX was not able to process the string')
+    renderer.prepare_tex = fail
+    fig._prepare_tex(renderer)
@@ -0,0 +1,113 @@
+import struct
+from cStringIO import StringIO
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.tiff import packbits, write_tiff
+
+def unpackbits(data):
+    out = []
+    i = 0
+    while i < len(data):
+        n = ord(data[i])
+        if n < 128:
+            out.append(data[i+1:i+n+2])
+            i += n + 2
+        else:
+            out.append(data[i+1] * (257 - n))
+            i += 2
+    return ''.join(out)
+
+def test_packbits():
+    # the example from Apple's TN1023
+    data = np.array([0xAA, 0xAA, 0xAA, 0x80, 0x00, 0x2A, 0xAA, 0xAA,
+                     0xAA, 0xAA, 0x80, 0x00, 0x2A, 0x22, 0xAA, 0xAA,
+                     0xAA, 0xAA, 0xAA, 0xAA, 0xAA, 0xAA, 0xAA, 0xAA],
+                    np.uint8)
+    expected = [0xFE, 0xAA, 0x02, 0x80, 0x00, 0x2A, 0xFD, 0xAA,
+                0x03, 0x80, 0x00, 0x2A, 0x22, 0xF7, 0xAA]
+    assert packbits(data, len(data)) == ''.join(map(chr, expected))
+
+    # long runs and literals are split into 128 byte packets, and no
+    # packet crosses the end of a row
+    data = np.concatenate([np.zeros(300, np.uint8),
+                           np.arange(300) % 7,
+                           [1, 1, 2]]).astype(np.uint8)
+    for rowlen in (len(data), 101, 3, 1):
+        packed = packbits(data, rowlen)
+        rows = [packbits(data[i:i+rowlen], rowlen)
+                for i in range(0, len(data), rowlen)]
+        assert packed == ''.join(rows)
+        assert unpackbits(packed) == data.tostring()
+
+def read_tiff(data):
+    assert data[:4] == 'II*\0'
+    offset, = struct.unpack('<I', data[4:8])
+    count, = struct.unpack('<H', data[offset:offset+2])
+    tags = {}
+    for i in range(count):
+        entry = data[offset+2+12*i:offset+14+12*i]
+        tag, type, n, value = struct.unpack('<HHII', entry)
+        tags[tag] = (n, value)
+    width, height = tags[256][1], tags[257][1]
+    nstrips, offsets = tags[273]
+    counts = tags[279][1]
+    if nstrips > 1:
+        offsets = struct.unpack('<%dI' % nstrips,
+                                data[offsets:offsets + 4*nstrips])
+        counts = struct.unpack('<%dI' % nstrips,
+                               data[counts:counts + 4*nstrips])
+    else:
+        offsets, counts = [offsets], [counts]
+    strips = [data[o:o+c] for o, c in zip(offsets, counts)]
+    if tags[259][1] == 32773:
+        strips = map(unpackbits, strips)
+    return width, height, ''.join(strips)
+
+def test_write_tiff():
+    rgba = np.zeros((30, 20, 4), np.uint8)
+    rgba[..., 3] = 255
+    rgba[5:25, 3:9, 0] = 200
+    rgba[10:12] = np.arange(160).reshape((2, 20, 4))
+    for compression in ('none', 'packbits'):
+        for rows_per_strip in (None, 1, 7, 100):
+            buf = StringIO()
+            write_tiff(rgba, 20, 30, buf, dpi=72, compression=compression,
+                       rows_per_strip=rows_per_strip)
+            assert read_tiff(buf.getvalue()) == (20, 30, rgba.tostring())
+
+def test_write_tiff_streams():
+    class Unseekable(object):
+        def __init__(self):
+            self.chunks = []
+        def write(self, data):
+            self.chunks.append(str(data))
+    rgba = np.arange(7 * 5 * 4).reshape((7, 5, 4)).astype(np.uint8)
+    for compression in ('none', 'packbits'):
+        # the strips are written first, and the directory, written last,
+        # is found through the patched header, relative to the start of
+        # the image
+        buf = StringIO()
+        buf.write('junk')
+        write_tiff(rgba, 5, 7, buf, compression=compression,
+                   rows_per_strip=3)
+        data = buf.getvalue()[4:]
+        assert struct.unpack('<I', data[4:8])[0] > 8
+        assert read_tiff(data) == (5, 7, rgba.tostring())
+        assert buf.tell() == len(buf.getvalue())
+
+        out = Unseekable()
+        write_tiff(rgba, 5, 7, out, compression=compression,
+                   rows_per_strip=3)
+        assert read_tiff(''.join(out.chunks)) == (5, 7, rgba.tostring())
+
+def test_print_tif():
+    fig = Figure(figsize=(2, 1), dpi=50)
+    canvas = FigureCanvasAgg(fig)
+    fig.add_subplot(111).plot([1, 3, 2])
+    buf = StringIO()
+    canvas.print_figure(buf, format='tif', dpi=50)
+    width, height, data = read_tiff(buf.getvalue())
+    assert (width, height) == (100, 50)
+    assert len(data) == 100 * 50 * 4
@@ -0,0 +1,36 @@
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+import matplotlib.axes
+import matplotlib.tri as mtri
+
+def test_trifinder():
+    # a 3x3 grid of points split into 8 triangles, some of them clockwise
+    x, y = np.meshgrid(np.arange(3.), np.arange(3.))
+    triangles = [[0, 1, 4], [0, 4, 3], [1, 2, 5], [1, 5, 4],
+                 [3, 4, 7], [3, 7, 6], [4, 8, 5], [4, 7, 8]]
+    triang = mtri.Triangulation(x.ravel(), y.ravel(), triangles)
+    trifinder = triang.get_trifinder()
+    xs = [0.6, 0.2, 1.9, 1.1, 0.6, 0.5, 1.8, 1.4, -0.1, 2.5, 1.0]
+    ys = [0.2, 0.9, 0.5, 0.8, 1.3, 1.9, 1.1, 1.6, 0.5, 1.0, 3.0]
+    assert_array_equal(trifinder(xs, ys), [0, 1, 2, 3, 4, 5, 6, 7, -1, -1, -1])
+    # points on edges and corners are found too
+    assert (trifinder([0, 1, 2, 0.5, 2], [0, 1, 2, 0.5, 1]) >= 0).all()
+
+    triang.set_mask([False, True] + [False]*6)
+    trifinder = triang.get_trifinder()
+    found = trifinder(np.array([[0.6, 0.2]]), np.array([[0.2, 0.9]]))
+    assert_array_equal(found, [[0, -1]])
+
+def test_linear_interpolator():
+    np.random.seed(0)
+    x, y = np.random.rand(200), np.random.rand(200)
+    triang = mtri.Triangulation(x, y)
+    interp = mtri.LinearTriInterpolator(triang, 3*x - 2*y + 1)
+    xi, yi = np.meshgrid(np.linspace(-0.1, 1.1, 30),
+                         np.linspace(-0.1, 1.1, 20))
+    zi = interp(xi, yi)
+    assert zi.shape == (20, 30)
+    found = triang.get_trifinder()(xi, yi) >= 0
+    assert_array_equal(zi.mask, ~found)
+    assert_array_almost_equal(zi.compressed(), (3*xi - 2*yi + 1)[found])
+    assert zi.mask[0, 0] and zi.mask[-1, -1]
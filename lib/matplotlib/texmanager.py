@@ -33,7 +33,7 @@ or include these two lines in your script::
 
 """
 
-import copy, glob, os, shutil, sys, warnings
+import copy, os, shutil, sys, tempfile, warnings
 from subprocess import Popen, PIPE, STDOUT
 
 try:
@@ -91,6 +91,9 @@ WARNING: found a TeX cache dir in the deprecated location "%s".
     if not os.path.exists(texcache):
         os.mkdir(texcache)
 
+    # the number of LaTeX or dvipng processes run at the same time
+    numjobs = 4
+
     _dvipng_hack_alpha = None
     #_dvipng_hack_alpha = dvipng_hack_alpha()
     # mappable cache of
@@ -208,27 +211,11 @@ WARNING: found a TeX cache dir in the deprecated location "%s".
         """returns a string containing user additions to the tex preamble"""
         return '\n'.join(rcParams['text.latex.preamble'])
 
-    def _get_shell_cmd(self, *args):
-        """
-        On windows, changing directories can be complicated by the presence of
-        multiple drives. get_shell_cmd deals with this issue.
+    def _get_tex_source(self, tex, fontsize):
         """
-        if sys.platform == 'win32':
-            command = ['%s'% os.path.splitdrive(self.texcache)[0]]
-        else:
-            command = []
-        command.extend(args)
-        return ' && '.join(command)
-
-    def make_tex(self, tex, fontsize):
+        Return the source of a LaTeX document rendering the tex string
+        at a specific font size
         """
-        Generate a tex file to render the tex string at a specific font size
-
-        returns the file name
-        """
-        basefile = self.get_basefile(tex, fontsize)
-        texfile = '%s.tex'%basefile
-        fh = file(texfile, 'w')
         custom_preamble = self.get_custom_preamble()
         fontcmd = {'sans-serif' : r'{\sffamily %s}',
                    'monospace'  : r'{\ttfamily %s}'}.get(self.font_family,
@@ -241,7 +228,7 @@ WARNING: found a TeX cache dir in the deprecated location "%s".
         else:
             unicode_preamble = ''
 
-        s = r"""\documentclass{article}
+        return r"""\documentclass{article}
 %s
 %s
 %s
@@ -252,35 +239,43 @@ WARNING: found a TeX cache dir in the deprecated location "%s".
 \end{document}
 """ % (self._font_preamble, unicode_preamble, custom_preamble,
        fontsize, fontsize*1.25, tex)
-        if rcParams['text.latex.unicode']:
-            fh.write(s.encode('utf8'))
-        else:
-            try:
-                fh.write(s)
-            except UnicodeEncodeError, err:
-                mpl.verbose.report("You are using unicode and latex, but have "
-                            "not enabled the matplotlib 'text.latex.unicode' "
-                            "rcParam.", 'helpful')
-                raise
 
-        fh.close()
+    def _write_tex(self, texfile, s):
+        fh = file(texfile, 'w')
+        try:
+            if rcParams['text.latex.unicode']:
+                fh.write(s.encode('utf8'))
+            else:
+                try:
+                    fh.write(s)
+                except UnicodeEncodeError, err:
+                    mpl.verbose.report("You are using unicode and latex, but "
+                                "have not enabled the matplotlib "
+                                "'text.latex.unicode' rcParam.", 'helpful')
+                    raise
+        finally:
+            fh.close()
+
+    def make_tex(self, tex, fontsize):
+        """
+        Generate a tex file to render the tex string at a specific font size
 
+        returns the file name
+        """
+        basefile = self.get_basefile(tex, fontsize)
+        texfile = '%s.tex'%basefile
+        self._write_tex(texfile, self._get_tex_source(tex, fontsize))
         return texfile
 
 
     _re_vbox = re.compile(r"MatplotlibBox:\(([\d.]+)pt\+([\d.]+)pt\)x([\d.]+)pt")
 
-    def make_tex_preview(self, tex, fontsize):
+    def _get_tex_preview_source(self, tex, fontsize):
         """
-        Generate a tex file to render the tex string at a specific
-        font size.  It uses the preview.sty to determin the dimension
-        (width, height, descent) of the output.
-
-        returns the file name
+        Return the source of a LaTeX document rendering the tex string
+        at a specific font size, which uses the preview.sty to report
+        the dimension (width, height, descent) of the output.
         """
-        basefile = self.get_basefile(tex, fontsize)
-        texfile = '%s.tex'%basefile
-        fh = file(texfile, 'w')
         custom_preamble = self.get_custom_preamble()
         fontcmd = {'sans-serif' : r'{\sffamily %s}',
                    'monospace'  : r'{\ttfamily %s}'}.get(self.font_family,
@@ -299,7 +294,7 @@ WARNING: found a TeX cache dir in the deprecated location "%s".
         # extent of the rendered text.
 
 
-        s = r"""\documentclass{article}
+        return r"""\documentclass{article}
 %s
 %s
 %s
@@ -317,21 +312,142 @@ WARNING: found a TeX cache dir in the deprecated location "%s".
 \end{document}
 """ % (self._font_preamble, unicode_preamble, custom_preamble,
        fontsize, fontsize*1.25, tex)
-        if rcParams['text.latex.unicode']:
-            fh.write(s.encode('utf8'))
-        else:
+
+    def make_tex_preview(self, tex, fontsize):
+        """
+        Generate a tex file to render the tex string at a specific
+        font size.  It uses the preview.sty to determin the dimension
+        (width, height, descent) of the output.
+
+        returns the file name
+        """
+        basefile = self.get_basefile(tex, fontsize)
+        texfile = '%s.tex'%basefile
+        self._write_tex(texfile, self._get_tex_preview_source(tex, fontsize))
+        return texfile
+
+    def _run_jobs(self, jobs, numjobs=None):
+        """
+        Run the commands of *jobs*, up to *numjobs* (default
+        :attr:`numjobs`) of them at the same time.
+
+        Each job is a (command, workdir, finish) tuple.  The argument
+        list *command* is run in the private directory *workdir*, with
+        its output written to a file there; when it exits,
+        finish(exit_status, report) is called with its exit status and
+        output, and *workdir* is removed.  The first error raised by a
+        *finish* is raised again once all the jobs are done.
+        """
+        if numjobs is None:
+            numjobs = self.numjobs
+        pending = list(jobs)
+        running = []
+        error = None
+        while pending or running:
+            while pending and len(running) < max(numjobs, 1):
+                command, workdir, finish = pending.pop(0)
+                mpl.verbose.report(' '.join(command), 'debug')
+                outfile = os.path.join(workdir, 'output')
+                fh = file(outfile, 'w')
+                try:
+                    try:
+                        pipe = Popen(command, cwd=workdir, stdout=fh,
+                                     stderr=STDOUT)
+                    except OSError, err:
+                        fh.write('Could not run %s: %s' % (command[0], err))
+                        pipe = None
+                finally:
+                    fh.close()
+                running.append((pipe, outfile, workdir, finish))
+
+            pipe, outfile, workdir, finish = running.pop(0)
             try:
-                fh.write(s)
-            except UnicodeEncodeError, err:
-                mpl.verbose.report("You are using unicode and latex, but have "
-                            "not enabled the matplotlib 'text.latex.unicode' "
-                            "rcParam.", 'helpful')
+                if pipe is None:
+                    exit_status = 1
+                else:
+                    exit_status = pipe.wait()
+                fh = file(outfile)
+                report = fh.read()
+                fh.close()
+                finish(exit_status, report)
+            except Exception, err:
+                if error is None:
+                    error = err
+            shutil.rmtree(workdir, True)
+        if error is not None:
+            raise error
+
+    def _install(self, fname, basefile):
+        """
+        Move the file *fname* made in a private working directory to
+        the cache, with the extension of *fname* added to *basefile*.
+        The move is a rename, which other processes using the cache
+        see happen all at once.
+        """
+        dest = basefile + os.path.splitext(fname)[1]
+        try:
+            os.rename(fname, dest)
+        except OSError:
+            # win32 does not rename over a file, which here would have
+            # been made by another process in the meantime
+            if not os.path.exists(dest):
                 raise
+        return dest
 
-        fh.close()
+    def _make_dvi_job(self, tex, fontsize, preview):
+        basefile = self.get_basefile(tex, fontsize)
+        name = os.path.basename(basefile)
+        workdir = tempfile.mkdtemp(dir=self.texcache)
+        texfile = os.path.join(workdir, name + '.tex')
+        if preview:
+            self._write_tex(texfile,
+                            self._get_tex_preview_source(tex, fontsize))
+        else:
+            self._write_tex(texfile, self._get_tex_source(tex, fontsize))
 
-        return texfile
+        def finish(exit_status, report):
+            dvifile = os.path.join(workdir, name + '.dvi')
+            if exit_status or not os.path.exists(dvifile):
+                raise RuntimeError(('LaTeX was not able to process the following \
+string:\n%s\nHere is the full report generated by LaTeX: \n\n'% repr(tex)) + report)
+            else: mpl.verbose.report(report, 'debug')
+            self._install(texfile, basefile)
+            self._install(dvifile, basefile)
+            if preview:
+                # find the box extent information in the latex output
+                # file and store them in ".baseline" file
+                m = TexManager._re_vbox.search(report)
+                baselinefile = os.path.join(workdir, name + '.baseline')
+                open(baselinefile, "w").write(" ".join(m.groups()))
+                self._install(baselinefile, basefile)
+
+        command = ['latex', '-interaction=nonstopmode', name + '.tex']
+        return command, workdir, finish
+
+    def _make_dvis(self, items, preview, numjobs=None):
+        jobs = []
+        seen = set()
+        for tex, fontsize in items:
+            basefile = self.get_basefile(tex, fontsize)
+            if basefile in seen:
+                continue
+            seen.add(basefile)
+            if (DEBUG or not os.path.exists(basefile + '.dvi') or
+                (preview and not os.path.exists(basefile + '.baseline'))):
+                jobs.append(self._make_dvi_job(tex, fontsize, preview))
+        self._run_jobs(jobs, numjobs)
+
+    def make_dvis(self, items, numjobs=None):
+        """
+        generates the dvi files of all the (tex, fontsize) pairs in
+        *items* that are not cached yet, running up to *numjobs*
+        (default :attr:`numjobs`) LaTeX processes at the same time
 
+        Each string is compiled in a private directory and its files
+        moved to the cache when done, so that several processes can
+        share the cache.
+        """
+        self._make_dvis(items, rcParams['text.latex.preview'], numjobs)
 
     def make_dvi(self, tex, fontsize):
         """
@@ -339,45 +455,11 @@ WARNING: found a TeX cache dir in the deprecated location "%s".
 
         returns the file name
         """
-
-
         if rcParams['text.latex.preview']:
             return self.make_dvi_preview(tex, fontsize)
 
-        basefile = self.get_basefile(tex, fontsize)
-        dvifile = '%s.dvi'% basefile
-
-        if DEBUG or not os.path.exists(dvifile):
-            texfile = self.make_tex(tex, fontsize)
-            outfile = basefile+'.output'
-            command = self._get_shell_cmd('cd "%s"'% self.texcache,
-                            'latex -interaction=nonstopmode %s > "%s"'\
-                            %(os.path.split(texfile)[-1], outfile))
-            mpl.verbose.report(command, 'debug')
-            exit_status = os.system(command)
-            try:
-                fh = file(outfile)
-                report = fh.read()
-                fh.close()
-            except IOError:
-                report = 'No latex error report available.'
-            try:
-                os.stat(dvifile)
-                exists = True
-            except OSError:
-                exists = False
-            if exit_status or not exists:
-                raise RuntimeError(('LaTeX was not able to process the following \
-string:\n%s\nHere is the full report generated by LaTeX: \n\n'% repr(tex)) + report)
-            else: mpl.verbose.report(report, 'debug')
-            for fname in glob.glob(basefile+'*'):
-                if fname.endswith('dvi'): pass
-                elif fname.endswith('tex'): pass
-                else:
-                    try: os.remove(fname)
-                    except OSError: pass
-
-        return dvifile
+        self._make_dvis([(tex, fontsize)], False)
+        return '%s.dvi'% self.get_basefile(tex, fontsize)
 
 
     def make_dvi_preview(self, tex, fontsize):
@@ -388,80 +470,56 @@ string:\n%s\nHere is the full report generated by LaTeX: \n\n'% repr(tex)) + rep
 
         returns the file name
         """
-        basefile = self.get_basefile(tex, fontsize)
-        dvifile = '%s.dvi'% basefile
-        baselinefile = '%s.baseline'% basefile
-
-        if DEBUG or not os.path.exists(dvifile) or \
-               not os.path.exists(baselinefile):
-            texfile = self.make_tex_preview(tex, fontsize)
-            outfile = basefile+'.output'
-            command = self._get_shell_cmd('cd "%s"'% self.texcache,
-                            'latex -interaction=nonstopmode %s > "%s"'\
-                            %(os.path.split(texfile)[-1], outfile))
-            mpl.verbose.report(command, 'debug')
-            exit_status = os.system(command)
-            try:
-                fh = file(outfile)
-                report = fh.read()
-                fh.close()
+        self._make_dvis([(tex, fontsize)], True)
+        return '%s.dvi'% self.get_basefile(tex, fontsize)
 
-            except IOError:
-                report = 'No latex error report available.'
-            if exit_status:
-                raise RuntimeError(('LaTeX was not able to process the following \
-string:\n%s\nHere is the full report generated by LaTeX: \n\n'% repr(tex)) + report)
-            else: mpl.verbose.report(report, 'debug')
-
-            # find the box extent information in the latex output
-            # file and store them in ".baseline" file
-            m = TexManager._re_vbox.search(report)
-            open(basefile+'.baseline',"w").write(" ".join(m.groups()))
-
-            for fname in glob.glob(basefile+'*'):
-                if fname.endswith('dvi'): pass
-                elif fname.endswith('tex'): pass
-                elif fname.endswith('baseline'): pass
-                else:
-                    try: os.remove(fname)
-                    except OSError: pass
-
-        return dvifile
-
-    def make_png(self, tex, fontsize, dpi):
+    def make_pngs(self, items, dpi, numjobs=None):
         """
-        generates a png file containing latex's rendering of tex string
-
-        returns the filename
+        generates the png files of all the (tex, fontsize) pairs in
+        *items* that are not cached yet, at *dpi*, running up to
+        *numjobs* (default :attr:`numjobs`) LaTeX or dvipng processes
+        at the same time
         """
+        self.make_dvis(items, numjobs)
+        jobs = []
+        seen = set()
+        for tex, fontsize in items:
+            basefile = self.get_basefile(tex, fontsize, dpi)
+            if basefile in seen:
+                continue
+            seen.add(basefile)
+            if DEBUG or not os.path.exists(basefile + '.png'):
+                jobs.append(self._make_png_job(tex, fontsize, dpi))
+        self._run_jobs(jobs, numjobs)
+
+    def _make_png_job(self, tex, fontsize, dpi):
         basefile = self.get_basefile(tex, fontsize, dpi)
-        pngfile = '%s.png'% basefile
+        name = os.path.basename(basefile)
+        # make_dvi raises if LaTeX fails; do not leave workdir behind
+        dvifile = self.make_dvi(tex, fontsize)
+        workdir = tempfile.mkdtemp(dir=self.texcache)
 
-        # see get_rgba for a discussion of the background
-        if DEBUG or not os.path.exists(pngfile):
-            dvifile = self.make_dvi(tex, fontsize)
-            outfile = basefile+'.output'
-            command = self._get_shell_cmd('cd "%s"' % self.texcache,
-                        'dvipng -bg Transparent -D %s -T tight -o \
-                        "%s" "%s" > "%s"'%(dpi, os.path.split(pngfile)[-1],
-                        os.path.split(dvifile)[-1], outfile))
-            mpl.verbose.report(command, 'debug')
-            exit_status = os.system(command)
-            try:
-                fh = file(outfile)
-                report = fh.read()
-                fh.close()
-            except IOError:
-                report = 'No dvipng error report available.'
+        def finish(exit_status, report):
             if exit_status:
                 raise RuntimeError('dvipng was not able to \
 process the following file:\n%s\nHere is the full report generated by dvipng: \
 \n\n'% dvifile + report)
             else: mpl.verbose.report(report, 'debug')
-            try: os.remove(outfile)
-            except OSError: pass
+            self._install(os.path.join(workdir, name + '.png'), basefile)
 
-        return pngfile
+        # see get_rgba for a discussion of the background
+        command = ['dvipng', '-bg', 'Transparent', '-D', '%s' % dpi,
+                   '-T', 'tight', '-o', name + '.png', dvifile]
+        return command, workdir, finish
+
+    def make_png(self, tex, fontsize, dpi):
+        """
+        generates a png file containing latex's rendering of tex string
+
+        returns the filename
+        """
+        self.make_pngs([(tex, fontsize)], dpi)
+        return '%s.png'% self.get_basefile(tex, fontsize, dpi)
 
     def make_ps(self, tex, fontsize):
         """
@@ -474,21 +532,19 @@ process the following file:\n%s\nHere is the full report generated by dvipng: \
 
         if DEBUG or not os.path.exists(psfile):
             dvifile = self.make_dvi(tex, fontsize)
-            outfile = basefile+'.output'
-            command = self._get_shell_cmd('cd "%s"'% self.texcache,
-                        'dvips -q -E -o "%s" "%s" > "%s"'\
-                        %(os.path.split(psfile)[-1],
-                          os.path.split(dvifile)[-1], outfile))
-            mpl.verbose.report(command, 'debug')
-            exit_status = os.system(command)
-            fh = file(outfile)
-            if exit_status:
-                raise RuntimeError('dvipng was not able to \
-process the flowing file:\n%s\nHere is the full report generated by dvipng: \
-\n\n'% dvifile + fh.read())
-            else: mpl.verbose.report(fh.read(), 'debug')
-            fh.close()
-            os.remove(outfile)
+            name = os.path.basename(basefile)
+            workdir = tempfile.mkdtemp(dir=self.texcache)
+
+            def finish(exit_status, report):
+                if exit_status:
+                    raise RuntimeError('dvips was not able to \
+process the following file:\n%s\nHere is the full report generated by dvips: \
+\n\n'% dvifile + report)
+                else: mpl.verbose.report(report, 'debug')
+                self._install(os.path.join(workdir, name + '.epsf'), basefile)
+
+            command = ['dvips', '-q', '-E', '-o', name + '.epsf', dvifile]
+            self._run_jobs([(command, workdir, finish)])
 
         return psfile
 
@@ -604,8 +660,6 @@ process the flowing file:\n%s\nHere is the full report generated by dvipng: \
         else:
             # use dviread. It sometimes returns a wrong descent.
             dvifile = self.make_dvi(tex, fontsize)
-            dvi = dviread.Dvi(dvifile, 72*dpi_fraction)
-            page = iter(dvi).next()
-            dvi.close()
+            page = dviread.first_page(dvifile, 72*dpi_fraction)
             # A total height (including the descent) needs to be returned.
             return page.width, page.height+page.descent, page.descent
@@ -279,17 +279,17 @@ class TextToPath(object):
         texmanager = self.get_texmanager()
 
         if self.tex_font_map is None:
-            self.tex_font_map = dviread.PsfontsMap(dviread.find_tex_file('pdftex.map'))
+            self.tex_font_map = dviread.get_psfonts_map('pdftex.map')
 
         fontsize = prop.get_size_in_points()
         if hasattr(texmanager, "get_dvi"): #
             dvifilelike = texmanager.get_dvi(s, self.FONT_SCALE)
             dvi = dviread.DviFromFileLike(dvifilelike, self.DPI)
+            page = iter(dvi).next()
+            dvi.close()
         else:
             dvifile = texmanager.make_dvi(s, self.FONT_SCALE)
-            dvi = dviread.Dvi(dvifile, self.DPI)
-        page = iter(dvi).next()
-        dvi.close()
+            page = dviread.first_page(dvifile, self.DPI)
 
 
         if glyph_map is None:
@@ -0,0 +1,219 @@
+"""
+A minimal writer for baseline TIFF files, used to save Agg renderings
+without a round trip through PIL.
+
+The pixel data is taken from anything that exposes the buffer
+interface (the :class:`~matplotlib.backends.backend_agg.RendererAgg`
+buffer, a numpy array, a string...).  Uncompressed strips are written
+to the output straight from that buffer, and compressed ones as soon
+as they are encoded, with the image directory at the end of the file,
+so only one strip is held in memory at a time.  The strips are only
+gathered first when the file object cannot seek.
+
+Usage::
+
+   >>> buf, (width, height) = canvas.print_to_buffer()
+   >>> write_tiff(buf, width, height, file('out.tif', 'wb'),
+   ...            dpi=72, compression='packbits')
+
+Sources:
+
+* TIFF Revision 6.0, Adobe Developers Association, 1992.
+
+* Apple Technical Note TN1023, Understanding PackBits.
+"""
+
+import struct
+
+import numpy as np
+
+# tag numbers and field types used below
+_SHORT, _LONG, _RATIONAL = 3, 4, 5
+_field_codes = {_SHORT: 'H', _LONG: 'I', _RATIONAL: 'I'}
+
+compressions = {'none'     : 1,
+                'packbits' : 32773,
+                }
+
+def packbits(data, rowlen):
+    """
+    Return the PackBits encoding of the uint8 array *data*, as a
+    string.  *data* is split into rows of *rowlen* bytes, each of which
+    is encoded independently as required by TIFF.
+
+    Runs of three or more equal bytes are stored as repeat packets, and
+    everything else is gathered into literal packets; this is the
+    encoding described in TN1023.
+    """
+    data = np.asarray(data, np.uint8).ravel()
+    n = len(data)
+    if n == 0:
+        return ''
+
+    # split the data into runs of equal bytes, breaking at row starts
+    breaks = np.empty(n, np.bool_)
+    breaks[0] = True
+    breaks[1:] = data[1:] != data[:-1]
+    breaks[::rowlen] = True
+    starts = np.flatnonzero(breaks)
+    lengths = np.diff(np.append(starts, n))
+    is_run = lengths >= 3
+
+    # merge neighboring short runs of the same row into literal groups
+    new_group = is_run.copy()
+    new_group[1:] |= is_run[:-1]
+    new_group[starts % rowlen == 0] = True
+    first = np.flatnonzero(new_group)
+    group_start = starts[first]
+    group_length = np.add.reduceat(lengths, first)
+    group_is_run = is_run[first]
+
+    # packets hold at most 128 bytes
+    npackets = (group_length + 127) // 128
+    group = np.repeat(np.arange(len(first)), npackets)
+    k = np.arange(len(group)) - np.repeat(np.cumsum(npackets) - npackets,
+                                          npackets)
+    start = group_start[group] + 128 * k
+    length = np.minimum(group_length[group] - 128 * k, 128)
+    run = group_is_run[group]
+
+    size = np.where(run, 2, length + 1)
+    offset = np.cumsum(size) - size
+    out = np.empty(size.sum(), np.uint8)
+    out[offset] = np.where(run, 257 - length, length - 1).astype(np.uint8)
+    out[offset[run] + 1] = data[start[run]]
+
+    literal = ~run
+    if literal.any():
+        start, length, offset = start[literal], length[literal], offset[literal]
+        within = np.arange(length.sum()) - np.repeat(np.cumsum(length) - length,
+                                                     length)
+        out[np.repeat(offset + 1, length) + within] = \
+            data[np.repeat(start, length) + within]
+    return out.tostring()
+
+def write_tiff(buffer, width, height, fileobj, dpi=None,
+               compression='packbits', rows_per_strip=None):
+    """
+    Write the *width* x *height* rgba image in *buffer* to the file
+    object *fileobj* as a TIFF file.
+
+    *dpi*
+        the resolution to store in the file; 72 if None.
+
+    *compression*
+        'packbits' (the default) for TIFF's run length encoding, which
+        suits the large flat areas of most figures, or 'none'.
+
+    *rows_per_strip*
+        the number of rows written in each strip; by default enough
+        rows for about 8 kilobytes of pixel data, as the TIFF
+        specification recommends.
+    """
+    if compression not in compressions:
+        raise ValueError("Unknown TIFF compression '%s'" % compression)
+    if dpi is None:
+        dpi = 72
+    rowlen = width * 4
+    pixels = np.frombuffer(buffer, np.uint8, rowlen * height)
+    if rows_per_strip is None:
+        rows_per_strip = max(8192 // max(rowlen, 1), 1)
+    rows_per_strip = min(rows_per_strip, max(height, 1))
+
+    def strips():
+        for row in range(0, height, rows_per_strip):
+            strip = pixels[row * rowlen:(row + rows_per_strip) * rowlen]
+            if compression == 'packbits':
+                yield packbits(strip, rowlen)
+            else:
+                yield np.getbuffer(strip)
+
+    resolution = (int(round(dpi * 1000)), 1000)
+    entries = [(256, _LONG, [width]),
+               (257, _LONG, [height]),
+               (258, _SHORT, [8, 8, 8, 8]),
+               (259, _SHORT, [compressions[compression]]),
+               (262, _SHORT, [2]),                     # RGB
+               (273, _LONG, None),                     # strip offsets
+               (277, _SHORT, [4]),
+               (278, _LONG, [rows_per_strip]),
+               (279, _LONG, None),                     # strip byte counts
+               (282, _RATIONAL, resolution),
+               (283, _RATIONAL, resolution),
+               (284, _SHORT, [1]),                     # interleaved
+               (296, _SHORT, [2]),                     # inch
+               (338, _SHORT, [2]),                     # unassociated alpha
+               ]
+
+    try:
+        start = fileobj.tell()
+        fileobj.seek(start)
+    except (AttributeError, IOError):
+        start = None
+
+    if start is None:
+        # The file cannot be patched, so the strips are all encoded
+        # first; the directory then follows the 8 byte header and the
+        # strips come last.
+        strips = list(strips())
+        byte_counts = [len(strip) for strip in strips]
+        size = len(_directory(entries, 8, [0] * len(strips), byte_counts))
+        strip_offsets = []
+        offset = 8 + size
+        for count in byte_counts:
+            strip_offsets.append(offset)
+            offset += count
+        fileobj.write(struct.pack('<2sHI', 'II', 42, 8))
+        fileobj.write(_directory(entries, 8, strip_offsets, byte_counts))
+        for strip in strips:
+            fileobj.write(strip)
+        return
+
+    # Each strip is written as soon as it is encoded, and the directory
+    # comes last: the header is written with a null directory offset,
+    # which is patched once the directory has been written.
+    fileobj.write(struct.pack('<2sHI', 'II', 42, 0))
+    offset = 8
+    strip_offsets, byte_counts = [], []
+    for strip in strips():
+        strip_offsets.append(offset)
+        byte_counts.append(len(strip))
+        fileobj.write(strip)
+        offset += len(strip)
+    # the directory must begin on a word boundary
+    if offset % 2:
+        fileobj.write('\0')
+        offset += 1
+    fileobj.write(_directory(entries, offset, strip_offsets, byte_counts))
+    end = fileobj.tell()
+    fileobj.seek(start + 4)
+    fileobj.write(struct.pack('<I', offset))
+    fileobj.seek(end)
+
+def _directory(entries, offset, strip_offsets, byte_counts):
+    """
+    Return the image file directory of the TIFF *entries*, to be
+    written at *offset*, followed by the values that do not fit in its
+    entries.  The entries with None values take the *strip_offsets*
+    and the strip *byte_counts*.
+    """
+    directory = [struct.pack('<H', len(entries))]
+    extra = []
+    offset += 2 + 12 * len(entries) + 4
+    for tag, type, values in entries:
+        if values is None:
+            values = strip_offsets if tag == 273 else byte_counts
+        count = len(values)
+        if type == _RATIONAL:
+            count //= 2
+        packed = struct.pack('<%d%s' % (len(values), _field_codes[type]),
+                             *values)
+        if len(packed) <= 4:
+            value = packed.ljust(4, '\0')
+        else:
+            value = struct.pack('<I', offset)
+            extra.append(packed)
+            offset += len(packed)
+        directory.append(struct.pack('<HHI', tag, type, count) + value)
+    directory.append(struct.pack('<I', 0))
+    return ''.join(directory + extra)
@@ -4,5 +4,7 @@ Unstructured triangular grid functions.
 
 from triangulation import *
 from tricontour import *
+from trifinder import *
+from triinterpolate import *
 from tripcolor import *
 from triplot import *
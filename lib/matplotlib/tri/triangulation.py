@@ -96,6 +96,9 @@ class Triangulation(object):
         # Underlying C++ object is not created until first needed.
         self._cpp_triangulation = None
 
+        # Default TriFinder not created until needed.
+        self._trifinder = None
+
     @property
     def edges(self):
         if self._edges is None:
@@ -113,6 +116,18 @@ class Triangulation(object):
                 self._neighbors)
         return self._cpp_triangulation
 
+    def get_trifinder(self):
+        """
+        Return the default :class:`matplotlib.tri.TriFinder` of this
+        triangulation, creating it if necessary.  This allows the same
+        TriFinder object to be easily shared.
+        """
+        if self._trifinder is None:
+            # Default TriFinder class.
+            from matplotlib.tri.trifinder import GridTriFinder
+            self._trifinder = GridTriFinder(self)
+        return self._trifinder
+
     def get_masked_triangles(self):
         """
         Return an array of triangles that are not masked.
@@ -193,7 +208,7 @@ class Triangulation(object):
     @property
     def neighbors(self):
         if self._neighbors is None:
-            self._neighbors = self._get_cpp_triangulation().get_neighbors()
+            self._neighbors = self.get_cpp_triangulation().get_neighbors()
         return self._neighbors
 
     def set_mask(self, mask):
@@ -217,3 +232,4 @@ class Triangulation(object):
         # Clear derived fields so they are recalculated when needed.
         self._edges = None
         self._neighbors = None
+        self._trifinder = None
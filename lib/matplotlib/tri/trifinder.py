@@ -0,0 +1,148 @@
+from matplotlib.tri.triangulation import Triangulation
+from matplotlib.mlab import _bincount
+import numpy as np
+
+class TriFinder(object):
+    """
+    Abstract base class for classes used to find the triangles of a
+    Triangulation in which (x,y) points lie.
+
+    Rather than instantiate an object of a class derived from TriFinder,
+    it is usually better to use the function
+    :func:`matplotlib.tri.Triangulation.get_trifinder`.
+
+    Derived classes implement __call__(x,y) where x,y are array_like point
+    coordinates of the same shape.
+    """
+    def __init__(self, triangulation):
+        if not isinstance(triangulation, Triangulation):
+            raise ValueError('Expected a Triangulation object')
+        self._triangulation = triangulation
+
+
+class GridTriFinder(TriFinder):
+    """
+    :class:`~matplotlib.tri.TriFinder` class that uses a uniform grid
+    of buckets over the triangulation.
+
+    Each bucket lists the unmasked triangles whose bounding box
+    overlaps it, so a point only needs to be tested against the few
+    triangles of its bucket.  The buckets are built, and the points
+    located, with whole array operations, which makes this suitable for
+    locating the points of a large image grid in a large mesh.  Any
+    triangulation can be used, Delaunay or not.
+
+    *buckets_per_triangle* sets the number of buckets relative to the
+    number of triangles; more buckets make the search faster, but
+    take longer to build and use more memory.
+    """
+    def __init__(self, triangulation, buckets_per_triangle=2.0):
+        TriFinder.__init__(self, triangulation)
+        x = triangulation.x
+        y = triangulation.y
+        self._tris = np.arange(len(triangulation.triangles))
+        if triangulation.mask is not None:
+            self._tris = self._tris.compress(~triangulation.mask)
+        triangles = triangulation.triangles[self._tris]
+        self._tx = tx = x[triangles]
+        self._ty = ty = y[triangles]
+        # the sign of the area; degenerate triangles contain no points
+        area2 = ((tx[:, 1] - tx[:, 0]) * (ty[:, 2] - ty[:, 0]) -
+                 (tx[:, 2] - tx[:, 0]) * (ty[:, 1] - ty[:, 0]))
+        self._orientation = np.sign(area2)
+        ntri = len(self._tris)
+
+        # Size the grid so that the buckets are about as wide as they
+        # are high, the domain being that of the unmasked triangles.
+        if ntri:
+            self._x0, self._y0 = tx.min(), ty.min()
+            width = tx.max() - self._x0
+            height = ty.max() - self._y0
+        else:
+            self._x0 = self._y0 = width = height = 0.
+        width = max(width, 1e-300)
+        height = max(height, 1e-300)
+        nbuckets = max(ntri * buckets_per_triangle, 1)
+        self._nx = int(min(max(np.sqrt(nbuckets * width / height), 1),
+                           nbuckets))
+        self._ny = int(min(max(nbuckets / self._nx, 1), nbuckets))
+        self._dx = width / self._nx
+        self._dy = height / self._ny
+
+        # Add each triangle to every bucket its bounding box overlaps.
+        i0, j0 = self._bucket(tx.min(axis=1), ty.min(axis=1))
+        i1, j1 = self._bucket(tx.max(axis=1), ty.max(axis=1))
+        ni = i1 - i0 + 1
+        counts = ni * (j1 - j0 + 1)
+        tri = np.repeat(np.arange(ntri), counts)
+        k = np.arange(len(tri)) - np.repeat(np.cumsum(counts) - counts, counts)
+        bucket = (j0[tri] + k // ni[tri]) * self._nx + i0[tri] + k % ni[tri]
+
+        # Sort them by bucket: the triangles of bucket b are
+        # self._bucket_tris[self._starts[b]:self._starts[b+1]].
+        order = np.argsort(bucket, kind='mergesort')
+        self._bucket_tris = tri[order]
+        self._starts = np.zeros(self._nx * self._ny + 1, np.int_)
+        np.cumsum(_bincount(bucket, minlength=self._nx * self._ny),
+                  out=self._starts[1:])
+
+    def _bucket(self, x, y):
+        i = np.floor((x - self._x0) / self._dx).astype(np.int_)
+        j = np.floor((y - self._y0) / self._dy).astype(np.int_)
+        # points on the far edges belong to the last buckets
+        return (np.clip(i, 0, self._nx - 1), np.clip(j, 0, self._ny - 1))
+
+    def __call__(self, x, y):
+        """
+        Return an array containing the indices of the triangles in which the
+        specified x,y points lie, or -1 for points that do not lie within a
+        triangle.
+
+        *x*, *y* are array_like x and y coordinates of the same shape and any
+        number of dimensions.
+
+        Returns integer array with the same shape and *x* and *y*.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if x.shape != y.shape:
+            raise ValueError("x and y must be array-like with the same shape")
+        shape = x.shape
+        x, y = x.ravel(), y.ravel()
+        result = np.empty(x.shape, np.int_)
+        result.fill(-1)
+
+        inside = ((x >= self._x0) & (x <= self._x0 + self._nx * self._dx) &
+                  (y >= self._y0) & (y <= self._y0 + self._ny * self._dy))
+        ind = np.flatnonzero(inside)
+        i, j = self._bucket(x[ind], y[ind])
+        bucket = j * self._nx + i
+        start = self._starts[bucket]
+        count = self._starts[bucket + 1] - start
+
+        # Test the k-th triangle of each bucket against the points of
+        # that bucket that have not been found yet.
+        k = 0
+        while len(ind):
+            more = count > k
+            ind, start, count = ind[more], start[more], count[more]
+            tri = self._bucket_tris[start + k]
+            found = self._contains(tri, x[ind], y[ind])
+            result[ind[found]] = self._tris[tri[found]]
+            ind, start, count = ind[~found], start[~found], count[~found]
+            k += 1
+        return result.reshape(shape)
+
+    def _contains(self, tri, x, y):
+        """
+        Return whether the points *x*, *y* lie within (or on an edge of)
+        the triangles *tri*, whichever their orientation.
+        """
+        tx, ty = self._tx[tri], self._ty[tri]
+        orientation = self._orientation[tri]
+        contains = orientation != 0
+        for a, b in ((0, 1), (1, 2), (2, 0)):
+            side = ((tx[:, b] - tx[:, a]) * (y - ty[:, a]) -
+                    (ty[:, b] - ty[:, a]) * (x - tx[:, a]))
+            contains &= side * orientation >= 0
+        return contains
@@ -0,0 +1,82 @@
+from matplotlib.tri.triangulation import Triangulation
+from matplotlib.tri.trifinder import TriFinder
+import numpy as np
+
+class TriInterpolator(object):
+    """
+    Abstract base class for classes used to perform interpolation on
+    triangular grids.
+
+    Derived classes implement __call__(x,y) where x,y are array_like point
+    coordinates of the same shape, and that returns a masked array of the same
+    shape containing the interpolated z-values.
+    """
+    def __init__(self, triangulation, z, trifinder=None):
+        if not isinstance(triangulation, Triangulation):
+            raise ValueError('Expected a Triangulation object')
+        self._triangulation = triangulation
+
+        self._z = np.asarray(z, dtype=np.float64)
+        if self._z.shape != triangulation.x.shape:
+            raise ValueError('z array must have same length as triangulation x'
+                             ' and y arrays')
+
+        if trifinder is not None and not isinstance(trifinder, TriFinder):
+            raise ValueError('Expected a TriFinder object')
+        self._trifinder = trifinder or self._triangulation.get_trifinder()
+
+
+class LinearTriInterpolator(TriInterpolator):
+    """
+    A LinearTriInterpolator performs linear interpolation on a triangular grid.
+
+    Each triangle is represented by a plane so that an interpolated value at
+    point (x,y) lies on the plane of the triangle containing (x,y).
+    Interpolated values are therefore continuous across the triangulation, but
+    their first derivatives are discontinuous at edges between triangles.
+
+    The planes of all the triangles are computed once, and points are
+    interpolated all at once, e.g. to resample a mesh onto the grid of
+    an image::
+
+      interp = LinearTriInterpolator(triangulation, z)
+      xi, yi = np.meshgrid(np.linspace(0, 1, 500), np.linspace(0, 1, 500))
+      ax.imshow(interp(xi, yi), origin='lower', extent=(0, 1, 0, 1))
+    """
+    def __init__(self, triangulation, z, trifinder=None):
+        TriInterpolator.__init__(self, triangulation, z, trifinder)
+
+        # Store the plane of each triangle as its value at the first
+        # point and its gradient; degenerate triangles get nan.
+        triangles = self._triangulation.triangles
+        x = self._triangulation.x[triangles]
+        y = self._triangulation.y[triangles]
+        z = self._z[triangles]
+        dx1, dx2 = x[:, 1] - x[:, 0], x[:, 2] - x[:, 0]
+        dy1, dy2 = y[:, 1] - y[:, 0], y[:, 2] - y[:, 0]
+        dz1, dz2 = z[:, 1] - z[:, 0], z[:, 2] - z[:, 0]
+        det = dx1*dy2 - dx2*dy1
+        det[det == 0] = np.nan
+        self._x0, self._y0, self._z0 = x[:, 0], y[:, 0], z[:, 0]
+        self._dzdx = (dz1*dy2 - dz2*dy1) / det
+        self._dzdy = (dx1*dz2 - dx2*dz1) / det
+
+    def __call__(self, x, y):
+        """
+        Return a masked array containing linearly interpolated values at the
+        specified x,y points; points outside of the triangulation, or in
+        masked triangles, are masked out.
+
+        *x*, *y* are array_like x and y coordinates of the same shape and any
+        number of dimensions.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        tri = self._trifinder(x, y)
+        mask = tri == -1
+        if mask.all():
+            return np.ma.array(np.zeros(x.shape), mask=mask)
+        tri = np.where(mask, 0, tri)
+        z = (self._z0[tri] + self._dzdx[tri] * (x - self._x0[tri]) +
+             self._dzdy[tri] * (y - self._y0[tri]))
+        return np.ma.array(z, mask=mask)
@@ -49,7 +49,51 @@ def get_dir_vector(zdir):
     else:
         raise ValueError("'x', 'y', 'z', None or vector of length 3 expected")
 
-class Text3D(mtext.Text):
+class _Projected3D(object):
+    '''
+    Mixin for 3D artists that keeps their projected points, keyed on
+    the projection matrix, and lets :meth:`Axes3D.draw` project them
+    together with those of the other artists.
+
+    Subclasses define :meth:`_get_data3d`, which returns the object
+    holding their 3D data (the cache is dropped when it is replaced),
+    and :meth:`_get_vec3d`, which returns their points as a
+    homogeneous (4, n) array.
+    '''
+    _proj_cache = None
+    _proj_key = None
+
+    def _cached_projection(self, M):
+        cache = self._proj_cache
+        if (cache is not None and cache[1] is self._get_data3d() and
+            np.all(cache[0] == M)):
+            return cache[2]
+        return None
+
+    def queue_projection(self, batch):
+        '''
+        Add the points to the :class:`~mpl_toolkits.mplot3d.proj3d.ProjectionBatch`
+        *batch*, unless their projection is already known.
+        '''
+        if self._cached_projection(batch.M) is None:
+            self._proj_key = batch, batch.add(self._get_vec3d())
+        else:
+            self._proj_key = None
+
+    def project3d(self, M):
+        '''Return the projected txs, tys, tzs of the points.'''
+        projected = self._cached_projection(M)
+        if projected is None:
+            key = self._proj_key
+            if key is not None and key[0].M is M and key[0].is_projected():
+                projected = key[0].get(key[1])
+            else:
+                projected = proj3d.proj_transform_vec(self._get_vec3d(), M)
+            self._proj_cache = (np.array(M), self._get_data3d(), projected)
+        self._proj_key = None
+        return projected
+
+class Text3D(mtext.Text, _Projected3D):
     '''
     Text object with 3D position and (in the future) direction.
     '''
@@ -70,9 +114,17 @@ class Text3D(mtext.Text):
         self._position3d = np.array((x, y, z))
         self._dir_vec = get_dir_vector(zdir)
 
+    def _get_data3d(self):
+        return self._position3d
+
+    def _get_vec3d(self):
+        vec = np.ones((4, 2))
+        vec[:3, 0] = self._position3d
+        vec[:3, 1] = self._position3d + self._dir_vec
+        return vec
+
     def draw(self, renderer):
-        proj = proj3d.proj_trans_points([self._position3d, \
-                self._position3d + self._dir_vec], renderer.M)
+        proj = self.project3d(renderer.M)
         dx = proj[0][1] - proj[0][0]
         dy = proj[1][1] - proj[1][0]
         if dx==0. and dy==0.:
@@ -89,7 +141,7 @@ def text_2d_to_3d(obj, z=0, zdir='z'):
     obj.__class__ = Text3D
     obj.set_3d_properties(z, zdir)
 
-class Line3D(lines.Line2D):
+class Line3D(lines.Line2D, _Projected3D):
     '''
     3D line object.
     '''
@@ -112,9 +164,15 @@ class Line3D(lines.Line2D):
             pass
         self._verts3d = juggle_axes(xs, ys, zs, zdir)
 
+    def _get_data3d(self):
+        return self._verts3d
+
+    def _get_vec3d(self):
+        xs, ys, zs = self._verts3d
+        return proj3d.vec_pad_ones(xs, ys, zs)
+
     def draw(self, renderer):
-        xs3d, ys3d, zs3d = self._verts3d
-        xs, ys, zs = proj3d.proj_transform(xs3d, ys3d, zs3d, renderer.M)
+        xs, ys, zs = self.project3d(renderer.M)
         self.set_data(xs, ys)
         lines.Line2D.draw(self, renderer)
 
@@ -151,7 +209,7 @@ def paths_to_3d_segments(paths, zs=0, zdir='z'):
         segments.append(path_to_3d_segment(path, pathz, zdir))
     return segments
 
-class Line3DCollection(LineCollection):
+class Line3DCollection(LineCollection, _Projected3D):
     '''
     A collection of 3D lines.
     '''
@@ -167,21 +225,36 @@ class Line3DCollection(LineCollection):
         Set 3D segments
         '''
         self._segments3d = segments
+        # pack all the points, so that they are projected at once
+        segments = [np.asarray(points, np.float_).reshape((len(points), 3))
+                    for points in segments]
+        self._starts3d = np.zeros((len(segments) + 1,), np.intp)
+        np.cumsum([len(points) for points in segments],
+                  out=self._starts3d[1:])
+        self._vec3d = np.ones((4, self._starts3d[-1]))
+        if len(segments):
+            self._vec3d[:3] = np.concatenate(segments).T
         LineCollection.set_segments(self, [])
 
+    def _get_data3d(self):
+        return self._segments3d
+
+    def _get_vec3d(self):
+        return self._vec3d
+
     def do_3d_projection(self, renderer):
         '''
         Project the points according to renderer matrix.
         '''
-        xyslist = [
-            proj3d.proj_trans_points(points, renderer.M) for points in
-            self._segments3d]
-        segments_2d = [zip(xs, ys) for (xs, ys, zs) in xyslist]
-        LineCollection.set_segments(self, segments_2d)
+        xs, ys, zs = self.project3d(renderer.M)
+        xys = np.empty((len(xs), 2))
+        xys[:, 0] = xs
+        xys[:, 1] = ys
+        LineCollection.set_packed_segments(self, xys, self._starts3d)
 
         minz = 1e9
-        for (xs, ys, zs) in xyslist:
-            minz = min(minz, min(zs))
+        if len(zs):
+            minz = min(minz, np.min(zs))
         return minz
 
     def draw(self, renderer, project=False):
@@ -195,7 +268,7 @@ def line_collection_2d_to_3d(col, zs=0, zdir='z'):
     col.__class__ = Line3DCollection
     col.set_segments(segments3d)
 
-class Patch3D(Patch):
+class Patch3D(Patch, _Projected3D):
     '''
     3D patch object.
     '''
@@ -220,10 +293,15 @@ class Patch3D(Patch):
     def get_facecolor(self):
         return self._facecolor2d
 
+    def _get_data3d(self):
+        return self._segment3d
+
+    def _get_vec3d(self):
+        xs, ys, zs = zip(*self._segment3d)
+        return proj3d.vec_pad_ones(xs, ys, zs)
+
     def do_3d_projection(self, renderer):
-        s = self._segment3d
-        xs, ys, zs = zip(*s)
-        vxs, vys,vzs, vis = proj3d.proj_transform_clip(xs, ys, zs, renderer.M)
+        vxs, vys, vzs = self.project3d(renderer.M)
         self._path2d = mpath.Path(zip(vxs, vys))
         # FIXME: coloring
         self._facecolor2d = self._facecolor3d
@@ -249,9 +327,7 @@ class PathPatch3D(Patch3D):
         self._code3d = path.codes
 
     def do_3d_projection(self, renderer):
-        s = self._segment3d
-        xs, ys, zs = zip(*s)
-        vxs, vys,vzs, vis = proj3d.proj_transform_clip(xs, ys, zs, renderer.M)
+        vxs, vys, vzs = self.project3d(renderer.M)
         self._path2d = mpath.Path(zip(vxs, vys), self._code3d)
         # FIXME: coloring
         self._facecolor2d = self._facecolor3d
@@ -282,7 +358,7 @@ def pathpatch_2d_to_3d(pathpatch, z=0, zdir='z'):
     pathpatch.__class__ = PathPatch3D
     pathpatch.set_3d_properties(mpath, z, zdir)
 
-class Patch3DCollection(PatchCollection):
+class Patch3DCollection(PatchCollection, _Projected3D):
     '''
     A collection of 3D patches.
     '''
@@ -306,9 +382,15 @@ class Patch3DCollection(PatchCollection):
         self._facecolor3d = self.get_facecolor()
         self._edgecolor3d = self.get_edgecolor()
 
-    def do_3d_projection(self, renderer):
+    def _get_data3d(self):
+        return self._offsets3d
+
+    def _get_vec3d(self):
         xs, ys, zs = self._offsets3d
-        vxs, vys, vzs, vis = proj3d.proj_transform_clip(xs, ys, zs, renderer.M)
+        return proj3d.vec_pad_ones(xs, ys, zs)
+
+    def do_3d_projection(self, renderer):
+        vxs, vys, vzs = self.project3d(renderer.M)
         #FIXME: mpl allows us no way to unset the collection alpha value
         self._alpha = None
         self.set_facecolors(zalpha(self._facecolor3d, vzs))
@@ -330,7 +412,7 @@ def patch_collection_2d_to_3d(col, zs=0, zdir='z'):
     col.__class__ = Patch3DCollection
     col.set_3d_properties(zs, zdir)
 
-class Poly3DCollection(PolyCollection):
+class Poly3DCollection(PolyCollection, _Projected3D):
     '''
     A collection of 3D polygons.
     '''
@@ -352,10 +434,12 @@ class Poly3DCollection(PolyCollection):
 
         PolyCollection.__init__(self, verts, *args, **kwargs)
 
+    # the ufuncs that reduce the projected z of the vertices of each
+    # polygon to its depth; 'average' divides the sums by the lengths
     _zsort_functions = {
-        'average': np.average,
-        'min': np.min,
-        'max': np.max,
+        'average': np.add,
+        'min': np.minimum,
+        'max': np.maximum,
     }
 
     def set_zsort(self, zsort):
@@ -379,22 +463,34 @@ class Poly3DCollection(PolyCollection):
         self._zsort = zsort
         self._sort_zpos = None
         self._zsortfunc = zsortfunc
+        self._projected = None
 
     def get_vector(self, segments3d):
         """Optimize points for projection"""
-        si = 0
-        ei = 0
-        segis = []
-        points = []
-        for p in segments3d:
-            points.extend(p)
-            ei = si+len(p)
-            segis.append((si, ei))
-            si = ei
-        xs, ys, zs = zip(*points)
-        ones = np.ones(len(xs))
-        self._vec = np.array([xs, ys, zs, ones])
-        self._segis = segis
+        if isinstance(segments3d, np.ndarray) and segments3d.ndim == 3:
+            npolys, nv, three = segments3d.shape
+            points = segments3d.reshape((npolys * nv, 3))
+            starts = np.arange(npolys + 1) * nv
+        else:
+            segments3d = [np.asarray(p, np.float_).reshape((len(p), 3))
+                          for p in segments3d]
+            starts = np.zeros((len(segments3d) + 1,), np.intp)
+            np.cumsum([len(p) for p in segments3d], out=starts[1:])
+            if len(segments3d):
+                points = np.concatenate(segments3d)
+            else:
+                points = np.zeros((0, 3))
+        self._set_vector(points, starts)
+
+    def _set_vector(self, points, starts):
+        # all the vertices in one homogeneous coordinate array, so that
+        # they are projected at once
+        points = np.asarray(points, np.float_)
+        self._vec = np.ones((4, len(points)))
+        self._vec[:3] = points.T
+        self._starts = np.asarray(starts, np.intp)
+        self._lengths = np.diff(self._starts)
+        self._projected = None
 
     def set_verts(self, verts, closed=True):
         '''Set 3D vertices.'''
@@ -402,6 +498,21 @@ class Poly3DCollection(PolyCollection):
         # 2D verts will be updated at draw time
         PolyCollection.set_verts(self, [], closed)
 
+    def set_packed_verts(self, vertices, starts, closed=True):
+        '''
+        Set the 3D polygons from a packed representation: polygon *i* is
+        ``vertices[starts[i]:starts[i+1]]``, where *vertices* is an
+        (*N*, 3) array.
+        '''
+        self._set_vector(vertices, starts)
+        PolyCollection.set_verts(self, [], closed)
+
+    def _get_data3d(self):
+        return self._vec
+
+    def _get_vec3d(self):
+        return self._vec
+
     def set_3d_properties(self):
         self._sort_zpos = None
         self.set_zsort(True)
@@ -412,45 +523,76 @@ class Poly3DCollection(PolyCollection):
         '''Set the position to use for z-sorting.'''
         self._sort_zpos = val
 
+    def _zsort_keys(self, tzs):
+        '''Return the depth of each polygon from the projected *tzs*.'''
+        keys = np.empty(len(self._lengths))
+        keys.fill(np.nan)
+        nonempty = self._lengths > 0
+        if nonempty.any():
+            keys[nonempty] = self._zsortfunc.reduceat(
+                tzs, self._starts[:-1][nonempty])
+            if self._zsortfunc is np.add:
+                keys /= self._lengths
+        return keys
+
     def do_3d_projection(self, renderer):
         '''
         Perform the 3D projection for this object.
+
+        The polygons are projected and depth sorted as arrays, and
+        handed to the 2D collection packed.  As long as the projection
+        does not change, the sorted polygons of the previous call are
+        reused.
         '''
 
         if self._A is not None:
             self.update_scalarmappable()
             self._facecolors3d = self._facecolors
 
-        txs, tys, tzs = proj3d.proj_transform_vec(self._vec, renderer.M)
-        xyzlist = [(txs[si:ei], tys[si:ei], tzs[si:ei]) \
-                for si, ei in self._segis]
+        if (self._projected is None or
+            not np.all(self._projected[0] == renderer.M)):
+            txs, tys, tzs = self.project3d(renderer.M)
+
+            # if required sort by depth (furthest drawn first); the
+            # stable sort keeps the order of polygons at equal depth
+            if self._zsort:
+                order = np.argsort(-self._zsort_keys(tzs), kind='mergesort')
+            else:
+                order = np.arange(len(self._lengths))
+
+            # gather the vertices of the polygons in the sorted order
+            lengths = self._lengths[order]
+            starts = np.zeros((len(lengths) + 1,), np.intp)
+            np.cumsum(lengths, out=starts[1:])
+            ind = np.arange(starts[-1]) + np.repeat(
+                self._starts[:-1][order] - starts[:-1], lengths)
+            xys = np.empty((len(ind), 2))
+            xys[:, 0] = txs[ind]
+            xys[:, 1] = tys[ind]
+            PolyCollection.set_packed_verts(self, xys, starts)
+            if len(tzs):
+                zmin = np.min(tzs)
+            else:
+                zmin = np.nan
+            self._projected = (np.array(renderer.M), order, self._paths,
+                               zmin)
+        else:
+            M, order, self._paths, zmin = self._projected
 
         # This extra fuss is to re-order face / edge colors
+        npolys = len(order)
         cface = self._facecolors3d
         cedge = self._edgecolors3d
-        if len(cface) != len(xyzlist):
-            cface = cface.repeat(len(xyzlist), axis=0)
-        if len(cedge) != len(xyzlist):
-            if len(cedge) == 0:
-                cedge = cface
-            cedge = cedge.repeat(len(xyzlist), axis=0)
-
-        # if required sort by depth (furthest drawn first)
-        if self._zsort:
-            z_segments_2d = [(self._zsortfunc(zs), zip(xs, ys), fc, ec) for
-                    (xs, ys, zs), fc, ec in zip(xyzlist, cface, cedge)]
-            z_segments_2d.sort(cmp=lambda x, y: cmp(y[0], x[0]))
+        if len(cface) and len(cface) != npolys:
+            cface = cface.repeat(npolys, axis=0)
+        if len(cface):
+            self._facecolors2d = cface[order]
         else:
-            raise ValueError, "whoops"
-
-        segments_2d = [s for z, s, fc, ec in z_segments_2d]
-        PolyCollection.set_verts(self, segments_2d)
-
-        self._facecolors2d = [fc for z, s, fc, ec in z_segments_2d]
-        if len(self._edgecolors3d) == len(cface):
-            self._edgecolors2d = [ec for z, s, fc, ec in z_segments_2d]
+            self._facecolors2d = cface
+        if len(cedge) == npolys:
+            self._edgecolors2d = cedge[order]
         else:
-            self._edgecolors2d = self._edgecolors3d
+            self._edgecolors2d = cedge
 
         # Return zorder value
         if self._sort_zpos is not None:
@@ -458,7 +600,7 @@ class Poly3DCollection(PolyCollection):
            ztrans = proj3d.proj_transform_vec(zvec, renderer.M)
            return ztrans[2][0]
         else:
-            return np.min(tzs)
+            return zmin
 
     def set_facecolor(self, colors):
         PolyCollection.set_facecolor(self, colors)
@@ -166,6 +166,17 @@ class Axes3D(Axes):
         renderer.eye = self.eye
         renderer.get_axis_position = self.get_axis_position
 
+        # Project the points of all the visible 3D artists in one batch;
+        # they pick up their share as they are projected below or drawn
+        artists3d = [artist for artist in
+                     self.collections + self.patches + self.lines + self.texts
+                     if hasattr(artist, 'queue_projection') and
+                     artist.get_visible()]
+        batch = proj3d.ProjectionBatch(self.M)
+        for artist in artists3d:
+            artist.queue_projection(batch)
+        batch.project()
+
         # Calculate projection of collections and zorder them
         zlist = [(col.do_3d_projection(renderer), col) \
                  for col in self.collections]
@@ -194,6 +205,10 @@ class Axes3D(Axes):
         # Then rest
         Axes.draw(self, renderer)
 
+        # release the batch held by artists that were not drawn
+        for artist in artists3d:
+            artist._proj_key = None
+
     def get_axis_position(self):
         vals = self.get_w_lims()
         tc = self.tunit_cube(vals, self.M)
@@ -695,8 +710,8 @@ class Axes3D(Axes):
 
         had_data = self.has_data()
 
+        X, Y, Z = np.asarray(X), np.asarray(Y), np.asarray(Z)
         rows, cols = Z.shape
-        tX, tY, tZ = np.transpose(X), np.transpose(Y), np.transpose(Z)
         rstride = kwargs.pop('rstride', 10)
         cstride = kwargs.pop('cstride', 10)
 
@@ -718,51 +733,54 @@ class Axes3D(Axes):
         if shade and cmap is not None and fcolors is not None:
             fcolors = self._shade_colors_lightsource(Z, cmap, lightsource)
 
-        polys = []
-        normals = []
+        # Each patch is bounded by its top row, right column, bottom row
+        # and left column, in that order; the patches at the far edges
+        # are clipped to the grid.  The boundaries of all the patches
+        # are gathered at once as an (npatches, nb, 3) array.
+        rs, cs = np.meshgrid(np.arange(0, rows-1, rstride),
+                             np.arange(0, cols-1, cstride))
+        rs, cs = rs.T.ravel(), cs.T.ravel()
+        dr = np.concatenate((np.zeros(cstride+1, int), np.arange(rstride+1),
+                             np.ones(cstride+1, int) * rstride,
+                             np.arange(rstride, -1, -1)))
+        dc = np.concatenate((np.arange(cstride+1),
+                             np.ones(rstride+1, int) * cstride,
+                             np.arange(cstride, -1, -1),
+                             np.zeros(rstride+1, int)))
+        ri = np.minimum(rs[:, np.newaxis] + dr, rows-1)
+        ci = np.minimum(cs[:, np.newaxis] + dc, cols-1)
+        ps = np.empty(ri.shape + (3,))
+        for k, a in enumerate((X, Y, Z)):
+            ps[..., k] = a[ri, ci]
+
+        # The construction leaves the array with duplicate points, which
+        # are removed here.
+        keep = np.ones(ri.shape, np.bool_)
+        keep[:, 1:] = (ps[:, 1:] != ps[:, :-1]).any(axis=2)
+        lengths = keep.sum(axis=1)
+        starts = np.zeros(len(lengths) + 1, int)
+        np.cumsum(lengths, out=starts[1:])
+        verts = ps[keep]
+
         #colset contains the data for coloring: either average z or the facecolor
-        colset = []
-        for rs in np.arange(0, rows-1, rstride):
-            for cs in np.arange(0, cols-1, cstride):
-                ps = []
-                corners = []
-                for a, ta in [(X, tX), (Y, tY), (Z, tZ)]:
-                    ztop = a[rs][cs:min(cols, cs+cstride+1)]
-                    zleft = ta[min(cols-1, cs+cstride)][rs:min(rows, rs+rstride+1)]
-                    zbase = a[min(rows-1, rs+rstride)][cs:min(cols, cs+cstride+1):]
-                    zbase = zbase[::-1]
-                    zright = ta[cs][rs:min(rows, rs+rstride+1):]
-                    zright = zright[::-1]
-                    corners.append([ztop[0], ztop[-1], zbase[0], zbase[-1]])
-                    z = np.concatenate((ztop, zleft, zbase, zright))
-                    ps.append(z)
-
-                # The construction leaves the array with duplicate points, which
-                # are removed here.
-                ps = zip(*ps)
-                lastp = np.array([])
-                ps2 = []
-                avgzsum = 0.0
-                for p in ps:
-                    if p != lastp:
-                        ps2.append(p)
-                        lastp = p
-                        avgzsum += p[2]
-                polys.append(ps2)
-
-                if fcolors is not None:
-                    colset.append(fcolors[rs][cs])
-                else:
-                    colset.append(avgzsum / len(ps2))
+        if fcolors is not None:
+            if isinstance(fcolors, np.ndarray):
+                colset = fcolors[rs, cs]
+            else:
+                colset = [fcolors[r][c] for r, c in zip(rs, cs)]
+        else:
+            colset = np.where(keep, ps[..., 2], 0).sum(axis=1) / lengths
 
-                # Only need vectors to shade if no cmap
-                if cmap is None and shade:
-                    i1, i2, i3 = 0, int(len(ps2)/3), int(2*len(ps2)/3)
-                    v1 = np.array(ps2[i1]) - np.array(ps2[i2])
-                    v2 = np.array(ps2[i2]) - np.array(ps2[i3])
-                    normals.append(np.cross(v1, v2))
+        # Only need vectors to shade if no cmap
+        normals = []
+        if cmap is None and shade:
+            p1 = verts[starts[:-1]]
+            p2 = verts[starts[:-1] + lengths // 3]
+            p3 = verts[starts[:-1] + (2 * lengths) // 3]
+            normals = np.cross(p1 - p2, p2 - p3)
 
-        polyc = art3d.Poly3DCollection(polys, *args, **kwargs)
+        polyc = art3d.Poly3DCollection([], *args, **kwargs)
+        polyc.set_packed_verts(verts, starts)
 
         if fcolors is not None:
             if shade:
@@ -808,24 +826,21 @@ class Axes3D(Axes):
         *color* can also be an array of the same length as *normals*.
         '''
 
-        shade = []
-        for n in normals:
-            n = n / proj3d.mod(n)
-            shade.append(np.dot(n, [-1, -1, 0.5]))
-
-        shade = np.array(shade)
+        normals = np.asarray(normals, np.float_).reshape((len(normals), 3))
+        shade = np.dot(normals, [-1, -1, 0.5]) / np.sqrt(
+            (normals**2).sum(axis=1))
         mask = ~np.isnan(shade)
 
         if len(shade[mask]) > 0:
             norm = Normalize(min(shade[mask]), max(shade[mask]))
+            factor = 0.5 + np.asarray(norm(shade)) * 0.5
             if art3d.iscolor(color):
                 color = color.copy()
                 color[3] = 1
-                colors = [color * (0.5 + norm(v) * 0.5) for v in shade]
+                colors = color * factor[:, np.newaxis]
             else:
-                colors = [np.array(colorConverter.to_rgba(c)) * \
-                            (0.5 + norm(v) * 0.5) \
-                            for c, v in zip(color, shade)]
+                colors = colorConverter.to_rgba_array(color) * \
+                            factor[:, np.newaxis]
         else:
             colors = color.copy()
 
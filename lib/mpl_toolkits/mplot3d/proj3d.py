@@ -166,6 +166,44 @@ def proj_transform_vec_clip(vec, M):
         tis =  vecw[1] < 1
     return txs, tys, tzs, tis
 
+class ProjectionBatch:
+    """
+    Collects the points of many 3D artists, so that they are all
+    projected by *M* with a single matrix product.
+
+    Each artist queues its homogeneous (4, n) point array with
+    :meth:`add`, which returns a key; once :meth:`project` has been
+    called, :meth:`get` returns the projected ``txs, tys, tzs`` of the
+    points of that key.
+    """
+    def __init__(self, M):
+        self.M = M
+        self._vecs = []
+        self._size = 0
+        self._projected = None
+
+    def add(self, vec):
+        '''Queue the (4, n) array *vec*; return its key.'''
+        start = self._size
+        self._vecs.append(vec)
+        self._size += vec.shape[1]
+        return start, self._size
+
+    def project(self):
+        '''Project all the queued points at once.'''
+        if self._vecs:
+            self._projected = proj_transform_vec(np.hstack(self._vecs),
+                                                 self.M)
+        self._vecs = []
+
+    def is_projected(self):
+        return self._projected is not None
+
+    def get(self, key):
+        '''Return the projected points of *key*.'''
+        start, stop = key
+        return tuple([t[start:stop] for t in self._projected])
+
 def inv_transform(xs, ys, zs, M):
     iM = linalg.inv(M)
     vec = vec_pad_ones(xs, ys, zs)
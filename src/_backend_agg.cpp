@@ -368,13 +368,17 @@ RendererAgg::PIXELS_PER_INCH(96);
 
 
 RendererAgg::RendererAgg(unsigned int width, unsigned int height, double dpi,
-                         int debug) :
+                         int debug, const Py::Object& buffer_obj,
+                         int origin_x, int origin_y) :
     width(width),
     height(height),
+    origin_x(origin_x),
+    origin_y(origin_y),
     dpi(dpi),
     NUMBYTES(width*height*4),
     pixBuffer(NULL),
     renderingBuffer(),
+    pixBufferOwner(buffer_obj),
     alphaBuffer(NULL),
     alphaMaskRenderingBuffer(),
     alphaMask(alphaMaskRenderingBuffer),
@@ -394,7 +398,27 @@ RendererAgg::RendererAgg(unsigned int width, unsigned int height, double dpi,
     _VERBOSE("RendererAgg::RendererAgg");
     unsigned stride(width*4);
 
-    pixBuffer = new agg::int8u[NUMBYTES];
+    if (buffer_obj.ptr() == Py_None)
+    {
+        pixBuffer = new agg::int8u[NUMBYTES];
+    }
+    else
+    {
+        // Render straight into the caller's memory, which must stay
+        // writable and at least NUMBYTES long; holding a reference in
+        // pixBufferOwner keeps it alive for our lifetime.
+        void* data;
+        Py_ssize_t data_len;
+        if (PyObject_AsWriteBuffer(buffer_obj.ptr(), &data, &data_len) != 0)
+        {
+            throw Py::Exception();
+        }
+        if ((size_t)data_len < NUMBYTES)
+        {
+            throw Py::ValueError("buffer is too small for the image");
+        }
+        pixBuffer = (agg::int8u*)data;
+    }
     renderingBuffer.attach(pixBuffer, width, height, stride);
     pixFmt.attach(renderingBuffer);
     rendererBase.attach(pixFmt);
@@ -431,8 +455,10 @@ RendererAgg::set_clipbox(const Py::Object& cliprect, R& rasterizer)
     double l, b, r, t;
     if (py_convert_bbox(cliprect.ptr(), l, b, r, t))
     {
-        rasterizer.clip_box(int(mpl_round(l)), height - int(mpl_round(b)),
-                            int(mpl_round(r)), height - int(mpl_round(t)));
+        rasterizer.clip_box(int(mpl_round(l)) - origin_x,
+                            height + origin_y - int(mpl_round(b)),
+                            int(mpl_round(r)) - origin_x,
+                            height + origin_y - int(mpl_round(t)));
     }
     else
     {
@@ -476,7 +502,8 @@ RendererAgg::copy_from_bbox(const Py::Tuple& args)
         throw Py::TypeError("Invalid bbox provided to copy_from_bbox");
     }
 
-    agg::rect_i rect((int)l, height - (int)t, (int)r, height - (int)b);
+    agg::rect_i rect((int)l - origin_x, height + origin_y - (int)t,
+                     (int)r - origin_x, height + origin_y - (int)b);
 
     BufferRegion* reg = NULL;
     try
@@ -598,7 +625,7 @@ RendererAgg::render_clippath(const Py::Object& clippath,
         create_alpha_buffers();
         agg::trans_affine trans(clippath_trans);
         trans *= agg::trans_affine_scaling(1.0, -1.0);
-        trans *= agg::trans_affine_translation(0.0, (double)height);
+        trans *= agg::trans_affine_translation(-origin_x, (double)height + origin_y);
 
         PathIterator clippath_iter(clippath);
         rendererBaseAlphaMask.clear(agg::gray8(0, 0));
@@ -646,7 +673,7 @@ RendererAgg::draw_markers(const Py::Tuple& args)
     // Deal with the difference in y-axis direction
     marker_trans *= agg::trans_affine_scaling(1.0, -1.0);
     trans *= agg::trans_affine_scaling(1.0, -1.0);
-    trans *= agg::trans_affine_translation(0.0, (double)height);
+    trans *= agg::trans_affine_translation(-origin_x, (double)height + origin_y);
 
     PathIterator       marker_path(marker_path_obj);
     transformed_path_t marker_path_transformed(marker_path, marker_trans);
@@ -942,7 +969,7 @@ RendererAgg::draw_text_image(const Py::Tuple& args)
     agg::trans_affine mtx;
     mtx *= agg::trans_affine_translation(0, -height);
     mtx *= agg::trans_affine_rotation(-angle * agg::pi / 180.0);
-    mtx *= agg::trans_affine_translation(x, y);
+    mtx *= agg::trans_affine_translation(x - origin_x, y + origin_y);
 
     agg::path_storage rect;
     rect.move_to(0, 0);
@@ -1025,13 +1052,13 @@ RendererAgg::draw_image(const Py::Tuple& args)
             mtx *= agg::trans_affine_translation(x, y);
             mtx *= affine_trans;
             mtx *= agg::trans_affine_scaling(1.0, -1.0);
-            mtx *= agg::trans_affine_translation(0.0, (double) height);
+            mtx *= agg::trans_affine_translation(-origin_x, (double)height + origin_y);
         }
         else
         {
             mtx *= agg::trans_affine_translation(
-                (int)x,
-                (int)(height - (y + image->rowsOut)));
+                (int)x - origin_x,
+                (int)(height + origin_y - (y + image->rowsOut)));
         }
 
         rect.move_to(0, 0);
@@ -1093,7 +1120,8 @@ RendererAgg::draw_image(const Py::Tuple& args)
     else
     {
         set_clipbox(gc.cliprect, rendererBase);
-        rendererBase.blend_from(pixf, 0, (int)x, (int)(height - (y + image->rowsOut)));
+        rendererBase.blend_from(pixf, 0, (int)x - origin_x,
+                                (int)(height + origin_y - (y + image->rowsOut)));
     }
 
     rendererBase.reset_clipping(true);
@@ -1310,7 +1338,7 @@ RendererAgg::draw_path(const Py::Tuple& args)
     bool has_clippath = render_clippath(gc.clippath, gc.clippath_trans);
 
     trans *= agg::trans_affine_scaling(1.0, -1.0);
-    trans *= agg::trans_affine_translation(0.0, (double)height);
+    trans *= agg::trans_affine_translation(-origin_x, (double)height + origin_y);
     bool clip = !face.first && gc.hatchpath.isNone() && !path.has_curves();
     bool simplify = path.should_simplify() && clip;
 
@@ -1469,7 +1497,7 @@ RendererAgg::_draw_path_collection_generic
 
         // These transformations must be done post-offsets
         trans *= agg::trans_affine_scaling(1.0, -1.0);
-        trans *= agg::trans_affine_translation(0.0, (double)height);
+        trans *= agg::trans_affine_translation(-origin_x, (double)height + origin_y);
 
         if (Nfacecolors)
         {
@@ -1813,7 +1841,7 @@ RendererAgg::_draw_gouraud_triangle(const double* points,
     typedef agg::span_allocator<color_t>                       span_alloc_t;
 
     trans *= agg::trans_affine_scaling(1.0, -1.0);
-    trans *= agg::trans_affine_translation(0.0, (double)height);
+    trans *= agg::trans_affine_translation(-origin_x, (double)height + origin_y);
 
     double tpoints[6];
 
@@ -2024,80 +2052,77 @@ RendererAgg::write_rgba(const Py::Tuple& args)
 }
 
 
+template<class ColorConv>
 Py::Object
-RendererAgg::tostring_rgb(const Py::Tuple& args)
+RendererAgg::_convert_buffer(const Py::Tuple& args, int row_len,
+                             ColorConv color_conv)
 {
-    //"Return the rendered buffer as an RGB string";
-
-    _VERBOSE("RendererAgg::tostring_rgb");
+    // Convert the pixel buffer with color_conv, either into the
+    // writable buffer args[0], or into a new string.  In both cases
+    // the pixels are converted in place, without a temporary copy.
+    size_t out_len = row_len * height;
+    PyObject* result = NULL;
+    void* out;
 
-    args.verify_length(0);
-    int row_len = width * 3;
-    unsigned char* buf_tmp = new unsigned char[row_len * height];
-    if (buf_tmp == NULL)
+    if (args.length() == 1)
     {
-        //todo: also handle allocation throw
-        throw Py::MemoryError(
-            "RendererAgg::tostring_rgb could not allocate memory");
+        Py_ssize_t buf_len;
+        if (PyObject_AsWriteBuffer(args[0].ptr(), &out, &buf_len) != 0)
+        {
+            throw Py::Exception();
+        }
+        if ((size_t)buf_len < out_len)
+        {
+            throw Py::ValueError("buffer is too small for the image");
+        }
     }
-
-    try
+    else
     {
-        agg::rendering_buffer renderingBufferTmp;
-        renderingBufferTmp.attach(buf_tmp,
-                                  width,
-                                  height,
-                                  row_len);
-
-        agg::color_conv(&renderingBufferTmp, &renderingBuffer,
-                        agg::color_conv_rgba32_to_rgb24());
+        result = PyString_FromStringAndSize(NULL, out_len);
+        if (result == NULL)
+        {
+            throw Py::MemoryError("RendererAgg could not allocate memory");
+        }
+        out = PyString_AS_STRING(result);
     }
-    catch (...)
+
+    agg::rendering_buffer renderingBufferTmp;
+    renderingBufferTmp.attach((agg::int8u*)out, width, height, row_len);
+    agg::color_conv(&renderingBufferTmp, &renderingBuffer, color_conv);
+
+    if (result == NULL)
     {
-        delete [] buf_tmp;
-        throw Py::RuntimeError("Unknown exception occurred in tostring_rgb");
+        return Py::Object();
     }
+    return Py::asObject(result);
+}
 
-    //todo: how to do this with native CXX
-    PyObject* o = Py_BuildValue("s#", buf_tmp, row_len * height);
 
-    delete [] buf_tmp;
-    return Py::asObject(o);
+Py::Object
+RendererAgg::tostring_rgb(const Py::Tuple& args)
+{
+    //"Return the rendered buffer as an RGB string, or write it into
+    // the writable buffer given as the optional argument";
+
+    _VERBOSE("RendererAgg::tostring_rgb");
+
+    args.verify_length(0, 1);
+    int row_len = width * 3;
+    return _convert_buffer(args, row_len, agg::color_conv_rgba32_to_rgb24());
 }
 
 
 Py::Object
 RendererAgg::tostring_argb(const Py::Tuple& args)
 {
-    //"Return the rendered buffer as an RGB string";
+    //"Return the rendered buffer as an ARGB string, or write it into
+    // the writable buffer given as the optional argument";
 
     _VERBOSE("RendererAgg::tostring_argb");
 
-    args.verify_length(0);
+    args.verify_length(0, 1);
     int row_len = width * 4;
-    unsigned char* buf_tmp = new unsigned char[row_len * height];
-    if (buf_tmp == NULL)
-    {
-        //todo: also handle allocation throw
-        throw Py::MemoryError("RendererAgg::tostring_argb could not allocate memory");
-    }
-
-    try
-    {
-        agg::rendering_buffer renderingBufferTmp;
-        renderingBufferTmp.attach(buf_tmp, width, height, row_len);
-        agg::color_conv(&renderingBufferTmp, &renderingBuffer, agg::color_conv_rgba32_to_argb32());
-    }
-    catch (...)
-    {
-        delete [] buf_tmp;
-        throw Py::RuntimeError("Unknown exception occurred in tostring_argb");
-    }
-
-    //todo: how to do this with native CXX
-    PyObject* o = Py_BuildValue("s#", buf_tmp, row_len * height);
-    delete [] buf_tmp;
-    return Py::asObject(o);
+    return _convert_buffer(args, row_len, agg::color_conv_rgba32_to_argb32());
 }
 
 
@@ -2158,6 +2183,36 @@ RendererAgg::buffer_rgba(const Py::Tuple& args)
 }
 
 
+Py_ssize_t
+RendererAgg::buffer_getreadbuffer(Py_ssize_t segment, void** ptrptr)
+{
+    if (segment != 0)
+    {
+        throw Py::SystemError("accessing non-existent buffer segment");
+    }
+    *ptrptr = pixBuffer;
+    return NUMBYTES;
+}
+
+
+Py_ssize_t
+RendererAgg::buffer_getwritebuffer(Py_ssize_t segment, void** ptrptr)
+{
+    return buffer_getreadbuffer(segment, ptrptr);
+}
+
+
+Py_ssize_t
+RendererAgg::buffer_getsegcount(Py_ssize_t* lenp)
+{
+    if (lenp)
+    {
+        *lenp = NUMBYTES;
+    }
+    return 1;
+}
+
+
 Py::Object
 RendererAgg::tostring_rgba_minimized(const Py::Tuple& args)
 {
@@ -2275,7 +2330,10 @@ RendererAgg::~RendererAgg()
     _VERBOSE("RendererAgg::~RendererAgg");
 
     delete [] alphaBuffer;
-    delete [] pixBuffer;
+    if (pixBufferOwner.ptr() == Py_None)
+    {
+        delete [] pixBuffer;
+    }
 }
 
 /* ------------ module methods ------------- */
@@ -2302,6 +2360,25 @@ Py::Object _backend_agg_module::new_renderer(const Py::Tuple &args,
     unsigned int height = (unsigned int)Py::Int(args[1]);
     double dpi = Py::Float(args[2]);
 
+    Py::Object buffer_obj = Py::None();
+    if (kws.hasKey("buffer"))
+    {
+        buffer_obj = kws["buffer"];
+    }
+
+    // the display coordinates of the lower left corner of the buffer
+    int origin_x = 0, origin_y = 0;
+    if (kws.hasKey("origin"))
+    {
+        Py::SeqBase<Py::Object> origin = kws["origin"];
+        if (origin.length() != 2)
+        {
+            throw Py::ValueError("origin must be a sequence of two integers");
+        }
+        origin_x = Py::Int(origin[0]);
+        origin_y = Py::Int(origin[1]);
+    }
+
     if (width > 1 << 15 || height > 1 << 15)
     {
         throw Py::ValueError("width and height must each be below 32768");
@@ -2315,7 +2392,8 @@ Py::Object _backend_agg_module::new_renderer(const Py::Tuple &args,
     RendererAgg* renderer = NULL;
     try
     {
-        renderer = new RendererAgg(width, height, dpi, debug);
+        renderer = new RendererAgg(width, height, dpi, debug, buffer_obj,
+                                   origin_x, origin_y);
     }
     catch (std::bad_alloc)
     {
@@ -2352,6 +2430,7 @@ void RendererAgg::init_type()
 {
     behaviors().name("RendererAgg");
     behaviors().doc("The agg backend extension module");
+    behaviors().supportBufferType();
 
     add_varargs_method("draw_path", &RendererAgg::draw_path,
                        "draw_path(gc, path, transform, rgbFace)\n");
@@ -2372,9 +2451,9 @@ void RendererAgg::init_type()
     add_varargs_method("write_rgba", &RendererAgg::write_rgba,
                        "write_rgba(fname)");
     add_varargs_method("tostring_rgb", &RendererAgg::tostring_rgb,
-                       "s = tostring_rgb()");
+                       "s = tostring_rgb([buffer])");
     add_varargs_method("tostring_argb", &RendererAgg::tostring_argb,
-                       "s = tostring_argb()");
+                       "s = tostring_argb([buffer])");
     add_varargs_method("tostring_bgra", &RendererAgg::tostring_bgra,
                        "s = tostring_bgra()");
     add_varargs_method("tostring_rgba_minimized", &RendererAgg::tostring_rgba_minimized,
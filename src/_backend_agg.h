@@ -158,7 +158,9 @@ class RendererAgg: public Py::PythonExtension<RendererAgg>
 {
     typedef std::pair<bool, agg::rgba> facepair_t;
 public:
-    RendererAgg(unsigned int width, unsigned int height, double dpi, int debug);
+    RendererAgg(unsigned int width, unsigned int height, double dpi, int debug,
+                const Py::Object& buffer_obj = Py::None(),
+                int origin_x = 0, int origin_y = 0);
     static void init_type(void);
 
     unsigned int get_width()
@@ -191,6 +193,11 @@ public:
     Py::Object buffer_rgba(const Py::Tuple & args);
     Py::Object clear(const Py::Tuple & args);
 
+    // expose the pixel buffer through the (old style) buffer protocol
+    virtual Py_ssize_t buffer_getreadbuffer(Py_ssize_t, void**);
+    virtual Py_ssize_t buffer_getwritebuffer(Py_ssize_t, void**);
+    virtual Py_ssize_t buffer_getsegcount(Py_ssize_t*);
+
     Py::Object copy_from_bbox(const Py::Tuple & args);
     Py::Object restore_region(const Py::Tuple & args);
     Py::Object restore_region2(const Py::Tuple & args);
@@ -199,11 +206,16 @@ public:
 
     static const size_t PIXELS_PER_INCH;
     unsigned int width, height;
+    // the display coordinates of the lower left corner of the buffer,
+    // for a renderer covering only part of the figure
+    int origin_x, origin_y;
     double dpi;
     size_t NUMBYTES;  //the number of bytes in buffer
 
     agg::int8u *pixBuffer;
     agg::rendering_buffer renderingBuffer;
+    // a caller supplied object owning pixBuffer, or None if we own it
+    Py::Object pixBufferOwner;
 
     agg::int8u *alphaBuffer;
     agg::rendering_buffer alphaMaskRenderingBuffer;
@@ -238,6 +250,10 @@ protected:
     template<class R>
     void set_clipbox(const Py::Object& cliprect, R& rasterizer);
 
+    template<class ColorConv>
+    Py::Object _convert_buffer(const Py::Tuple& args, int row_len,
+                               ColorConv color_conv);
+
     bool render_clippath(const Py::Object& clippath, const agg::trans_affine& clippath_trans);
 
     template<class PathIteratorType>
@@ -56,6 +56,8 @@ public:
                            "convert_path_to_polygons(path, trans, width, height)");
         add_varargs_method("cleanup_path", &_path_module::cleanup_path,
                            "cleanup_path(path, trans, remove_nans, clip, snap, simplify, curves)");
+        add_varargs_method("convert_to_string", &_path_module::convert_to_string,
+                           "convert_to_string(path, trans, clip, simplify, precision, codes, postfix)");
         initialize("Helper functions for paths");
     }
 
@@ -75,6 +77,7 @@ private:
     Py::Object path_intersects_path(const Py::Tuple& args);
     Py::Object convert_path_to_polygons(const Py::Tuple& args);
     Py::Object cleanup_path(const Py::Tuple& args);
+    Py::Object convert_to_string(const Py::Tuple& args);
 };
 
 //
@@ -1481,6 +1484,225 @@ _path_module::cleanup_path(const Py::Tuple& args)
     return result;
 }
 
+void
+_add_number(std::string& buffer, double val, int precision)
+{
+    // Large enough for any double written with %f and up to 100
+    // decimals.
+    char str[512];
+    int length = PyOS_snprintf(str, 512, "%.*f", precision, val);
+    if (length < 0 || length >= 512)
+    {
+        throw Py::ValueError("Could not format the path coordinates");
+    }
+
+    // Remove the trailing zeros, and the decimal point if nothing is
+    // left after it.
+    if (strchr(str, '.') != NULL)
+    {
+        while (length > 0 && str[length - 1] == '0')
+        {
+            --length;
+        }
+        if (length > 0 && str[length - 1] == '.')
+        {
+            --length;
+        }
+    }
+    if (length == 2 && str[0] == '-' && str[1] == '0')
+    {
+        buffer.append("0");
+    }
+    else
+    {
+        buffer.append(str, length);
+    }
+}
+
+template<class VertexSource>
+void
+__convert_to_string(VertexSource& source, int precision,
+                    const std::string* codes, bool postfix,
+                    std::string& buffer)
+{
+    const size_t max_line_length = 75;
+    const unsigned sizes[] = { 1, 1, 2, 3 };
+    // a quadratic curve without a code of its own is written as a cubic
+    bool quad_to_cubic = codes[2].empty();
+
+    double x[3], y[3];
+    double last_x = 0.0, last_y = 0.0, start_x = 0.0, start_y = 0.0;
+    std::string segment;
+    size_t line_start = buffer.size();
+    unsigned code;
+
+    while ((code = source.vertex(&x[0], &y[0])) != agg::path_cmd_stop)
+    {
+        const std::string* command;
+        unsigned size = 0;
+
+        segment.clear();
+        if ((code & agg::path_cmd_end_poly) == agg::path_cmd_end_poly)
+        {
+            command = &codes[4];
+            last_x = start_x;
+            last_y = start_y;
+        }
+        else if (code < agg::path_cmd_move_to || code > agg::path_cmd_curve4)
+        {
+            throw Py::ValueError("Unknown path code");
+        }
+        else
+        {
+            size = sizes[code - 1];
+            for (unsigned i = 1; i < size; ++i)
+            {
+                if (source.vertex(&x[i], &y[i]) == agg::path_cmd_stop)
+                {
+                    throw Py::ValueError("The path ends in the middle of a curve");
+                }
+            }
+
+            command = &codes[code - 1];
+            if (code == agg::path_cmd_curve3 && quad_to_cubic)
+            {
+                command = &codes[3];
+                // as mlab.quad2cubic
+                x[2] = x[1];
+                y[2] = y[1];
+                x[0] = last_x + 2.0 / 3.0 * (x[0] - last_x);
+                y[0] = last_y + 2.0 / 3.0 * (y[0] - last_y);
+                x[1] = x[0] + 1.0 / 3.0 * (x[2] - last_x);
+                y[1] = y[0] + 1.0 / 3.0 * (y[2] - last_y);
+                size = 3;
+            }
+
+            last_x = x[size - 1];
+            last_y = y[size - 1];
+            if (code == agg::path_cmd_move_to)
+            {
+                start_x = last_x;
+                start_y = last_y;
+            }
+        }
+
+        if (!postfix)
+        {
+            segment.append(*command);
+        }
+        for (unsigned i = 0; i < size; ++i)
+        {
+            if (i)
+            {
+                segment.append(" ");
+            }
+            _add_number(segment, x[i], precision);
+            segment.append(" ");
+            _add_number(segment, y[i], precision);
+        }
+        if (postfix)
+        {
+            if (size)
+            {
+                segment.append(" ");
+            }
+            segment.append(*command);
+        }
+
+        // Postfix commands are written one per line, the others are
+        // wrapped at max_line_length.
+        if (postfix)
+        {
+            if (buffer.size())
+            {
+                buffer.append("\n");
+            }
+        }
+        else if (buffer.size() - line_start + segment.size() > max_line_length)
+        {
+            buffer.append("\n");
+            line_start = buffer.size();
+        }
+        buffer.append(segment);
+    }
+}
+
+Py::Object
+_path_module::convert_to_string(const Py::Tuple& args)
+{
+    args.verify_length(7);
+
+    typedef agg::conv_transform<PathIterator>  transformed_path_t;
+    typedef PathNanRemover<transformed_path_t> nan_removal_t;
+    typedef PathClipper<nan_removal_t>         clipped_t;
+    typedef PathSimplifier<clipped_t>          simplify_t;
+
+    PathIterator path(args[0]);
+    agg::trans_affine trans = py_to_agg_transformation_matrix(args[1].ptr(), false);
+
+    Py::Object clip_obj = args[2];
+    bool do_clip;
+    agg::rect_base<double> clip_rect;
+    if (clip_obj.isNone())
+    {
+        do_clip = false;
+    }
+    else
+    {
+        double x1, y1, x2, y2;
+        Py::Tuple clip_tuple(clip_obj);
+        x1 = Py::Float(clip_tuple[0]);
+        y1 = Py::Float(clip_tuple[1]);
+        x2 = Py::Float(clip_tuple[2]);
+        y2 = Py::Float(clip_tuple[3]);
+        clip_rect.init(x1, y1, x2, y2);
+        do_clip = true;
+    }
+
+    bool simplify;
+    Py::Object simplify_obj = args[3];
+    if (simplify_obj.isNone())
+    {
+        simplify = path.should_simplify();
+    }
+    else
+    {
+        simplify = simplify_obj.isTrue();
+    }
+
+    int precision = Py::Int(args[4]);
+    if (precision < 0 || precision > 100)
+    {
+        throw Py::ValueError("precision must be between 0 and 100");
+    }
+
+    Py::SeqBase<Py::Object> codes_obj(args[5]);
+    if (codes_obj.length() != 5)
+    {
+        throw Py::ValueError("codes must be a sequence of 5 strings: the "
+                             "moveto, lineto, curve3, curve4 and closepoly "
+                             "commands");
+    }
+    std::string codes[5];
+    for (size_t i = 0; i < 5; ++i)
+    {
+        codes[i] = Py::String(codes_obj[i]).as_std_string();
+    }
+
+    bool postfix = args[6].isTrue();
+
+    transformed_path_t tpath(path, trans);
+    nan_removal_t      nan_removed(tpath, true, path.has_curves());
+    clipped_t          clipped(nan_removed, do_clip, clip_rect);
+    simplify_t         simplified(clipped, simplify, path.simplify_threshold());
+
+    std::string buffer;
+    buffer.reserve(path.total_vertices() * 16);
+    __convert_to_string(simplified, precision, codes, postfix, buffer);
+
+    return Py::String(buffer);
+}
+
 extern "C"
     DL_EXPORT(void)
     init_path(void)
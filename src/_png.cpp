@@ -40,8 +40,9 @@ public:
     _png_module()
             : Py::ExtensionModule<_png_module>("_png")
     {
-        add_varargs_method("write_png", &_png_module::write_png,
-                           "write_png(buffer, width, height, fileobj, dpi=None)");
+        add_keyword_method("write_png", &_png_module::write_png,
+                           "write_png(buffer, width, height, fileobj, dpi=None, "
+                           "compression=-1, filter=-1, palette=None)");
         add_varargs_method("read_png", &_png_module::read_png,
                            "read_png(fileobj)");
         initialize("Module to write PNG files");
@@ -50,7 +51,7 @@ public:
     virtual ~_png_module() {}
 
 private:
-    Py::Object write_png(const Py::Tuple& args);
+    Py::Object write_png(const Py::Tuple& args, const Py::Dict& kwargs);
     Py::Object read_png(const Py::Tuple& args);
 };
 
@@ -84,10 +85,64 @@ static void flush_png_data(png_structp png_ptr)
 // this code is heavily adapted from the paint license, which is in
 // the file paint.license (BSD compatible) included in this
 // distribution.  TODO, add license file to MANIFEST.in and CVS
-Py::Object _png_module::write_png(const Py::Tuple& args)
+//
+// Optional keyword arguments:
+//   dpi          resolution to store in the file
+//   compression  zlib level, 0-9, or -1 for the zlib default
+//   filter       a mask of PNG_FILTER_* flags, or -1 for the libpng
+//                default (adaptive choice among all filters)
+//   palette      an (n, 4) RGBA buffer of at most 256 colors; buffer
+//                then holds one palette index byte per pixel
+Py::Object _png_module::write_png(const Py::Tuple& args, const Py::Dict& kwargs)
 {
     args.verify_length(4, 5);
 
+    Py::Object dpi_obj = Py::None();
+    if (args.size() == 5)
+    {
+        dpi_obj = args[4];
+    }
+    else if (kwargs.hasKey("dpi"))
+    {
+        dpi_obj = kwargs["dpi"];
+    }
+
+    int compression = -1;
+    if (kwargs.hasKey("compression"))
+    {
+        compression = Py::Int(kwargs["compression"]);
+        if (compression < -1 || compression > 9)
+        {
+            throw Py::ValueError("compression must be between 0 and 9, or -1");
+        }
+    }
+
+    int filter = -1;
+    if (kwargs.hasKey("filter"))
+    {
+        filter = Py::Int(kwargs["filter"]);
+    }
+
+    const png_byte* palette = NULL;
+    int num_palette = 0;
+    if (kwargs.hasKey("palette") && kwargs["palette"].ptr() != Py_None)
+    {
+        const void* palettePtr = NULL;
+        Py_ssize_t paletteLength = 0;
+        if (PyObject_AsReadBuffer(kwargs["palette"].ptr(), &palettePtr,
+                                  &paletteLength))
+        {
+            throw Py::TypeError("palette must be an rgba buffer.");
+        }
+        num_palette = paletteLength / 4;
+        if (num_palette < 1 || num_palette > 256 || paletteLength % 4)
+        {
+            throw Py::ValueError("palette must have between 1 and 256 rgba colors.");
+        }
+        palette = (const png_byte*)palettePtr;
+    }
+    int bytes_per_pixel = palette ? 1 : 4;
+
     FILE *fp = NULL;
     bool close_file = false;
     Py::Object buffer_obj = Py::Object(args[0]);
@@ -108,7 +163,7 @@ Py::Object _png_module::write_png(const Py::Tuple& args)
     int width = (int)Py::Int(args[1]);
     int height = (int)Py::Int(args[2]);
 
-    if (pixBufferLength < width * height * 4)
+    if (pixBufferLength < width * height * bytes_per_pixel)
     {
         throw Py::ValueError("Buffer and width, height don't seem to match.");
     }
@@ -149,12 +204,14 @@ Py::Object _png_module::write_png(const Py::Tuple& args)
     try
     {
         struct png_color_8_struct sig_bit;
+        png_color plte[256];
+        png_byte trans[256];
         png_uint_32 row;
 
         row_pointers = new png_bytep[height];
         for (row = 0; row < (png_uint_32)height; ++row)
         {
-            row_pointers[row] = pixBuffer + row * width * 4;
+            row_pointers[row] = pixBuffer + row * width * bytes_per_pixel;
         }
 
         png_ptr = png_create_write_struct(PNG_LIBPNG_VER_STRING, NULL, NULL, NULL);
@@ -183,27 +240,53 @@ Py::Object _png_module::write_png(const Py::Tuple& args)
             png_set_write_fn(png_ptr, (void*)py_fileobj.ptr(),
                              &write_png_data, &flush_png_data);
         }
+        if (compression != -1)
+        {
+            png_set_compression_level(png_ptr, compression);
+        }
+        if (filter != -1)
+        {
+            png_set_filter(png_ptr, PNG_FILTER_TYPE_BASE, filter);
+        }
+
         png_set_IHDR(png_ptr, info_ptr,
                      width, height, 8,
-                     PNG_COLOR_TYPE_RGB_ALPHA, PNG_INTERLACE_NONE,
+                     palette ? PNG_COLOR_TYPE_PALETTE : PNG_COLOR_TYPE_RGB_ALPHA,
+                     PNG_INTERLACE_NONE,
                      PNG_COMPRESSION_TYPE_BASE, PNG_FILTER_TYPE_BASE);
 
         // Save the dpi of the image in the file
-        if (args.size() == 5)
+        if (dpi_obj.ptr() != Py_None)
         {
-            double dpi = Py::Float(args[4]);
+            double dpi = Py::Float(dpi_obj);
             size_t dots_per_meter = (size_t)(dpi / (2.54 / 100.0));
             png_set_pHYs(png_ptr, info_ptr, dots_per_meter, dots_per_meter, PNG_RESOLUTION_METER);
         }
 
-        // this a a color image!
-        sig_bit.gray = 0;
-        sig_bit.red = 8;
-        sig_bit.green = 8;
-        sig_bit.blue = 8;
-        /* if the image has an alpha channel then */
-        sig_bit.alpha = 8;
-        png_set_sBIT(png_ptr, info_ptr, &sig_bit);
+        if (palette)
+        {
+            // The palette colors go in PLTE, their alphas in tRNS.
+            for (int i = 0; i < num_palette; ++i)
+            {
+                plte[i].red = palette[i * 4];
+                plte[i].green = palette[i * 4 + 1];
+                plte[i].blue = palette[i * 4 + 2];
+                trans[i] = palette[i * 4 + 3];
+            }
+            png_set_PLTE(png_ptr, info_ptr, plte, num_palette);
+            png_set_tRNS(png_ptr, info_ptr, trans, num_palette, NULL);
+        }
+        else
+        {
+            // this a a color image!
+            sig_bit.gray = 0;
+            sig_bit.red = 8;
+            sig_bit.green = 8;
+            sig_bit.blue = 8;
+            /* if the image has an alpha channel then */
+            sig_bit.alpha = 8;
+            png_set_sBIT(png_ptr, info_ptr, &sig_bit);
+        }
 
         png_write_info(png_ptr, info_ptr);
         png_write_image(png_ptr, row_pointers);
@@ -485,4 +568,12 @@ extern "C"
 
     static _png_module* _png = NULL;
     _png = new _png_module;
+
+    Py::Dict d = _png->moduleDictionary();
+    d["FILTER_NONE"]  = Py::Int(PNG_FILTER_NONE);
+    d["FILTER_SUB"]   = Py::Int(PNG_FILTER_SUB);
+    d["FILTER_UP"]    = Py::Int(PNG_FILTER_UP);
+    d["FILTER_AVG"]   = Py::Int(PNG_FILTER_AVG);
+    d["FILTER_PAETH"] = Py::Int(PNG_FILTER_PAETH);
+    d["ALL_FILTERS"]  = Py::Int(PNG_ALL_FILTERS);
 }
@@ -0,0 +1,32 @@
+"""
+Time savefig to png with the default encoder settings and with the
+faster png options.
+"""
+import time
+from cStringIO import StringIO
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+numtrials = 5
+
+fig = plt.figure(figsize=(16, 12), dpi=100)
+ax = fig.add_subplot(111)
+ax.plot(np.random.randn(10000).cumsum())
+ax.imshow(np.random.rand(50, 50), extent=(0, 10000, -50, 50),
+          aspect='auto')
+fig.canvas.draw()
+
+for options in (dict(),
+                dict(filter='up'),
+                dict(filter='up', compression=1),
+                dict(filter='up', threads=4),
+                dict(palette=True)):
+    t0 = time.time()
+    for i in range(numtrials):
+        buf = StringIO()
+        fig.savefig(buf, format='png', **options)
+    elapsed = (time.time() - t0) / numtrials
+    print '%-40s %8.4fs %10d bytes' % (options, elapsed, len(buf.getvalue()))